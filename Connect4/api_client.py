@@ -0,0 +1,267 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:     # only needed by the asyncio client
+    httpx = None
+
+
+class GameClient:
+    """
+    HTTP client for one game on the Connect4 server, shared by all remote players.
+
+    All requests go through one `requests.Session`, so the TCP connection to the
+    server is kept alive and reused instead of being opened for every call.
+    Failed connections and 502/503/504 answers are retried with exponential
+    backoff; reads are only retried for idempotent requests (GET), so a move is
+    never sent twice. Every request has a timeout.
+
+    Attributes:
+        api_url (str): The API URL for the Connect4 game server.
+        game_id (str | None): ID of the game on the server, None for the server's default game.
+        game_url (str): Base URL of the game's endpoints.
+        timeout (float): Default timeout of a request in seconds.
+        session (requests.Session): The session holding the pooled connections.
+        state (dict | None): Last game state received from `/state`.
+        state_etag (str | None): ETag of `state`, sent back so an unchanged state costs a 304.
+    """
+
+    def __init__(self, api_url: str, game_id: str | None = None, timeout: float = 10,
+                 retries: int = 3, backoff: float = 0.2) -> None:
+        """
+        Initialize the client.
+
+        Parameters:
+            api_url (str): The API URL for the Connect4 game server.
+            game_id (str | None): ID of the game, None for the server's default game.
+            timeout (float): Default timeout of a request in seconds.
+            retries (int): Maximum number of retries of a failed request.
+            backoff (float): Backoff factor; the n-th retry waits backoff * 2 ** (n - 1) seconds.
+        """
+        self.api_url: str = api_url
+        self.game_id: str | None = game_id
+        self.game_url: str = f"{api_url}/connect4" if game_id is None else f"{api_url}/connect4/{game_id}"
+        self.timeout: float = timeout
+        self.state: dict | None = None
+        self.state_etag: str | None = None
+
+        retry = Retry(total=retries, backoff_factor=backoff,
+                      status_forcelist=(502, 503, 504), raise_on_status=False)
+        self.session: requests.Session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(max_retries=retry))
+        self.session.mount('https://', HTTPAdapter(max_retries=retry))
+
+    def __enter__(self) -> 'GameClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def get(self, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request to an endpoint of the game (e.g. 'status').
+
+        Parameters:
+            endpoint (str): Endpoint below the game's URL.
+            **kwargs: Passed on to `requests.Session.get` (the default timeout can be overridden).
+
+        Returns:
+            requests.Response: The server's response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(f"{self.game_url}/{endpoint}", **kwargs)
+
+    def post(self, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send a POST request to an endpoint of the game (e.g. 'make_move').
+
+        Parameters:
+            endpoint (str): Endpoint below the game's URL.
+            **kwargs: Passed on to `requests.Session.post` (the default timeout can be overridden).
+
+        Returns:
+            requests.Response: The server's response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.post(f"{self.game_url}/{endpoint}", **kwargs)
+
+    def get_state(self) -> dict:
+        """
+        Retrieve status, board, last move and version of the game in one request.
+
+        The server answers 304 if nothing changed since the last call; the cached state is returned then.
+
+        Returns:
+            dict: A dictionary containing 'status', 'board' (flat list), 'last_move' and 'version'.
+
+        Raises:
+            ConnectionError: If the server answers with an error.
+        """
+        headers = {'If-None-Match': self.state_etag} if self.state_etag else {}
+        response = self.get('state', headers=headers)
+        if response.status_code == 304 and self.state is not None:
+            return self.state
+        elif response.status_code == 200:
+            self.state = response.json()
+            self.state_etag = response.headers.get('ETag')
+            return self.state
+        else:
+            raise ConnectionError(f"Failed to retrieve game state: {response.status_code}")
+
+    def wait_for_turn(self, player_id: str, timeout: float = 30) -> dict:
+        """
+        Block until it is the player's turn, the game is over or the timeout has passed (long-polling).
+
+        Parameters:
+            player_id (str): Unique identifier of the waiting player.
+            timeout (float): Maximum number of seconds the server waits.
+
+        Returns:
+            dict: The game's status when the wait ended.
+
+        Raises:
+            ConnectionError: If the server answers with an error.
+        """
+        params = {'player_id': player_id, 'timeout': timeout}
+        response = self.get('wait', params=params, timeout=timeout + self.timeout)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise ConnectionError(f"Failed to wait for turn: {response.status_code}")
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        self.session.close()
+
+
+class AsyncGameClient:
+    """
+    Asynchronous (asyncio) HTTP client for one game on the Connect4 server.
+
+    The asyncio counterpart of `GameClient`, built on `httpx.AsyncClient`. Many
+    clients can share one `httpx.AsyncClient`, so dozens of players in one
+    process use a single connection pool. Failed connections are retried.
+
+    Attributes:
+        api_url (str): The API URL for the Connect4 game server.
+        game_id (str | None): ID of the game on the server, None for the server's default game.
+        game_url (str): Base URL of the game's endpoints.
+        timeout (float): Default timeout of a request in seconds.
+        http (httpx.AsyncClient): The (possibly shared) client holding the pooled connections.
+        state (dict | None): Last game state received from `/state`.
+        state_etag (str | None): ETag of `state`, sent back so an unchanged state costs a 304.
+    """
+
+    def __init__(self, api_url: str, game_id: str | None = None, timeout: float = 10,
+                 retries: int = 3, http: 'httpx.AsyncClient | None' = None) -> None:
+        """
+        Initialize the client.
+
+        Parameters:
+            api_url (str): The API URL for the Connect4 game server.
+            game_id (str | None): ID of the game, None for the server's default game.
+            timeout (float): Default timeout of a request in seconds.
+            retries (int): Maximum number of retries of a failed connection (only used without `http`).
+            http (httpx.AsyncClient | None): Client to share with other players; a new one is created if None.
+
+        Raises:
+            ImportError: If the httpx package is not installed.
+        """
+        if httpx is None:
+            raise ImportError("httpx module is not installed, it is required for AsyncGameClient.")
+        self.api_url: str = api_url
+        self.game_id: str | None = game_id
+        self.game_url: str = f"{api_url}/connect4" if game_id is None else f"{api_url}/connect4/{game_id}"
+        self.timeout: float = timeout
+        self.state: dict | None = None
+        self.state_etag: str | None = None
+
+        self._owns_http: bool = http is None
+        self.http = http or httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(retries=retries), timeout=timeout)
+
+    async def __aenter__(self) -> 'AsyncGameClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def get(self, endpoint: str, **kwargs) -> 'httpx.Response':
+        """
+        Send a GET request to an endpoint of the game (e.g. 'status').
+
+        Parameters:
+            endpoint (str): Endpoint below the game's URL.
+            **kwargs: Passed on to `httpx.AsyncClient.get` (the default timeout can be overridden).
+
+        Returns:
+            httpx.Response: The server's response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return await self.http.get(f"{self.game_url}/{endpoint}", **kwargs)
+
+    async def post(self, endpoint: str, **kwargs) -> 'httpx.Response':
+        """
+        Send a POST request to an endpoint of the game (e.g. 'make_move').
+
+        Parameters:
+            endpoint (str): Endpoint below the game's URL.
+            **kwargs: Passed on to `httpx.AsyncClient.post` (the default timeout can be overridden).
+
+        Returns:
+            httpx.Response: The server's response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return await self.http.post(f"{self.game_url}/{endpoint}", **kwargs)
+
+    async def get_state(self) -> dict:
+        """
+        Retrieve status, board, last move and version of the game in one request (see `GameClient.get_state`).
+
+        Returns:
+            dict: A dictionary containing 'status', 'board' (flat list), 'last_move' and 'version'.
+
+        Raises:
+            ConnectionError: If the server answers with an error.
+        """
+        headers = {'If-None-Match': self.state_etag} if self.state_etag else {}
+        response = await self.get('state', headers=headers)
+        if response.status_code == 304 and self.state is not None:
+            return self.state
+        elif response.status_code == 200:
+            self.state = response.json()
+            self.state_etag = response.headers.get('ETag')
+            return self.state
+        else:
+            raise ConnectionError(f"Failed to retrieve game state: {response.status_code}")
+
+    async def wait_for_turn(self, player_id: str, timeout: float = 30) -> dict:
+        """
+        Wait until it is the player's turn, the game is over or the timeout has passed (long-polling).
+
+        Parameters:
+            player_id (str): Unique identifier of the waiting player.
+            timeout (float): Maximum number of seconds the server waits.
+
+        Returns:
+            dict: The game's status when the wait ended.
+
+        Raises:
+            ConnectionError: If the server answers with an error.
+        """
+        params = {'player_id': player_id, 'timeout': timeout}
+        response = await self.get('wait', params=params, timeout=timeout + self.timeout)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise ConnectionError(f"Failed to wait for turn: {response.status_code}")
+
+    async def close(self) -> None:
+        """
+        Close the pooled connections, unless the `httpx.AsyncClient` is shared.
+        """
+        if self._owns_http:
+            await self.http.aclose()
@@ -0,0 +1,438 @@
+import argparse
+import importlib
+import os
+import random
+import time
+from functools import partial
+from multiprocessing import Pool
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from batch_search import BatchSearch
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from game import Connect4
+from move_class_v2 import MoveEvaluator
+from parallel_search import LazySMPSearch
+from search import NegamaxSearch
+from transposition import TranspositionTable
+
+
+# An agent picks the column to play from the 7x8 board and its own icon,
+# the same interface as the strategies of `Player_Async`. Agents with a
+# `close` method are closed when the arena is done with them; agents with
+# `USES_POOL = True` start worker processes of their own (see `run_arena`).
+Agent = Callable[[np.ndarray, str], int]
+
+
+class RandomAgent:
+    """
+    Agent playing a random column that is not full.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        """
+        Initialize the agent.
+
+        Parameters:
+            seed (int | None): Seed of the random generator.
+        """
+        self.rng: random.Random = random.Random(seed)
+
+    def __call__(self, board: np.ndarray, icon: str) -> int:
+        return self.rng.choice([col for col in range(board.shape[1]) if board[0, col] == ''])
+
+
+class NegamaxAgent:
+    """
+    Agent playing the move of a `NegamaxSearch` with a transposition table.
+
+    Attributes:
+        search (NegamaxSearch): The search, kept (with its table) for all games of a worker.
+        move_time_ms (float | None): Time budget per move (iterative deepening), None for a fixed depth.
+    """
+
+    def __init__(self, depth: int = 6, move_time_ms: float | None = None, table_mb: float = 16,
+                 heuristic: bool = False) -> None:
+        """
+        Initialize the agent.
+
+        Parameters:
+            depth (int): Search depth, or the maximum depth with a time budget.
+            move_time_ms (float | None): Time budget per move, None searches to `depth`.
+            table_mb (float): Memory cap of the transposition table in megabytes.
+            heuristic (bool): Score the positions at the depth limit with a `HeuristicEvaluator`.
+        """
+        self.search: NegamaxSearch = NegamaxSearch(depth, table=TranspositionTable(table_mb),
+                                                   heuristic=HeuristicEvaluator() if heuristic else None)
+        self.move_time_ms: float | None = move_time_ms
+
+    def __call__(self, board: np.ndarray, icon: str) -> int:
+        bb = BitBoard.from_array(board)
+        if self.move_time_ms is None:
+            return self.search.search(bb).move
+        return self.search.iterative_deepening(bb, self.move_time_ms, self.search.target_depth).move
+
+
+class BatchAgent:
+    """
+    Agent playing the move of a `BatchSearch` (the scoring of `MoveEvaluator`, searched with NumPy).
+
+    Attributes:
+        search (BatchSearch): The search.
+    """
+
+    def __init__(self, depth: int = 4, heuristic: bool = False) -> None:
+        """
+        Initialize the agent.
+
+        Parameters:
+            depth (int): Number of plies searched after the own move.
+            heuristic (bool): Add the average `HeuristicEvaluator` score of the leaves.
+        """
+        self.search: BatchSearch = BatchSearch(depth, heuristic=HeuristicEvaluator() if heuristic else None)
+
+    def __call__(self, board: np.ndarray, icon: str) -> int:
+        return self.search.evaluate_moves(board, icon, 'O' if icon == 'X' else 'X')
+
+
+class EvaluatorAgent:
+    """
+    Agent playing the move of a `MoveEvaluator` (move_class_v2), the bot's 'evaluator' engine.
+
+    Attributes:
+        evaluator (MoveEvaluator): The evaluator with its worker pool.
+    """
+    USES_POOL: bool = True
+
+    def __init__(self, depth: int = 4, heuristic: bool = False, processes: int | None = None) -> None:
+        """
+        Initialize the agent.
+
+        Parameters:
+            depth (int): Number of plies searched after the own move.
+            heuristic (bool): Add the average `HeuristicEvaluator` score of the leaves.
+            processes (int | None): Worker processes of the evaluator; defaults to `os.cpu_count()`.
+        """
+        self.evaluator: MoveEvaluator = MoveEvaluator(depth, BitBoard.COLS, None, processes=processes,
+                                                      heuristic=HeuristicEvaluator() if heuristic else None)
+
+    def __call__(self, board: np.ndarray, icon: str) -> int:
+        return self.evaluator.evaluate_moves(board, icon, 'O' if icon == 'X' else 'X')
+
+    def close(self) -> None:
+        self.evaluator.close()
+
+
+class SMPAgent:
+    """
+    Agent playing the move of a `LazySMPSearch` on several cores.
+
+    Attributes:
+        search (LazySMPSearch): The search with its worker pool and shared table.
+        move_time_ms (float): Time budget per move.
+    """
+    USES_POOL: bool = True
+
+    def __init__(self, move_time_ms: float = 100, processes: int | None = None, table_mb: float = 64,
+                 heuristic: bool = False) -> None:
+        """
+        Initialize the agent.
+
+        Parameters:
+            move_time_ms (float): Time budget per move in milliseconds.
+            processes (int | None): Worker processes of the search; defaults to `os.cpu_count()`.
+            table_mb (float): Memory cap of the shared transposition table in megabytes.
+            heuristic (bool): Score the positions at the depth limit with a `HeuristicEvaluator`.
+        """
+        self.search: LazySMPSearch = LazySMPSearch(processes, table_mb,
+                                                   heuristic=HeuristicEvaluator() if heuristic else None)
+        self.move_time_ms: float = move_time_ms
+
+    def __call__(self, board: np.ndarray, icon: str) -> int:
+        return self.search.search(BitBoard.from_array(board), self.move_time_ms).move
+
+    def close(self) -> None:
+        self.search.close()
+
+
+class StrategyAgent:
+    """
+    Agent playing any strategy function, e.g. the strategies of `Player_Async`.
+
+    Attributes:
+        strategy (Agent): The function choosing the column.
+    """
+
+    def __init__(self, name: str = 'player_async.random_strategy') -> None:
+        """
+        Initialize the agent.
+
+        Parameters:
+            name (str): The function as 'module.function', called with the board and the icon.
+
+        Raises:
+            ValueError: If the name has no module part.
+        """
+        module, _, function = name.rpartition('.')
+        if not module:
+            raise ValueError(f"Expected 'module.function', got {name}")
+        self.strategy: Agent = getattr(importlib.import_module(module), function)
+
+    def __call__(self, board: np.ndarray, icon: str) -> int:
+        return self.strategy(board, icon)
+
+
+# Agents that can be selected by name on the command line
+AGENTS: dict[str, Callable[..., Agent]] = {
+    'random': RandomAgent,
+    'negamax': NegamaxAgent,
+    'batch': BatchAgent,
+    'evaluator': EvaluatorAgent,
+    'smp': SMPAgent,
+    'strategy': StrategyAgent,
+}
+
+
+def parse_agent(spec: str) -> Callable[[], Agent]:
+    """
+    Turn an agent description like 'negamax:depth=4,move_time_ms=50' into a factory.
+
+    Parameters:
+        spec (str): Name from `AGENTS`, optionally followed by ':' and comma separated
+            keyword arguments (numbers and true/false are converted, e.g. 'heuristic=1' or 'heuristic=true').
+
+    Returns:
+        Callable[[], Agent]: A picklable factory creating the agent.
+
+    Raises:
+        ValueError: If the agent name is unknown.
+    """
+    name, _, args = spec.partition(':')
+    if name not in AGENTS:
+        raise ValueError(f"Unknown agent: {name} (known: {', '.join(AGENTS)})")
+    kwargs = {}
+    for arg in filter(None, args.split(',')):
+        key, _, value = arg.partition('=')
+        if value.lower() in ('true', 'false'):
+            kwargs[key] = value.lower() == 'true'
+            continue
+        try:
+            kwargs[key] = float(value) if '.' in value else int(value)
+        except ValueError:
+            kwargs[key] = value
+    return partial(AGENTS[name], **kwargs)
+
+
+class GameRecord(NamedTuple):
+    """
+    Outcome of one arena game.
+
+    Attributes:
+        winner (str | None): 'a' or 'b' for the winning agent, None for a draw.
+        plies (int): Number of moves played (including the random opening).
+        move_times (tuple[list[float], list[float]]): Seconds per move of agent a and agent b.
+    """
+    winner: str | None
+    plies: int
+    move_times: tuple[list[float], list[float]]
+
+
+class ArenaReport(NamedTuple):
+    """
+    Result of an arena run, from the view of agent a.
+
+    Attributes:
+        games (int): Number of games played.
+        wins (int): Games won by agent a.
+        draws (int): Drawn games.
+        losses (int): Games won by agent b.
+        avg_move_ms_a (float): Average thinking time of agent a per move.
+        avg_move_ms_b (float): Average thinking time of agent b per move.
+        avg_plies (float): Average game length.
+        games_per_sec (float): Throughput of the whole run.
+    """
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    avg_move_ms_a: float
+    avg_move_ms_b: float
+    avg_plies: float
+    games_per_sec: float
+
+    def __str__(self) -> str:
+        return (f"{self.games} games: {self.wins} W / {self.draws} D / {self.losses} L "
+                f"({self.wins / self.games:.1%} wins), "
+                f"avg move a {self.avg_move_ms_a:.2f} ms, b {self.avg_move_ms_b:.2f} ms, "
+                f"avg {self.avg_plies:.1f} plies, {self.games_per_sec:.1f} games/s")
+
+
+def play_game(agent_a: Agent, agent_b: Agent, a_first: bool, opening_plies: int = 0,
+              seed: int | None = None) -> GameRecord:
+    """
+    Play one game between two agents directly on a `Connect4` game.
+
+    A move that is not legal loses the game for the agent that made it.
+
+    Parameters:
+        agent_a (Agent): The first agent.
+        agent_b (Agent): The second agent.
+        a_first (bool): Whether agent a plays 'X' and moves first.
+        opening_plies (int): Number of random moves played before the agents take over,
+            so deterministic agents don't replay the same game.
+        seed (int | None): Seed for the random opening.
+
+    Returns:
+        GameRecord: The outcome of the game.
+    """
+    game = Connect4()
+    sides = ('a', 'b') if a_first else ('b', 'a')
+    for side in sides:
+        game.register_player(side)
+    agents = {'a': agent_a, 'b': agent_b}
+    move_times = {'a': [], 'b': []}
+    rng = random.Random(seed)
+    n_cells = game.board.size
+
+    while game.winner is None and game.turn_counter < n_cells:
+        side = game.get_status()['active_id']
+        icon = 'X' if side == sides[0] else 'O'
+        board = game.get_board()
+        if game.turn_counter < opening_plies:
+            column = rng.choice([col for col in range(board.shape[1]) if board[0, col] == ''])
+        else:
+            start = time.perf_counter()
+            column = agents[side](board.copy(), icon)
+            move_times[side].append(time.perf_counter() - start)
+        if not game.check_move(int(column), side):
+            return GameRecord('b' if side == 'a' else 'a', game.turn_counter, (move_times['a'], move_times['b']))
+
+    winner = None if game.winner is None else (sides[0] if game.winner == 'X' else sides[1])
+    return GameRecord(winner, game.turn_counter, (move_times['a'], move_times['b']))
+
+
+# The two agents of this process (a game worker, or the arena itself when it plays
+# without workers). They are created once so their tables carry over between games.
+_agents: tuple[Agent, Agent] | None = None
+
+
+def _create_agents(factory_a: Callable[[], Agent], factory_b: Callable[[], Agent]) -> None:
+    """
+    Create the agents of this process (also the initializer of the game workers).
+    """
+    global _agents
+    _agents = (factory_a(), factory_b())
+
+
+def _close_agents() -> None:
+    """
+    Close the agents of this process that hold resources (worker pools, shared memory).
+    """
+    global _agents
+    for agent in _agents or ():
+        if hasattr(agent, 'close'):
+            agent.close()
+    _agents = None
+
+
+def _play_task(index: int, opening_plies: int, seed: int) -> GameRecord:
+    """
+    Play game number `index`; the agents swap colors every game.
+    """
+    agent_a, agent_b = _agents
+    return play_game(agent_a, agent_b, a_first=index % 2 == 0, opening_plies=opening_plies, seed=seed + index)
+
+
+def _uses_pool(factory: Callable[[], Agent]) -> bool:
+    """
+    Check if the agents of a factory (a class or a `partial` of one) start worker processes.
+    """
+    return getattr(getattr(factory, 'func', factory), 'USES_POOL', False)
+
+
+def run_arena(factory_a: Callable[[], Agent], factory_b: Callable[[], Agent], games: int = 100,
+              processes: int | None = None, opening_plies: int = 2, seed: int = 0) -> ArenaReport:
+    """
+    Play many games between two agents in parallel worker processes.
+
+    Agents that start worker processes of their own ('evaluator', 'smp') can't run
+    inside a game worker, so games with them are played one after another in this
+    process (they already use all cores for every move).
+
+    Parameters:
+        factory_a (Callable[[], Agent]): Picklable factory of agent a (e.g. a class or `parse_agent(...)`).
+        factory_b (Callable[[], Agent]): Picklable factory of agent b.
+        games (int): Number of games; the agents alternate playing first.
+        processes (int | None): Number of worker processes; defaults to `os.cpu_count()`,
+            or to 1 (no workers) with an agent that has its own worker processes.
+        opening_plies (int): Random moves at the start of every game.
+        seed (int): Base seed of the random openings.
+
+    Returns:
+        ArenaReport: Results from the view of agent a.
+
+    Raises:
+        ValueError: If fewer than one game is requested, or more than one process for an agent
+            with its own worker processes.
+    """
+    if games < 1:
+        raise ValueError(f"At least one game must be played, got {games}")
+    if _uses_pool(factory_a) or _uses_pool(factory_b):
+        if processes not in (None, 1):
+            raise ValueError("Agents with their own worker processes can only play with processes=1")
+        processes = 1
+    processes = processes or os.cpu_count()
+    tasks = [(index, opening_plies, seed) for index in range(games)]
+    start = time.perf_counter()
+    if processes == 1:
+        _create_agents(factory_a, factory_b)
+        try:
+            records = [_play_task(*task) for task in tasks]
+        finally:
+            _close_agents()
+    else:
+        with Pool(processes=processes, initializer=_create_agents, initargs=(factory_a, factory_b)) as pool:
+            records = pool.starmap(_play_task, tasks, chunksize=max(1, games // (4 * processes)))
+    elapsed = time.perf_counter() - start
+
+    times_a = [t for record in records for t in record.move_times[0]]
+    times_b = [t for record in records for t in record.move_times[1]]
+    return ArenaReport(
+        games=games,
+        wins=sum(record.winner == 'a' for record in records),
+        draws=sum(record.winner is None for record in records),
+        losses=sum(record.winner == 'b' for record in records),
+        avg_move_ms_a=1000 * sum(times_a) / len(times_a) if times_a else 0.0,
+        avg_move_ms_b=1000 * sum(times_b) / len(times_b) if times_b else 0.0,
+        avg_plies=sum(record.plies for record in records) / games,
+        games_per_sec=games / elapsed,
+    )
+
+
+def _positive_int(value: str) -> int:
+    """
+    Argument type of the number of games.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play bots against each other without a server")
+    parser.add_argument('agent_a', help="e.g. 'negamax:depth=6' or 'random' (agents: " + ', '.join(AGENTS) + ")")
+    parser.add_argument('agent_b', help="e.g. 'negamax:depth=4,move_time_ms=20', 'batch:depth=4,heuristic=true', "
+                                        "'evaluator:depth=4', 'smp:move_time_ms=100' or "
+                                        "'strategy:name=player_async.random_strategy'")
+    parser.add_argument('--games', type=_positive_int, default=100)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--opening-plies', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    report = run_arena(parse_agent(args.agent_a), parse_agent(args.agent_b), args.games,
+                       args.processes, args.opening_plies, args.seed)
+    print(report)
@@ -0,0 +1,211 @@
+import time
+
+import numpy as np
+
+from batch_win import has_four_bitboards
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from search_stats import SearchStats
+
+
+class BatchSearch:
+    """
+    Breadth-wise search that evaluates whole plies as NumPy arrays.
+
+    Scores the moves exactly like `MoveEvaluator` (move_class_v2): every line
+    of play up to `target_depth` plies is followed, a win of the player after
+    `d` plies adds `target_depth - d`, a win of the opponent subtracts
+    `10 * (target_depth - d)`, and a line ends at the first win.
+
+    Instead of placing and checking one piece per Python call, all positions
+    of a ply are kept as arrays of bitboard masks. All their children are
+    generated and checked for a win in a few vectorized operations. Identical
+    positions reached by different move orders are merged and counted with
+    their multiplicity, so every transposition is only expanded once.
+    Plies are processed in batches of at most `batch_size` positions, which
+    caps the memory of deep searches.
+
+    With a `heuristic`, the average heuristic score of the positions at the
+    depth limit (over all lines of play) is added to the score of every move,
+    so quiet positions are ranked as well. The leaves are scored as arrays too.
+
+    Attributes:
+        target_depth (int): Number of plies searched after the own move.
+        n_col (int): Number of columns of the board.
+        batch_size (int): Maximum number of positions expanded at once.
+        merge_transpositions (bool): Whether identical positions of a ply are merged.
+        heuristic (HeuristicEvaluator | None): Static evaluation of the positions at the depth limit.
+        scores (dict[int, int]): Score of every column of the last search.
+        stats (SearchStats): Counters and timings of the last search.
+    """
+    WIN_SCORE: int = 10000000      # the own move wins at once
+    ILLEGAL_SCORE: int = -10000000  # the column is full
+
+    def __init__(self, target_depth: int = 6, n_col: int = BitBoard.COLS, batch_size: int = 1 << 16,
+                 merge_transpositions: bool = True, heuristic: HeuristicEvaluator | None = None) -> None:
+        """
+        Initialize the search.
+
+        Parameters:
+            target_depth (int): Number of plies searched after the own move.
+            n_col (int): Number of columns of the board.
+            batch_size (int): Maximum number of positions expanded at once.
+            merge_transpositions (bool): Merge identical positions of a ply (same root move).
+            heuristic (HeuristicEvaluator | None): Scores the positions at the depth limit, none by default.
+        """
+        self.target_depth: int = target_depth
+        self.n_col: int = n_col
+        self.batch_size: int = batch_size
+        self.merge_transpositions: bool = merge_transpositions
+        self.heuristic: HeuristicEvaluator | None = heuristic
+        self.scores: dict[int, int] = {}
+        self.stats: SearchStats = SearchStats('batch')
+        self._totals: np.ndarray = np.zeros(n_col)
+        self._nodes: np.ndarray = np.zeros(n_col, dtype=np.int64)
+        self._leaf_totals: np.ndarray = np.zeros(n_col)
+        self._leaf_lines: np.ndarray = np.zeros(n_col)
+        self._player_first: bool = True
+
+    def evaluate_moves(self, board: np.ndarray, player_icon: str, opponent_icon: str) -> int:
+        """
+        Score every column and return the best one (same interface as `MoveEvaluator`).
+
+        Parameters:
+            board (np.ndarray): The 7x8 board containing 'X', 'O' or ''.
+            player_icon (str): Icon of the player to move.
+            opponent_icon (str): Icon of the opponent.
+
+        Returns:
+            int: The column with the highest score.
+        """
+        start = time.perf_counter()
+        self.stats = SearchStats('batch')
+        self.stats.depth = self.target_depth
+        self._totals = np.zeros(self.n_col)
+        self._nodes = np.zeros(self.n_col, dtype=np.int64)
+        self._leaf_totals = np.zeros(self.n_col)
+        self._leaf_lines = np.zeros(self.n_col)
+        self._player_first = player_icon == 'X'
+
+        bb = BitBoard.from_array(board)
+        own = bb.x_mask if player_icon == 'X' else bb.o_mask
+        other = bb.o_mask if player_icon == 'X' else bb.x_mask
+        scores = {}
+        roots = []
+        for col in range(self.n_col):
+            if not bb.can_play(col):
+                scores[col] = self.ILLEGAL_SCORE
+                continue
+            child = own | 1 << (col * BitBoard.COL_BITS + bb.heights[col])
+            self.stats.win_checks += 1
+            if BitBoard.has_four(child):
+                self.stats.terminals += 1
+                scores[col] = self.WIN_SCORE
+                continue
+            scores[col] = 0
+            roots.append((col, child))
+
+        if roots and self.target_depth > 0:
+            n = len(roots)
+            heights = np.tile(np.array(bb.heights, dtype=np.uint8), (n, 1))
+            root_cols = np.array([col for col, _ in roots], dtype=np.int64)
+            heights[np.arange(n), root_cols] += 1
+            # the opponent moves next: it is the "mover", our pieces are the "other" side
+            self._expand(np.full(n, other, dtype=np.uint64),
+                         np.array([child for _, child in roots], dtype=np.uint64),
+                         heights, root_cols, np.ones(n, dtype=np.int64), 1)
+            for col, _ in roots:
+                scores[col] = int(self._totals[col])
+                if self._leaf_lines[col]:
+                    scores[col] += round(self._leaf_totals[col] / self._leaf_lines[col])
+
+        self.scores = scores
+        self.stats.nodes = int(self._nodes.sum())
+        self.stats.elapsed = time.perf_counter() - start
+        self.stats.root_moves = [{'column': col, 'score': score, 'nodes': int(self._nodes[col])}
+                                 for col, score in scores.items()]
+        return max(scores, key=scores.get)
+
+    def _expand(self, mover: np.ndarray, other: np.ndarray, heights: np.ndarray,
+                roots: np.ndarray, weights: np.ndarray, ply: int) -> None:
+        """
+        Generate and score all children of a set of positions, then continue with the next ply.
+
+        Parameters:
+            mover (np.ndarray): uint64 masks of the player to move in every position.
+            other (np.ndarray): uint64 masks of the other player.
+            heights (np.ndarray): (N, n_col) uint8 column heights.
+            roots (np.ndarray): Root column every position belongs to.
+            weights (np.ndarray): Number of lines of play leading to every position.
+            ply (int): Ply of the children (1 is the opponent's reply to the root move).
+        """
+        # the player wins on even plies, the opponent (weighted 10x) on odd ones
+        win_value = (self.target_depth - ply) * (1 if ply % 2 == 0 else -10)
+        for start in range(0, len(roots), self.batch_size):
+            batch = slice(start, start + self.batch_size)
+            parent, col = np.nonzero(heights[batch] < BitBoard.ROWS)
+            parent += start
+            shift = col.astype(np.uint64) * np.uint64(BitBoard.COL_BITS) + heights[parent, col].astype(np.uint64)
+            child = mover[parent] | (np.uint64(1) << shift)
+            child_roots = roots[parent]
+            child_weights = weights[parent]
+            self._nodes += np.bincount(child_roots, minlength=self.n_col)
+
+            wins = has_four_bitboards(child)
+            self.stats.win_checks += len(child)
+            self.stats.terminals += int(wins.sum())
+            if win_value:
+                self._totals += win_value * np.bincount(child_roots[wins], weights=child_weights[wins],
+                                                        minlength=self.n_col)
+
+            open_lines = ~wins
+            if ply == self.target_depth:
+                self.stats.leaves += int(open_lines.sum())
+                if self.heuristic is not None:
+                    self._score_leaves(child[open_lines], other[parent[open_lines]], ply,
+                                       child_roots[open_lines], child_weights[open_lines])
+                continue
+            next_heights = heights[parent[open_lines]]
+            next_heights[np.arange(len(next_heights)), col[open_lines]] += 1
+            # the sides swap: the player who just moved is the "other" side of the children
+            next_mover, next_other = other[parent[open_lines]], child[open_lines]
+            next_roots, next_weights = child_roots[open_lines], child_weights[open_lines]
+            if self.merge_transpositions:
+                next_mover, next_other, next_heights, next_roots, next_weights = self._merge(
+                    next_mover, next_other, next_heights, next_roots, next_weights)
+            self._expand(next_mover, next_other, next_heights, next_roots, next_weights, ply + 1)
+
+    def _score_leaves(self, moved: np.ndarray, waiting: np.ndarray, ply: int,
+                      roots: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Add the heuristic scores of the positions at the depth limit to their root moves.
+
+        Parameters:
+            moved (np.ndarray): Masks of the player who made the last move.
+            waiting (np.ndarray): Masks of the other player.
+            ply (int): Ply of the last move (even: the player moved).
+            roots (np.ndarray): Root column of every position.
+            weights (np.ndarray): Number of lines of play leading to every position.
+        """
+        player, opponent = (moved, waiting) if ply % 2 == 0 else (waiting, moved)
+        values = self.heuristic.evaluate_batch(player, opponent, self._player_first)
+        self._leaf_totals += np.bincount(roots, weights=weights * values, minlength=self.n_col)
+        self._leaf_lines += np.bincount(roots, weights=weights, minlength=self.n_col)
+
+    def _merge(self, mover: np.ndarray, other: np.ndarray, heights: np.ndarray,
+               roots: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, ...]:
+        """
+        Merge identical positions below the same root move, adding up their weights.
+        """
+        # mover + all pieces identifies a position in 64 bits (like `BitBoard.key`)
+        keys = mover + (mover | other)
+        order = np.lexsort((keys, roots))
+        keys, sorted_roots = keys[order], roots[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (sorted_roots[1:] != sorted_roots[:-1])
+        groups = np.cumsum(first) - 1
+        merged_weights = np.bincount(groups, weights=weights[order]).astype(np.int64)
+        keep = order[first]
+        self.stats.tt_probes += len(roots)
+        self.stats.tt_hits += len(roots) - len(keep)
+        return mover[keep], other[keep], heights[keep], roots[keep], merged_weights
@@ -0,0 +1,135 @@
+import numpy as np
+
+from bitboard import BitBoard
+from board_codec import ICON_CODES, CODE_ICONS, encode_board
+from lines import DIRECTIONS, DIRECTION_STARTS
+
+
+# Shift of the directions of four in a row on a bitboard
+BITBOARD_SHIFTS: tuple[int, ...] = tuple(DIRECTION_STARTS)
+
+
+def stack_boards(boards: list[np.ndarray]) -> np.ndarray:
+    """
+    Encode string boards and stack them for the batch functions.
+
+    Parameters:
+        boards (list[np.ndarray]): 7x8 arrays containing 'X', 'O' or ''.
+
+    Returns:
+        np.ndarray: An (N, 7, 8) uint8 array with the codes of `board_codec`.
+    """
+    if not boards:
+        return np.zeros((0, BitBoard.ROWS, BitBoard.COLS), dtype=np.uint8)
+    return np.stack([encode_board(board) for board in boards])
+
+
+def has_four(pieces: np.ndarray) -> np.ndarray:
+    """
+    Check many boards of one player's pieces for four in a row.
+
+    Parameters:
+        pieces (np.ndarray): An (N, rows, cols) boolean array, True where the player has a piece.
+
+    Returns:
+        np.ndarray: A boolean array of length N, True for the boards with four in a row.
+    """
+    n, rows, cols = pieces.shape
+    found = np.zeros(n, dtype=bool)
+    for d_row, d_col in DIRECTIONS:
+        # the cells where a window of four in this direction can start
+        row_end = rows - 3 * d_row
+        col_start = 3 if d_col < 0 else 0
+        col_end = cols - 3 * d_col if d_col > 0 else cols
+        window = pieces[:, :row_end, col_start:col_end].copy()
+        for step in range(1, 4):
+            r = step * d_row
+            c = col_start + step * d_col
+            window &= pieces[:, r:r + row_end, c:c + col_end - col_start]
+        found |= window.any(axis=(1, 2))
+    return found
+
+
+def detect_wins(codes: np.ndarray) -> np.ndarray:
+    """
+    Detect the winner of many boards in one vectorized pass.
+
+    Parameters:
+        codes (np.ndarray): An (N, 7, 8) uint8 array with 0 (empty), 1 ('X') or 2 ('O'),
+            e.g. from `stack_boards`. A single (7, 8) board is accepted as well.
+
+    Returns:
+        np.ndarray: A uint8 array of length N with the code of the winner of every board,
+            0 if there is none. Like `lines.find_winner`, 'X' is reported if both have four.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    if codes.ndim == 2:
+        codes = codes[np.newaxis]
+    winners = np.zeros(len(codes), dtype=np.uint8)
+    winners[has_four(codes == ICON_CODES['O'])] = ICON_CODES['O']
+    winners[has_four(codes == ICON_CODES['X'])] = ICON_CODES['X']
+    return winners
+
+
+def winner_icons(codes: np.ndarray) -> np.ndarray:
+    """
+    Detect the winner of many boards, as icons.
+
+    Parameters:
+        codes (np.ndarray): An (N, 7, 8) uint8 array, see `detect_wins`.
+
+    Returns:
+        np.ndarray: An array of length N containing 'X', 'O' or '' (no winner).
+    """
+    return CODE_ICONS[detect_wins(codes)]
+
+
+def bitboard_arrays(bitboards: list[BitBoard]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Collect the masks of many bitboards into arrays for `detect_wins_bitboards`.
+
+    Parameters:
+        bitboards (list[BitBoard]): The boards.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The uint64 masks of 'X' and of 'O'.
+    """
+    x_masks = np.array([bb.x_mask for bb in bitboards], dtype=np.uint64)
+    o_masks = np.array([bb.o_mask for bb in bitboards], dtype=np.uint64)
+    return x_masks, o_masks
+
+
+def has_four_bitboards(masks: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `BitBoard.has_four` for an array of masks of one player.
+
+    Parameters:
+        masks (np.ndarray): uint64 bitmasks in the layout of `BitBoard`.
+
+    Returns:
+        np.ndarray: A boolean array, True for the masks with four in a row.
+    """
+    masks = np.asarray(masks, dtype=np.uint64)
+    found = np.zeros(masks.shape, dtype=bool)
+    for shift in BITBOARD_SHIFTS:
+        m = masks & (masks >> np.uint64(shift))
+        found |= (m & (m >> np.uint64(2 * shift))) != 0
+    return found
+
+
+def detect_wins_bitboards(x_masks: np.ndarray, o_masks: np.ndarray) -> np.ndarray:
+    """
+    Detect the winner of many bitboards in one vectorized pass.
+
+    Parameters:
+        x_masks (np.ndarray): uint64 masks of the pieces of 'X' (see `bitboard_arrays`).
+        o_masks (np.ndarray): uint64 masks of the pieces of 'O', same shape.
+
+    Returns:
+        np.ndarray: A uint8 array with the code of the winner of every board (0 if none),
+            'X' is reported if both have four.
+    """
+    winners = np.zeros(np.shape(x_masks), dtype=np.uint8)
+    winners[has_four_bitboards(o_masks)] = ICON_CODES['O']
+    winners[has_four_bitboards(x_masks)] = ICON_CODES['X']
+    return winners
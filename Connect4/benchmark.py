@@ -0,0 +1,412 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import timeit
+from itertools import cycle
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+import batch_win
+from batch_search import BatchSearch
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from game import Connect4
+from lines import find_winner
+from search import NegamaxSearch
+import move_class
+import move_class_v2
+
+
+# Positions the benchmarks run on, as the columns played from the empty board
+# (all without a winner, so every engine has to search them)
+POSITIONS: dict[str, str] = {
+    'empty': '',
+    'opening_4': '3416',
+    'opening_8': '72110640',
+    'middle_14': '35421430443244',
+    'middle_20': '51563237414044366467',
+    'middle_28': '7424625050725541736310002207',
+    'late_36': '513510575120730315241013400046223266',
+}
+
+# The position analysed in stuff.ipynb ('O' to move)
+NOTEBOOK_BOARD: np.ndarray = np.array([
+    ['', '', '', '', 'X', '', '', ''],
+    ['', '', '', 'X', 'O', 'X', '', ''],
+    ['', '', '', 'X', 'O', 'X', '', ''],
+    ['', '', 'X', 'O', 'O', 'O', '', ''],
+    ['', '', 'O', 'O', 'X', 'O', 'O', ''],
+    ['', '', 'X', 'X', 'X', 'O', 'X', ''],
+    ['O', '', 'O', 'X', 'X', 'X', 'O', ''],
+])
+
+GROUPS: tuple[str, ...] = ('win', 'moves', 'search', 'server')
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Timing of one benchmark.
+
+    Attributes:
+        name (str): Name of the benchmark, unique within a run.
+        group (str): Group of the benchmark (one of `GROUPS`).
+        calls (int): Number of calls per repetition.
+        repeat (int): Number of repetitions.
+        best_us (float): Fastest repetition, in microseconds per call.
+        median_us (float): Median repetition, in microseconds per call.
+        mean_us (float): Mean over all repetitions, in microseconds per call.
+    """
+    name: str
+    group: str
+    calls: int
+    repeat: int
+    best_us: float
+    median_us: float
+    mean_us: float
+
+
+def board_from_moves(moves: str) -> np.ndarray:
+    """
+    Build the string board reached by playing the given columns from the empty board.
+
+    Parameters:
+        moves (str): Columns played in order ('X' starts), e.g. '3416'.
+
+    Returns:
+        np.ndarray: The 7x8 board containing 'X', 'O' or ''.
+    """
+    bb = BitBoard()
+    for col in moves:
+        bb.play(int(col))
+    return bb.to_array()
+
+
+def corpus() -> dict[str, np.ndarray]:
+    """
+    All benchmark positions by name.
+
+    Returns:
+        dict[str, np.ndarray]: The boards of `POSITIONS` and the notebook position.
+    """
+    boards = {name: board_from_moves(moves) for name, moves in POSITIONS.items()}
+    boards['notebook'] = NOTEBOOK_BOARD.copy()
+    return boards
+
+
+def measure(name: str, group: str, func: Callable[[], object], calls: int, repeat: int) -> BenchmarkResult:
+    """
+    Time a function with `timeit`.
+
+    Parameters:
+        name (str): Name of the benchmark.
+        group (str): Group of the benchmark.
+        func (Callable[[], object]): The code to time.
+        calls (int): Calls per repetition.
+        repeat (int): Number of repetitions.
+
+    Returns:
+        BenchmarkResult: The timing, per call.
+    """
+    times = [1e6 * t / calls for t in timeit.Timer(func).repeat(repeat=repeat, number=calls)]
+    return BenchmarkResult(name, group, calls, repeat, min(times), float(np.median(times)), sum(times) / len(times))
+
+
+def _icon_to_move(board: np.ndarray) -> tuple[str, str]:
+    """
+    Icons of the player to move and of the opponent.
+    """
+    return ('X', 'O') if np.sum(board == 'X') == np.sum(board == 'O') else ('O', 'X')
+
+
+def bench_win_detection(boards: dict[str, np.ndarray], quick: bool) -> list[BenchmarkResult]:
+    """
+    Win detection on every position: the full-board check of the line index (`lines.find_winner`),
+    the incremental `Connect4.detect_win_at`,
+    `BitBoard.winner` and the vectorized batch functions of `batch_win`
+    (on the corpus repeated to 1000 boards).
+    """
+    calls, repeat = (20, 3) if quick else (200, 5)
+    games = []
+    for board in boards.values():
+        game = Connect4()
+        game.board = board.copy()
+        game.bitboard = BitBoard.from_array(board)
+        games.append(game)
+    cells = [np.argwhere(board != '') for board in boards.values()]
+    bitboards = [BitBoard.from_array(board) for board in boards.values()]
+    batch_size = 1000
+    codes = batch_win.stack_boards(list(boards.values()) * -(-batch_size // len(boards)))[:batch_size]
+    x_masks, o_masks = batch_win.bitboard_arrays((bitboards * -(-batch_size // len(bitboards)))[:batch_size])
+
+    def detect_win_at():
+        for game, occupied in zip(games, cells):
+            for row, column in occupied:
+                game.detect_win_at(row, column)
+
+    return [
+        measure('lines.find_winner', 'win', lambda: [find_winner(board) for board in boards.values()], calls, repeat),
+        measure('Connect4.detect_win_at (every piece)', 'win', detect_win_at, calls, repeat),
+        measure('BitBoard.winner', 'win', lambda: [bb.winner() for bb in bitboards], calls, repeat),
+        measure(f'batch_win.detect_wins ({batch_size} boards)', 'win',
+                lambda: batch_win.detect_wins(codes), calls, repeat),
+        measure(f'batch_win.detect_wins_bitboards ({batch_size})', 'win',
+                lambda: batch_win.detect_wins_bitboards(x_masks, o_masks), calls, repeat),
+    ]
+
+
+def bench_move_generation(boards: dict[str, np.ndarray], quick: bool) -> list[BenchmarkResult]:
+    """
+    Placing and removing a piece in every legal column of every position with
+    `MoveEvaluator.place/undo` (v1 and v2) and `BitBoard.play/undo`.
+    """
+    calls, repeat = (50, 3) if quick else (500, 5)
+    work = [(board.copy(), _icon_to_move(board)[0]) for board in boards.values()]
+    bitboards = [BitBoard.from_array(board) for board in boards.values()]
+    evaluators = {
+        'MoveEvaluator.place/undo (v1)': move_class.MoveEvaluator(0, BitBoard.COLS, None),
+        'MoveEvaluator.place/undo (v2)': move_class_v2.MoveEvaluator(0, BitBoard.COLS, None),
+    }
+
+    def place_undo(evaluator) -> Callable[[], None]:
+        def run():
+            for board, icon in work:
+                for col in range(BitBoard.COLS):
+                    if evaluator.check_move(col, board):
+                        evaluator.place(col, icon, board)
+                        evaluator.undo(col, board)
+        return run
+
+    def play_undo():
+        for bb in bitboards:
+            for col in range(BitBoard.COLS):
+                if bb.can_play(col):
+                    bb.play(col)
+                    bb.undo(col)
+
+    results = [measure(name, 'moves', place_undo(evaluator), calls, repeat) for name, evaluator in evaluators.items()]
+    results.append(measure('BitBoard.play/undo', 'moves', play_undo, calls, repeat))
+    return results
+
+
+def bench_search(boards: dict[str, np.ndarray], quick: bool, processes: int | None = None) -> list[BenchmarkResult]:
+    """
+    A full move decision on every position at fixed depths: `evaluate_moves` of
+    `move_class`, `move_class_v2` and `BatchSearch` (all with the same scores),
+    and `NegamaxSearch.search` without a table, with and without the heuristic
+    evaluation, plus the `HeuristicEvaluator` itself.
+    """
+    repeat = 1 if quick else 3
+    positions = [(board, *_icon_to_move(board)) for board in boards.values()]
+    results = []
+
+    def evaluate_moves(evaluator) -> Callable[[], None]:
+        def run():
+            for board, player_icon, opponent_icon in positions:
+                evaluator.evaluate_moves(board.copy(), player_icon, opponent_icon)
+        return run
+
+    def evaluate_moves_quietly(evaluator) -> Callable[[], None]:
+        run = evaluate_moves(evaluator)
+
+        def run_quietly():
+            with contextlib.redirect_stdout(io.StringIO()):    # move_class prints the scores of every move
+                run()
+        return run_quietly
+
+    for depth in ((2,) if quick else (2, 3)):
+        evaluator = move_class.MoveEvaluator(depth, BitBoard.COLS, None)
+        results.append(measure(f'move_class.evaluate_moves depth={depth}', 'search',
+                               evaluate_moves_quietly(evaluator), 1, repeat))
+        with move_class_v2.MoveEvaluator(depth, BitBoard.COLS, None, processes=processes) as evaluator:
+            evaluator.start()       # the pool is started once per bot, not per move
+            results.append(measure(f'move_class_v2.evaluate_moves depth={depth}', 'search',
+                                   evaluate_moves(evaluator), 1, repeat))
+    for depth in ((2, 4) if quick else (2, 3, 4, 6)):
+        results.append(measure(f'BatchSearch.evaluate_moves depth={depth}', 'search',
+                               evaluate_moves(BatchSearch(depth)), 1, repeat))
+
+    bitboards = [BitBoard.from_array(board) for board in boards.values()]
+    for depth in ((4, 6) if quick else (4, 6, 8)):
+        search = NegamaxSearch(depth)
+        results.append(measure(f'NegamaxSearch.search depth={depth}', 'search',
+                               lambda: [search.search(bb) for bb in bitboards], 1, repeat))
+    heuristic = HeuristicEvaluator()
+    for depth in ((4,) if quick else (4, 6)):
+        search = NegamaxSearch(depth, heuristic=heuristic)
+        results.append(measure(f'NegamaxSearch.search depth={depth} +heuristic', 'search',
+                               lambda: [search.search(bb) for bb in bitboards], 1, repeat))
+
+    calls = 20 if quick else 200
+    x_masks, o_masks = batch_win.bitboard_arrays(bitboards * -(-1000 // len(bitboards)))
+    results.append(measure('HeuristicEvaluator.evaluate_bitboard', 'search',
+                           lambda: [heuristic.evaluate_bitboard(bb) for bb in bitboards], calls, repeat))
+    results.append(measure(f'HeuristicEvaluator.evaluate_batch ({len(x_masks)})', 'search',
+                           lambda: heuristic.evaluate_batch(x_masks, o_masks, True), calls, repeat))
+    return results
+
+
+def bench_server(quick: bool) -> list[BenchmarkResult]:
+    """
+    Latency of the main endpoints, served in-process by the Flask test client
+    (routing, locking and JSON encoding, without the network).
+    """
+    from server import Connect4Server
+
+    calls, repeat = (50, 3) if quick else (500, 5)
+    server = Connect4Server()
+    client = server.app.test_client()
+
+    def new_game() -> tuple[str, tuple[str, str]]:
+        game_id = client.post('/connect4/games').get_json()['game_id']
+        players = ('player-x', 'player-o')
+        for player_id in players:
+            client.post(f'/connect4/{game_id}/register', json={'player_id': player_id})
+        return game_id, players
+
+    game_id, players = new_game()
+    for col in (3, 4, 3):
+        client.post(f'/connect4/{game_id}/make_move', json={'player_id': players[0], 'column': col})
+        players = players[::-1]
+    etag = client.get(f'/connect4/{game_id}/state').headers['ETag']
+
+    # Every move needs a fresh slot: games are prepared up front and filled with
+    # the 8 moves of the bottom row, which never connect four
+    moves = []
+    for _ in range(-(-calls * repeat // BitBoard.COLS)):
+        move_game, move_players = new_game()
+        moves.extend((move_game, move_players[col % 2], col) for col in range(BitBoard.COLS))
+    next_move = iter(moves).__next__
+
+    def make_move():
+        move_game, player_id, col = next_move()
+        client.post(f'/connect4/{move_game}/make_move', json={'player_id': player_id, 'column': col})
+
+    waiting = cycle(players)
+    return [
+        measure('GET /status', 'server', lambda: client.get(f'/connect4/{game_id}/status'), calls, repeat),
+        measure('GET /board', 'server', lambda: client.get(f'/connect4/{game_id}/board'), calls, repeat),
+        measure('GET /state', 'server', lambda: client.get(f'/connect4/{game_id}/state'), calls, repeat),
+        measure('GET /state (304)', 'server',
+                lambda: client.get(f'/connect4/{game_id}/state', headers={'If-None-Match': etag}), calls, repeat),
+        measure('GET /wait (timeout=0)', 'server',
+                lambda: client.get(f'/connect4/{game_id}/wait',
+                                   query_string={'player_id': next(waiting), 'timeout': 0}), calls, repeat),
+        measure('POST /make_move', 'server', make_move, calls, repeat),
+    ]
+
+
+def run_benchmarks(groups: tuple[str, ...] = GROUPS, quick: bool = False,
+                   processes: int | None = None) -> dict:
+    """
+    Run the benchmark groups and collect the results with information about the run.
+
+    Parameters:
+        groups (tuple[str, ...]): The groups to run, see `GROUPS`.
+        quick (bool): Fewer repetitions and shallower searches (a smoke run).
+        processes (int | None): Worker processes of `move_class_v2`, defaults to `os.cpu_count()`.
+
+    Returns:
+        dict: 'meta' (commit, versions, machine) and 'results' (one dict per benchmark).
+    """
+    boards = corpus()
+    results = []
+    if 'win' in groups:
+        results += bench_win_detection(boards, quick)
+    if 'moves' in groups:
+        results += bench_move_generation(boards, quick)
+    if 'search' in groups:
+        results += bench_search(boards, quick, processes)
+    if 'server' in groups:
+        results += bench_server(quick)
+    return {'meta': run_info(quick), 'results': [result._asdict() for result in results]}
+
+
+def run_info(quick: bool) -> dict:
+    """
+    Describe the run so results of different commits and machines can be told apart.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'quick': quick,
+        'positions': len(POSITIONS) + 1,
+    }
+
+
+def compare(baseline: dict, current: dict) -> list[tuple[str, float, float, float]]:
+    """
+    Compare the medians of two runs.
+
+    Parameters:
+        baseline (dict): Output of `run_benchmarks` of the older run.
+        current (dict): Output of `run_benchmarks` of the newer run.
+
+    Returns:
+        list[tuple[str, float, float, float]]: Name, baseline and current median (µs)
+            and the speedup (> 1 is faster) of every benchmark found in both runs.
+    """
+    old = {result['name']: result['median_us'] for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        if result['name'] in old:
+            rows.append((result['name'], old[result['name']], result['median_us'],
+                         old[result['name']] / result['median_us']))
+    return rows
+
+
+def print_results(report: dict) -> None:
+    """
+    Print the results of a run as a table.
+    """
+    print(f"{'benchmark':<42} {'best':>12} {'median':>12}")
+    for result in report['results']:
+        print(f"{result['name']:<42} {format_us(result['best_us']):>12} {format_us(result['median_us']):>12}")
+
+
+def format_us(us: float) -> str:
+    """
+    Format a duration given in microseconds with a readable unit.
+    """
+    if us >= 1e6:
+        return f"{us / 1e6:.2f} s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f} ms"
+    return f"{us:.1f} µs"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark win detection, move generation, search and the server")
+    parser.add_argument('--groups', nargs='+', choices=GROUPS, default=list(GROUPS))
+    parser.add_argument('--quick', action='store_true', help="fewer repetitions and shallower searches")
+    parser.add_argument('--processes', type=int, default=None, help="worker processes of move_class_v2")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    report = run_benchmarks(tuple(args.groups), args.quick, args.processes)
+    print_results(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {baseline['meta']['commit']} ({baseline['meta']['time']})")
+        print(f"{'benchmark':<42} {'before':>12} {'after':>12} {'speedup':>8}")
+        for name, before, after, speedup in compare(baseline, report):
+            print(f"{name:<42} {format_us(before):>12} {format_us(after):>12} {speedup:>7.2f}x")
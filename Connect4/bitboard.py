@@ -0,0 +1,217 @@
+import numpy as np
+
+
+class BitBoard:
+    """
+    Compact bitboard representation of a 7x8 Connect 4 board.
+
+    Every column uses 8 bits of a 64-bit integer: 7 bits for the playable
+    rows (bit 0 is the bottom row) plus one empty sentinel bit on top, which
+    keeps shifted win patterns from wrapping into the next column.
+    The 8 columns therefore fit into exactly 64 bits.
+
+        bit index = column * 8 + row_from_bottom
+
+    Attributes:
+        x_mask (int): Bitmask of all pieces of Player 1 ('X').
+        o_mask (int): Bitmask of all pieces of Player 2 ('O').
+        heights (list[int]): Number of pieces in every column.
+        moves (int): Total number of pieces on the board.
+    """
+    ROWS: int = 7
+    COLS: int = 8
+    COL_BITS: int = 8
+    FULL_COLUMN: int = (1 << ROWS) - 1
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty bitboard.
+        """
+        self.x_mask: int = 0
+        self.o_mask: int = 0
+        self.heights: list[int] = [0] * self.COLS
+        self.moves: int = 0
+
+    @classmethod
+    def from_array(cls, board: np.ndarray) -> 'BitBoard':
+        """
+        Build a bitboard from the string board used by `Connect4`.
+
+        Parameters:
+            board (np.ndarray): A 7x8 array containing 'X', 'O' or ''.
+
+        Returns:
+            BitBoard: The equivalent bitboard.
+
+        Raises:
+            ValueError: If the board has the wrong shape or a floating piece.
+        """
+        if board.shape != (cls.ROWS, cls.COLS):
+            raise ValueError(f"Expected a {cls.ROWS}x{cls.COLS} board, got {board.shape}")
+
+        bb = cls()
+        for col in range(cls.COLS):
+            for row_from_bottom in range(cls.ROWS):
+                cell = board[cls.ROWS - 1 - row_from_bottom, col]
+                if cell == '':
+                    break
+                bit = 1 << (col * cls.COL_BITS + row_from_bottom)
+                if cell == 'X':
+                    bb.x_mask |= bit
+                elif cell == 'O':
+                    bb.o_mask |= bit
+                else:
+                    raise ValueError(f"Unknown piece {cell!r} in column {col}")
+                bb.heights[col] += 1
+            # everything above the first empty cell has to be empty as well
+            if (board[:cls.ROWS - bb.heights[col], col] != '').any():
+                raise ValueError(f"Floating piece in column {col}")
+        bb.moves = sum(bb.heights)
+        return bb
+
+    def to_array(self) -> np.ndarray:
+        """
+        Convert the bitboard back to the string board used by `Connect4`.
+
+        Returns:
+            np.ndarray: A 7x8 array containing 'X', 'O' or ''.
+        """
+        board = np.full((self.ROWS, self.COLS), '', dtype=str)
+        for col in range(self.COLS):
+            for row_from_bottom in range(self.heights[col]):
+                bit = 1 << (col * self.COL_BITS + row_from_bottom)
+                board[self.ROWS - 1 - row_from_bottom, col] = 'X' if self.x_mask & bit else 'O'
+        return board
+
+    def copy(self) -> 'BitBoard':
+        """
+        Create an independent copy of the bitboard.
+
+        Returns:
+            BitBoard: The copy.
+        """
+        bb = BitBoard.__new__(BitBoard)
+        bb.x_mask = self.x_mask
+        bb.o_mask = self.o_mask
+        bb.heights = self.heights.copy()
+        bb.moves = self.moves
+        return bb
+
+    @property
+    def mask(self) -> int:
+        """
+        Bitmask of all occupied cells.
+        """
+        return self.x_mask | self.o_mask
+
+    def current_icon(self) -> str:
+        """
+        Icon of the player whose turn it is ('X' always starts).
+
+        Returns:
+            str: 'X' or 'O'.
+        """
+        return 'O' if self.moves % 2 else 'X'
+
+    def can_play(self, col: int) -> bool:
+        """
+        Check if a piece can still be dropped into a column.
+
+        Parameters:
+            col (int): Column index (0-indexed).
+
+        Returns:
+            bool: True if the column is not full.
+        """
+        return self.heights[col] < self.ROWS
+
+    def play(self, col: int, icon: str | None = None) -> int:
+        """
+        Drop a piece into a column.
+
+        Parameters:
+            col (int): Column index (0-indexed).
+            icon (str | None): 'X' or 'O'; defaults to the player whose turn it is.
+
+        Returns:
+            int: The row (0 = top, like `Connect4.board`) the piece landed in.
+        """
+        if icon is None:
+            icon = self.current_icon()
+        bit = 1 << (col * self.COL_BITS + self.heights[col])
+        if icon == 'X':
+            self.x_mask |= bit
+        else:
+            self.o_mask |= bit
+        self.heights[col] += 1
+        self.moves += 1
+        return self.ROWS - self.heights[col]
+
+    def undo(self, col: int) -> None:
+        """
+        Remove the top piece of a column.
+
+        Parameters:
+            col (int): Column index (0-indexed).
+        """
+        self.heights[col] -= 1
+        self.moves -= 1
+        clear = ~(1 << (col * self.COL_BITS + self.heights[col]))
+        self.x_mask &= clear
+        self.o_mask &= clear
+
+    def key(self) -> int:
+        """
+        Unique 64-bit key of the position.
+
+        Adds the occupancy mask to the pieces of the player to move, which
+        sets one extra bit above every column and therefore identifies the
+        position (including whose turn it is) without collisions.
+
+        Returns:
+            int: The position key.
+        """
+        own = self.o_mask if self.moves % 2 else self.x_mask
+        return own + self.mask
+
+    @staticmethod
+    def has_four(pieces: int) -> bool:
+        """
+        Check if a bitmask contains four connected pieces.
+
+        Parameters:
+            pieces (int): Bitmask of one player's pieces.
+
+        Returns:
+            bool: True if there are four in a row in any direction.
+        """
+        # vertical, horizontal, diagonal (/) and diagonal (\)
+        for shift in (1, BitBoard.COL_BITS, BitBoard.COL_BITS + 1, BitBoard.COL_BITS - 1):
+            m = pieces & (pieces >> shift)
+            if m & (m >> (2 * shift)):
+                return True
+        return False
+
+    def winner(self) -> str | None:
+        """
+        Detect if there is a winner on the board.
+
+        Returns:
+            str: The winning player's icon ('X' or 'O'), or None if no winner.
+        """
+        if self.has_four(self.x_mask):
+            return 'X'
+        if self.has_four(self.o_mask):
+            return 'O'
+        return None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BitBoard):
+            return NotImplemented
+        return self.x_mask == other.x_mask and self.o_mask == other.o_mask
+
+    def __hash__(self) -> int:
+        return hash((self.x_mask, self.o_mask))
+
+    def __repr__(self) -> str:
+        return f"BitBoard(x_mask={self.x_mask:#018x}, o_mask={self.o_mask:#018x}, heights={self.heights})"
@@ -0,0 +1,35 @@
+import numpy as np
+
+
+# Compact codes of the string board cells
+ICON_CODES: dict[str, int] = {'': 0, 'X': 1, 'O': 2}
+CODE_ICONS: np.ndarray = np.array(['', 'X', 'O'], dtype=str)
+
+
+def encode_board(board: np.ndarray) -> np.ndarray:
+    """
+    Encode a string board as one byte per cell.
+
+    Parameters:
+        board (np.ndarray): A 7x8 array containing 'X', 'O' or ''.
+
+    Returns:
+        np.ndarray: A 7x8 uint8 array with 0 (empty), 1 ('X') or 2 ('O').
+    """
+    codes = np.zeros(board.shape, dtype=np.uint8)
+    codes[board == 'X'] = ICON_CODES['X']
+    codes[board == 'O'] = ICON_CODES['O']
+    return codes
+
+
+def decode_board(codes: np.ndarray) -> np.ndarray:
+    """
+    Decode a board encoded with `encode_board` back to strings.
+
+    Parameters:
+        codes (np.ndarray): A 7x8 uint8 array with 0 (empty), 1 ('X') or 2 ('O').
+
+    Returns:
+        np.ndarray: A new 7x8 array containing 'X', 'O' or ''.
+    """
+    return CODE_ICONS[codes]
@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+import httpx
+
+from api_client import AsyncGameClient
+from player_async import Player_Async
+
+
+class Coordinator_Async:
+    """
+    Coordinator for one asyncio remote player.
+
+    Like `Coordinator_Remote`, but `play` is a coroutine: while the player waits
+    for the opponent (long-polling) or thinks in its worker thread, the event
+    loop serves other coordinators, so one process can drive many games at once.
+
+    Attributes:
+        player (Player_Async): The player driven by this coordinator.
+        result (str | None): Icon of the winner, 'draw', or None while the game is running.
+    """
+    CELLS: int = 7 * 8
+
+    def __init__(self, player: Player_Async) -> None:
+        """
+        Initialize the Coordinator_Async.
+
+        Parameters:
+            player (Player_Async): The player to drive (already bound to its game).
+        """
+        self.player: Player_Async = player
+        self.result: str | None = None
+
+    async def play(self) -> str:
+        """
+        Register the player (unless it already is) and play the game until it is over.
+
+        Returns:
+            str: The icon of the winner, or 'draw' if the board is full.
+        """
+        if self.player.icon is None:
+            self.player.icon = await self.player.register_in_game()
+        status = await self.player.get_game_status()
+        while True:
+            if status.get('winner'):
+                await self.player.celebrate_win()
+                self.result = status['winner']
+                return self.result
+            elif status.get('turn', -1) >= self.CELLS:
+                self.result = 'draw'
+                return self.result
+            elif str(status.get('active_id')) == str(self.player.id):
+                await self.player.visualize()
+                await self.player.make_move()
+                status = await self.player.get_game_status()
+            else:
+                status = await self.player.wait_for_turn()     # the status the wait ended with
+
+
+async def create_game(http: httpx.AsyncClient, api_url: str) -> str:
+    """
+    Create a new game on the server.
+
+    Parameters:
+        http (httpx.AsyncClient): Client used for the request.
+        api_url (str): The API URL for the Connect4 game server.
+
+    Returns:
+        str: The ID of the new game.
+    """
+    response = await http.post(f"{api_url}/connect4/games")
+    if response.status_code != 201:
+        raise ConnectionError(f"Failed to create game: {response.status_code}")
+    return response.json()['game_id']
+
+
+async def start_game(http: httpx.AsyncClient, api_url: str, strategies: tuple) -> list[Coordinator_Async]:
+    """
+    Create a game and register one player for each strategy in order (the first one gets 'X').
+
+    Parameters:
+        http (httpx.AsyncClient): Client shared by the players.
+        api_url (str): The API URL for the Connect4 game server.
+        strategies (tuple): Strategy of the first and the second player, None for random moves.
+
+    Returns:
+        list[Coordinator_Async]: The coordinators of both players, ready to play.
+    """
+    game_id = await create_game(http, api_url)
+    coordinators = []
+    for strategy in strategies:
+        client = AsyncGameClient(api_url, game_id, http=http)
+        player = Player_Async(client, strategy) if strategy else Player_Async(client)
+        player.icon = await player.register_in_game()
+        coordinators.append(Coordinator_Async(player))
+    return coordinators
+
+
+async def play_games(api_urls: list[str], n_games: int, strategy_x=None, strategy_o=None) -> list[str]:
+    """
+    Play many bot-vs-bot games concurrently in this process.
+
+    Every game gets its own session on one of the servers (round robin); all
+    players share one connection pool.
+
+    Parameters:
+        api_urls (list[str]): The servers to play on.
+        n_games (int): Number of games to play.
+        strategy_x: Strategy of the first player of every game (see `Player_Async`), random if None.
+        strategy_o: Strategy of the second player of every game, random if None.
+
+    Returns:
+        list[str]: The result of every game (winner icon or 'draw').
+    """
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=4 * n_games)
+    async with httpx.AsyncClient(limits=limits, timeout=10) as http:
+        games = await asyncio.gather(*(
+            start_game(http, api_urls[i % len(api_urls)], (strategy_x, strategy_o)) for i in range(n_games)
+        ))
+        results = await asyncio.gather(*(coordinator.play() for game in games for coordinator in game))
+    return results[::2]     # both players of a game report the same result
+
+
+# To run a bot-vs-bot ladder
+if __name__ == "__main__":
+    api_url = "http://127.0.0.1:5000"  # Connect 4 API server URL
+
+    start = time.time()
+    results = asyncio.run(play_games([api_url], n_games=20))
+    print(f"{len(results)} games in {time.time() - start:.2f} seconds")
@@ -1,4 +1,5 @@
-from time import sleep
+import argparse
+
 from faster_good_bot import Bot_Player
 
 
@@ -18,26 +19,27 @@ class Coordinator_Remote:
         sense (SenseHat):   Optional Local Instance of a SenseHat (if on Raspi)
     """
 
-    def __init__(self, api_url: str, on_raspi:bool = False) -> None:
+    def __init__(self, api_url: str, on_raspi:bool = False, game_id: str | None = None) -> None:
         """
         Initialize the Coordinator_Remote.
 
         Parameters:
             api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
+            game_id (str | None): ID of the game on the server (default: None, the server's default game).
         """
         self.api_url = api_url
-        self.player = Bot_Player(self.api_url)
+        self.player = Bot_Player(self.api_url, game_id=game_id)
 
     def wait_for_second_player(self):
         """
-        Waits for the second player to connect.
+        Waits for the other player to connect or to make their move.
 
-        This method checks the game status until the second player is detected,
-        indicating that the game can start.
+        The server answers as soon as it is this player's turn or the game is over
+        (long-polling), so there is no polling delay between the moves.
         """
         self.player.visualize()
         print('Waiting for other Player.')
-        sleep(1)
+        self.player.wait_for_turn()
         
 
     def play(self):
@@ -54,6 +56,7 @@ class Coordinator_Remote:
             active = status.get('active_id')
             if winner:
                 self.player.celebrate_win()
+                self.player.close()
                 break
             
             else:
@@ -78,6 +81,11 @@ if __name__ == "__main__":
     # pc_url = "http://10.147.97.97:5000"
     # pc_url = "http://127.0.1.1:5000"
 
+    parser = argparse.ArgumentParser(description="Let the bot play a game on a Connect4 server")
+    parser.add_argument('--url', default=api_url, help="API URL of the server")
+    parser.add_argument('--game-id', default=None, help="game to join (default: the server's default game)")
+    args = parser.parse_args()
+
     # Initialize the Coordinator
-    c_remote = Coordinator_Remote(api_url=api_url)
+    c_remote = Coordinator_Remote(api_url=args.url, game_id=args.game_id)
     c_remote.play()
\ No newline at end of file
@@ -1,4 +1,5 @@
-from time import sleep
+import argparse
+
 from player_remote import Player_Remote
 
 
@@ -18,13 +19,16 @@ class Coordinator_Remote:
         sense (Optional[SenseHat]):   Optional Local Instance of a SenseHat (if on Raspi)
     """
 
-    def __init__(self, api_url: str, on_raspi: bool = False) -> None:
+    def __init__(self, api_url: str, on_raspi: bool = False, game_id: str | None = None,
+                 use_websocket: bool = False) -> None:
         """
         Initialize the Coordinator_Remote.
 
         Parameters:
             api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
             on_raspi (bool):    Specifies if the game is played on a Raspberry Pi with SenseHat (default: False).
+            game_id (str | None): ID of the game on the server (default: None, the server's default game).
+            use_websocket (bool): Play over one WebSocket connection instead of the REST endpoints (default: False).
 
         Raises:
             ImportError: If `on_raspi` is True and the SenseHat module is not installed.
@@ -36,22 +40,25 @@ class Coordinator_Remote:
                 from sense_hat import SenseHat
                 from player_raspi_remote import Player_Raspi_Remote
                 self.sense = SenseHat()
-                self.player = Player_Raspi_Remote(self.api_url, self.sense)
+                self.player = Player_Raspi_Remote(self.api_url, self.sense, game_id=game_id)
             except ImportError:
                 raise ImportError("sense_hat module is not installed, but 'on_raspi' is set to True.")
+        elif use_websocket:
+            from player_websocket import Player_WebSocket
+            self.player = Player_WebSocket(self.api_url, game_id=game_id)
         else:
-            self.player = Player_Remote(self.api_url)
+            self.player = Player_Remote(self.api_url, game_id=game_id)
 
     def wait_for_second_player(self) -> None:
         """
-        Waits for the second player to connect.
+        Waits for the other player to connect or to make their move.
 
-        This method checks the game status until the second player is detected,
-        indicating that the game can start.
+        The server answers as soon as it is this player's turn or the game is over
+        (long-polling), so there is no polling delay between the moves.
         """
         self.player.visualize()
         print('Waiting for other Player.')
-        sleep(1)
+        self.player.wait_for_turn()
 
     def play(self) -> None:
         """ 
@@ -84,6 +91,14 @@ if __name__ == "__main__":
     # pc_url = "http://10.147.97.97:5000"
     # pc_url = "http://127.0.1.1:5000"
 
+    parser = argparse.ArgumentParser(description="Play a game on a Connect4 server")
+    parser.add_argument('--url', default=api_url, help="API URL of the server")
+    parser.add_argument('--game-id', default=None, help="game to join (default: the server's default game)")
+    parser.add_argument('--websocket', action='store_true', help="play over the WebSocket endpoint")
+    parser.add_argument('--raspi', action='store_true', help="play on the SenseHat of a Raspberry Pi")
+    args = parser.parse_args()
+
     # Initialize the Coordinator
-    c_remote = Coordinator_Remote(api_url=api_url)
+    c_remote = Coordinator_Remote(api_url=args.url, on_raspi=args.raspi, game_id=args.game_id,
+                                  use_websocket=args.websocket)
     c_remote.play()
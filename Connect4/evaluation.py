@@ -0,0 +1,217 @@
+import numpy as np
+
+from bitboard import BitBoard
+from lines import CELL_BITS, DIRECTION_STARTS
+from solver import BOARD_MASK, winning_positions
+
+
+# Cells of the two center columns, which are part of the most windows
+CENTER_MASK: int = sum(BitBoard.FULL_COLUMN << (col * BitBoard.COL_BITS)
+                       for col in (BitBoard.COLS // 2 - 1, BitBoard.COLS // 2))
+
+# Cells of the rows where a threat suits the first player 'X' and the second player 'O'.
+# With an even number of rows (the classic 6), 'X' gets the odd rows from the bottom; with
+# an odd number, like the 7 rows here, it flips: 'X' gets the even rows (2nd, 4th, 6th)
+X_ROWS_MASK: int = sum(1 << (col * BitBoard.COL_BITS + row)
+                       for col in range(BitBoard.COLS) for row in range(BitBoard.ROWS % 2, BitBoard.ROWS, 2))
+O_ROWS_MASK: int = BOARD_MASK ^ X_ROWS_MASK
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """
+    Number of set bits of every uint64 value.
+    """
+    if hasattr(np, 'bitwise_count'):    # NumPy >= 2.0
+        return np.bitwise_count(values)
+    as_bytes = np.ascontiguousarray(values, dtype=np.uint64).view(np.uint8).reshape(*values.shape, 8)
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1)
+
+
+class HeuristicEvaluator:
+    """
+    Static evaluation of a position for depth-limited searches.
+
+    Scores a position from the view of one player by:
+        - open threes: windows of four with three own pieces and an empty cell
+        - open twos: windows with two own pieces and two empty cells
+        - center control: own pieces in the two center columns
+        - threat parity: empty cells that would complete four, with a bonus if the
+          row suits the player (`X_ROWS_MASK`/`O_ROWS_MASK`: on the 7-row board the
+          even rows from the bottom for the first player 'X', the odd rows for 'O'),
+          because that player will be the one to fill such a cell late in the game
+    minus the same terms for the opponent.
+
+    All windows of a direction are counted at once with bit operations on
+    the start cells of the precomputed line index (`lines.DIRECTION_STARTS`), so a position costs
+    a few dozen integer operations; `evaluate_batch` runs the same operations
+    on arrays of positions with NumPy.
+    Scores stay far below the win scores of the searches (at most `MAX_SCORE`).
+
+    Attributes:
+        three (int): Weight of an open three.
+        two (int): Weight of an open two.
+        center (int): Weight of a piece in the center columns.
+        threat (int): Weight of a threat (an empty cell completing four).
+        parity (int): Extra weight of a threat in a row that suits the player.
+    """
+    MAX_SCORE: int = 10_000
+
+    def __init__(self, three: int = 5, two: int = 2, center: int = 3, threat: int = 4, parity: int = 8) -> None:
+        """
+        Initialize the evaluator.
+
+        Parameters:
+            three (int): Weight of an open three.
+            two (int): Weight of an open two.
+            center (int): Weight of a piece in the center columns.
+            threat (int): Weight of a threat.
+            parity (int): Extra weight of a threat in a row that suits the player.
+        """
+        self.three: int = three
+        self.two: int = two
+        self.center: int = center
+        self.threat: int = threat
+        self.parity: int = parity
+
+    def evaluate(self, own: int, other: int, own_first: bool) -> int:
+        """
+        Score a position given as bitmasks.
+
+        Parameters:
+            own (int): Bitmask of the pieces of the player the score is for.
+            other (int): Bitmask of the opponent's pieces.
+            own_first (bool): Whether the player is the first player ('X').
+
+        Returns:
+            int: The score, positive if the position favors the player.
+        """
+        score = 0
+        for shift, starts in DIRECTION_STARTS.items():
+            shifts = (shift, 2 * shift, 3 * shift)
+            threes, twos = _open_windows(own, other, shifts, starts)
+            score += self.three * threes.bit_count() + self.two * twos.bit_count()
+            threes, twos = _open_windows(other, own, shifts, starts)
+            score -= self.three * threes.bit_count() + self.two * twos.bit_count()
+
+        score += self.center * ((own & CENTER_MASK).bit_count() - (other & CENTER_MASK).bit_count())
+
+        mask = own | other
+        own_threats = winning_positions(own, mask)
+        other_threats = winning_positions(other, mask)
+        own_rows, other_rows = (X_ROWS_MASK, O_ROWS_MASK) if own_first else (O_ROWS_MASK, X_ROWS_MASK)
+        score += self.threat * (own_threats.bit_count() - other_threats.bit_count())
+        score += self.parity * ((own_threats & own_rows).bit_count() - (other_threats & other_rows).bit_count())
+        return max(-self.MAX_SCORE, min(self.MAX_SCORE, score))
+
+    def evaluate_bitboard(self, bb: BitBoard) -> int:
+        """
+        Score a bitboard from the view of the player to move.
+
+        Parameters:
+            bb (BitBoard): The position.
+
+        Returns:
+            int: The score, positive if the position favors the player to move.
+        """
+        if bb.moves % 2:
+            return self.evaluate(bb.o_mask, bb.x_mask, False)
+        return self.evaluate(bb.x_mask, bb.o_mask, True)
+
+    def evaluate_board(self, board: np.ndarray, icon: str) -> int:
+        """
+        Score a string board from the view of one player.
+
+        Parameters:
+            board (np.ndarray): The 7x8 board containing 'X', 'O' or ''.
+            icon (str): Icon of the player the score is for.
+
+        Returns:
+            int: The score, positive if the position favors the player.
+        """
+        other_icon = 'O' if icon == 'X' else 'X'
+        own = int(np.bitwise_or.reduce(CELL_BITS[board == icon]))
+        other = int(np.bitwise_or.reduce(CELL_BITS[board == other_icon]))
+        return self.evaluate(own, other, icon == 'X')
+
+    def evaluate_batch(self, own: np.ndarray, other: np.ndarray, own_first: bool) -> np.ndarray:
+        """
+        Score many positions at once (vectorized `evaluate`, for `BatchSearch`).
+
+        Parameters:
+            own (np.ndarray): uint64 bitmasks of the pieces of the player the scores are for.
+            other (np.ndarray): uint64 bitmasks of the opponent's pieces.
+            own_first (bool): Whether the player is the first player ('X').
+
+        Returns:
+            np.ndarray: int64 scores, positive if a position favors the player.
+        """
+        own = np.asarray(own, dtype=np.uint64)
+        other = np.asarray(other, dtype=np.uint64)
+        score = np.zeros(own.shape, dtype=np.int64)
+        for shift, starts in DIRECTION_STARTS.items():
+            shifts = tuple(np.uint64(k * shift) for k in (1, 2, 3))
+            threes, twos = _open_windows(own, other, shifts, np.uint64(starts))
+            score += self.three * _popcount(threes).astype(np.int64) + self.two * _popcount(twos)
+            threes, twos = _open_windows(other, own, shifts, np.uint64(starts))
+            score -= self.three * _popcount(threes).astype(np.int64) + self.two * _popcount(twos)
+
+        center = np.uint64(CENTER_MASK)
+        score += self.center * (_popcount(own & center).astype(np.int64) - _popcount(other & center))
+
+        own_threats = _winning_positions_batch(own, own | other)
+        other_threats = _winning_positions_batch(other, own | other)
+        own_rows, other_rows = (X_ROWS_MASK, O_ROWS_MASK) if own_first else (O_ROWS_MASK, X_ROWS_MASK)
+        score += self.threat * (_popcount(own_threats).astype(np.int64) - _popcount(other_threats))
+        score += self.parity * (_popcount(own_threats & np.uint64(own_rows)).astype(np.int64)
+                                - _popcount(other_threats & np.uint64(other_rows)))
+        return np.clip(score, -self.MAX_SCORE, self.MAX_SCORE)
+
+
+def _open_windows(own, other, shifts: tuple, starts) -> tuple:
+    """
+    Find the open threes and twos of a player in one direction.
+
+    Works bit-parallel on all windows at once: the four cells of every window
+    are shifted onto its start cell and added up bit-sliced. Takes Python ints
+    or NumPy uint64 arrays (with uint64 `shifts` and `starts`).
+
+    Parameters:
+        own: Bitmask(s) of the player's pieces.
+        other: Bitmask(s) of the opponent's pieces.
+        shifts (tuple): Shift to the 2nd, 3rd and 4th cell of a window.
+        starts: Bitmask of the cells windows of this direction start at.
+
+    Returns:
+        tuple: Bitmasks of the start cells of windows with exactly three, and with
+            exactly two, of the player's pieces and none of the opponent's.
+    """
+    a1, a2, a3 = own >> shifts[0], own >> shifts[1], own >> shifts[2]
+    blocked = other | other >> shifts[0] | other >> shifts[1] | other >> shifts[2]
+    sum01, carry01 = own ^ a1, own & a1
+    sum23, carry23 = a2 ^ a3, a2 & a3
+    bit0, carry = sum01 ^ sum23, sum01 & sum23
+    bit1 = carry01 ^ carry23 ^ carry
+    bit2 = (carry01 & carry23) | (carry & (carry01 ^ carry23))
+    two_or_three = starts & ~blocked & bit1 & ~bit2
+    return two_or_three & bit0, two_or_three & ~bit0
+
+
+def _winning_positions_batch(position: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `solver.winning_positions` for uint64 arrays.
+    """
+    def shl(values, n):
+        return values << np.uint64(n)
+
+    def shr(values, n):
+        return values >> np.uint64(n)
+
+    r = shl(position, 1) & shl(position, 2) & shl(position, 3)
+    for shift in (BitBoard.COL_BITS, BitBoard.COL_BITS - 1, BitBoard.COL_BITS + 1):
+        p = shl(position, shift) & shl(position, 2 * shift)
+        r |= p & shl(position, 3 * shift)
+        r |= p & shr(position, shift)
+        p = shr(position, shift) & shr(position, 2 * shift)
+        r |= p & shl(position, shift)
+        r |= p & shr(position, 3 * shift)
+    return r & (np.uint64(BOARD_MASK) ^ mask)
@@ -1,8 +1,16 @@
 import os
-import requests
+from api_client import GameClient
 from player import Player
 import numpy as np # type: ignore
 from move_class_v2 import MoveEvaluator
+from batch_search import BatchSearch
+from evaluation import HeuristicEvaluator
+from bitboard import BitBoard
+from search import NegamaxSearch
+from parallel_search import LazySMPSearch
+from opening_book import OpeningBook
+from solver import Solver
+from transposition import TranspositionTable, SharedTranspositionTable
 import time
 
 
@@ -11,23 +19,69 @@ class Bot_Player(Player):
     Local Player (uses Methods of the Game directly).
     """
 
-    def __init__(self, api_url: str) -> None:
+    def __init__(self, api_url: str, engine: str = 'negamax', move_time_ms: float | None = 1000,
+                 book_path: str | None = None, solver_from_move: int | None = None,
+                 stats_path: str | None = None, heuristic: bool = True, game_id: str | None = None) -> None:
         """ 
         Initialize a local player.
             Must Implement all Methods from Abstract Player Class
 
         Parameters:
-            game (Connect4): Instance of Connect4 game
+            api_url (str): The API URL for the Connect4 game server.
+            engine (str): Search engine used to pick moves:
+                - 'negamax': alpha-beta negamax search on a bitboard (default)
+                - 'evaluator': exhaustive search of the `MoveEvaluator`
+                - 'smp': Lazy SMP search on all cores (`LazySMPSearch`)
+                - 'batch': the scoring of 'evaluator', searched breadth-wise with NumPy (`BatchSearch`)
+            move_time_ms (float | None): Time budget per move for the 'negamax' and 'smp' engines,
+                which then search with iterative deepening. None searches 'negamax' to a fixed
+                depth and gives 'smp' one second.
+            book_path (str | None): Opening book file (see `opening_book.py`) to look up
+                moves in before searching.
+            solver_from_move (int | None): Play perfectly with the `Solver` once this many
+                pieces are on the board. None never uses the solver.
+            stats_path (str | None): File the `SearchStats` of every searched move are appended
+                to (one JSON object per line). None only keeps them in `last_stats`.
+            heuristic (bool): Score the positions at the depth limit with a `HeuristicEvaluator`
+                (all engines); otherwise only wins count.
+            game_id (str | None): ID of the game to join, None for the server's default game.
         
        
         """
         super().__init__()  # Initialize id and icon from the abstract Player class
         self.api_url = api_url
+        self.game_id = game_id
+        self.client = GameClient(api_url, game_id)   # pooled keep-alive connection to the game
         
         
         self.n_col = self.board_width
-        self.target_depth = 6
-        self.evaluator = MoveEvaluator(self.target_depth, self.n_col, self.api_url)
+        self.engine = engine
+        self.move_time_ms = move_time_ms
+        self.heuristic = HeuristicEvaluator() if heuristic else None
+        if engine == 'negamax':
+            self.target_depth = 10
+            self.table = TranspositionTable()
+            self.evaluator = NegamaxSearch(self.target_depth, self.n_col, self.table, self.heuristic)
+        elif engine == 'evaluator':
+            self.target_depth = 6
+            self.table = SharedTranspositionTable()     # one table for all worker processes
+            self.evaluator = MoveEvaluator(self.target_depth, self.n_col, self.api_url, self.table,
+                                           heuristic=self.heuristic)
+        elif engine == 'smp':
+            self.target_depth = None
+            self.evaluator = LazySMPSearch(heuristic=self.heuristic)
+            self.table = self.evaluator.table
+        elif engine == 'batch':
+            self.target_depth = 6
+            self.table = None
+            self.evaluator = BatchSearch(self.target_depth, self.n_col, heuristic=self.heuristic)
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.book = OpeningBook(book_path) if book_path else None
+        self.solver_from_move = solver_from_move
+        self.solver = Solver() if solver_from_move is not None else None
+        self.stats_path = stats_path
+        self.last_stats = None      # SearchStats of the last searched move
 
 
     def register_in_game(self) -> str:
@@ -37,13 +91,12 @@ class Bot_Player(Player):
         Returns:
             str: The player's icon.
         """
-        url = f"{self.api_url}/connect4/register"
         data = {
             'player_id' : str(self.id)
         }
         
         
-        response = requests.post(url, json=data)
+        response = self.client.post('register', json=data)
         
         
         if response.status_code == 200:
@@ -77,11 +130,30 @@ class Bot_Player(Player):
             - what turn is it?
       
         """
-        url = f"{self.api_url}/connect4/status"
-        
-        response = requests.get(url)
-        data = response.json()
-        return(data)
+        return(self.get_state()['status'])
+
+    def get_state(self) -> dict:
+        """
+        Get status, board, last move and version of the game in one request.
+            The server answers 304 if nothing changed since the last call,
+            the cached state is returned then.
+
+        Returns:
+            dict: A dictionary containing 'status', 'board' (flat list), 'last_move' and 'version'.
+        """
+        return(self.client.get_state())
+
+    def wait_for_turn(self, timeout: float = 30) -> dict:
+        """
+        Block until it is the bot's turn, the game is over or the timeout has passed (long-polling).
+
+        Parameters:
+            timeout (float): Maximum number of seconds the server waits.
+
+        Returns:
+            dict: The game's status when the wait ended.
+        """
+        return(self.client.wait_for_turn(str(self.id), timeout))
 
     def make_move(self) -> None:
         """ 
@@ -94,21 +166,47 @@ class Bot_Player(Player):
 
         start_time = time.time()
         board = self.get_board()
+        turn = self.client.state['status']['turn']     # the move is only applied at this turn
+        bb = BitBoard.from_array(board)
+        book_move = self.book.lookup(bb) if self.book is not None else None
+        stats = None
         
-        if np.all(board == ''):
+        if book_move is not None:
+            best_move = book_move
+        elif self.solver is not None and bb.moves >= self.solver_from_move:
+            best_move = self.solver.best_move(bb)
+        elif np.all(board == ''):
             best_move = 3
+        elif self.engine == 'negamax':
+            if self.move_time_ms is None:
+                result = self.evaluator.search(bb)
+            else:
+                result = self.evaluator.iterative_deepening(bb, self.move_time_ms)
+            best_move = result.move
+            stats = result.stats
+        elif self.engine == 'smp':
+            result = self.evaluator.search(bb, self.move_time_ms or 1000)
+            for worker in self.evaluator.worker_stats:
+                print(f"Worker {worker['worker']}: depth {worker['depth']}, {worker['nodes_per_sec']:.0f} nodes/s")
+            best_move = result.move
+            stats = result.stats
         else:
             best_move = self.evaluator.evaluate_moves(board, self.player_icon, self.opponent_icon)
+            stats = self.evaluator.stats
+
+        if stats is not None:
+            self.last_stats = stats
+            print(stats)
+            if self.stats_path:
+                stats.to_json(self.stats_path)
 
         
-        url = f"{self.api_url}/connect4/make_move"            
-        data = {'column': best_move, 'player_id': str(self.id)}
-        requests.post(url, json=data)
+        data = {'column': best_move, 'player_id': str(self.id), 'turn': turn}
+        self.client.post('make_move', json=data)
 
         end_time = time.time()
         elapsed_time = end_time - start_time
         print(f"Elapsed time: {elapsed_time:.6f} seconds")
-        time.sleep(1)
 
                 
         
@@ -149,9 +247,23 @@ class Bot_Player(Player):
 
 
 
+    def close(self) -> None:
+        """
+        Release the resources of the search engine (worker pools and shared tables), the opening book
+        and the server connection.
+        """
+        self.client.close()
+        if self.book is not None:
+            self.book.close()
+        if self.solver is not None:
+            self.solver.close()
+        if self.engine == 'evaluator':
+            self.evaluator.close()
+            self.table.close()
+        elif self.engine == 'smp':
+            self.evaluator.close()
+
+
     def get_board(self) -> np.array:
-        url_board = f"{self.api_url}/connect4/board"
-        response = requests.get(url_board)
-        data = response.json()
-        board = np.array(data["board"]).reshape(7, 8)
+        board = np.array(self.get_state()["board"]).reshape(7, 8)
         return board
\ No newline at end of file
@@ -1,8 +1,19 @@
 import uuid
 import random
-from scipy.ndimage import convolve
+import threading
 import numpy as np
 
+from bitboard import BitBoard
+from lines import completes_line
+
+
+def _is_integer(value: object) -> bool:
+    """
+    Check if a value is an integer (bool is a subclass of int, but True is no column or turn).
+    """
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
 class Connect4:
     """
     Connect 4 Game Class
@@ -18,8 +29,13 @@ class Connect4:
         p1_icon (str): Icon for Player 1 ('X').
         p2_icon (str): Icon for Player 2 ('O').
         board (np.ndarray): The game board represented as a 7x8 numpy array.
+        bitboard (BitBoard): The same board as a compact bitboard, kept in sync with `board`.
         turn_counter (int): Tracks the current turn number.
         winner (Optional[str]): Icon of the winning player, or None if no winner.
+        last_move (Optional[dict]): Row, column and icon of the last piece dropped, or None.
+        version (int): Incremented on every change of the game state (registration or move).
+        lock (threading.RLock): Held while the game state is read or changed, so registrations
+            and moves from several threads are applied atomically.
     """
     def __init__(self) -> None:
         """
@@ -32,8 +48,21 @@ class Connect4:
         self.p1_icon: str = 'X'
         self.p2_icon: str = 'O'
         self.board: np.ndarray = np.full((7, 8), '', dtype=str)
+        self.bitboard: BitBoard = BitBoard()
         self.turn_counter: int = -1
         self.winner: str | None = None
+        self.last_move: dict[str, int | str] | None = None
+        self.version: int = 0
+        self.lock: threading.RLock = threading.RLock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['lock']       # locks can't be pickled, every copy gets its own
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
 
     def get_status(self) -> dict[str, uuid.UUID | str | int | None]:
         """
@@ -46,26 +75,49 @@ class Connect4:
                 - 'winner' (str | None): Icon of the winner, if any.
                 - 'turn' (int): Current turn number.
         """
-        if self.turn_counter == -1:
-            active_player = None
-            active_id = None
-        elif self.turn_counter % 2:
-            active_player = self.p2_icon
-            active_id = self.p2
-        else:
-            active_player = self.p1_icon
-            active_id = self.p1
-
-        return {
-            'active_id': active_id,
-            'active_player': active_player,
-            'winner': self.winner,
-            'turn': self.turn_counter,
-        }
+        with self.lock:
+            if self.turn_counter == -1:
+                active_player = None
+                active_id = None
+            elif self.turn_counter % 2:
+                active_player = self.p2_icon
+                active_id = self.p2
+            else:
+                active_player = self.p1_icon
+                active_id = self.p1
+
+            return {
+                'active_id': active_id,
+                'active_player': active_player,
+                'winner': self.winner,
+                'turn': self.turn_counter,
+            }
+
+    def get_state(self) -> dict:
+        """
+        Retrieve everything a client needs to show the game in one dictionary.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'status' (dict): The game status (see `get_status`).
+                - 'board' (list[str]): The board flattened row by row.
+                - 'last_move' (dict | None): Row, column and icon of the last piece dropped.
+                - 'version' (int): Version of the game state.
+        """
+        with self.lock:
+            return {
+                'status': self.get_status(),
+                'board': self.board.flatten().tolist(),
+                'last_move': self.last_move,
+                'version': self.version,
+            }
 
     def register_player(self, player_id: uuid.UUID) -> str | bool:
         """
-        Register a player in the game.
+        Register a player in the game (atomically).
+
+        Registering a player twice returns the icon it already has, so a retried
+        registration can't take both seats.
 
         Parameters:
             player_id (uuid.UUID): Unique identifier for the player.
@@ -74,15 +126,22 @@ class Connect4:
             str: The player's assigned icon ('X' or 'O').
             bool: False if the game is full and no more players can register.
         """
-        if self.p1 is None:
-            self.p1 = player_id
-            return 'X'
-        elif self.p2 is None:
-            self.p2 = player_id
-            self.turn_counter += 1
-            return 'O'
-        else:
-            return False
+        with self.lock:
+            if player_id == self.p1:
+                return 'X'
+            elif player_id == self.p2:
+                return 'O'
+            elif self.p1 is None:
+                self.p1 = player_id
+                self.version += 1
+                return 'X'
+            elif self.p2 is None:
+                self.p2 = player_id
+                self.turn_counter += 1
+                self.version += 1
+                return 'O'
+            else:
+                return False
 
     def get_board(self) -> np.ndarray:
         """
@@ -93,61 +152,90 @@ class Connect4:
         """
         return self.board
 
-    def check_move(self, column: int, player_id: uuid.UUID) -> bool:
+    def get_bitboard(self) -> BitBoard:
+        """
+        Get the current state of the game board as a bitboard.
+
+        Returns:
+            BitBoard: Compact bitboard representation of the game board.
+        """
+        return self.bitboard
+
+    def check_move(self, column: int, player_id: uuid.UUID, expected_turn: int | None = None) -> bool:
         """
-        Validate and execute a player's move.
+        Validate and execute a player's move (atomically).
+
+        With `expected_turn` the move is a compare-and-swap on the turn number: it is
+        only applied if the game is still at the turn the player based the move on,
+        so a repeated or stale request can never place a second piece.
 
         Parameters:
             column (int): The column where the player wants to drop their piece (0-indexed).
             player_id (uuid.UUID): The unique identifier of the player making the move.
+            expected_turn (int | None): Turn number the move was chosen for; None skips the check.
 
         Returns:
             bool: True if the move is valid and executed, False otherwise.
         """
-        if player_id == self.get_status()['active_id']:
-            if self.board[0, column] == '':
-                icon = 'X' if player_id == self.p1 else 'O'
-                i = 1
-                while True:
-                    if self.board[-i, column] == '':
-                        self.board[-i, column] = icon
-                        break
-                    else:
-                        i += 1
-                self.__update_status()
-                return True
-        return False
-
-    def __update_status(self) -> None:
+        if not _is_integer(column) or not 0 <= column < self.board.shape[1]:
+            return False
+        if expected_turn is not None and not _is_integer(expected_turn):
+            return False
+        with self.lock:
+            if expected_turn is not None and expected_turn != self.turn_counter:
+                return False
+            if player_id == self.get_status()['active_id']:
+                if self.board[0, column] == '':
+                    icon = 'X' if player_id == self.p1 else 'O'
+                    i = 1
+                    while True:
+                        if self.board[-i, column] == '':
+                            self.board[-i, column] = icon
+                            self.bitboard.play(column, icon)
+                            break
+                        else:
+                            i += 1
+                    self.__update_status(self.board.shape[0] - i, column)
+                    return True
+            return False
+
+    def __update_status(self, row: int, column: int) -> None:
         """
         Update the game status after a valid move.
 
         Updates turn counter, active player, and checks for a winner.
+
+        Parameters:
+            row (int): The row the last piece landed in.
+            column (int): The column the last piece was dropped into.
         """
         self.turn_counter += 1
-        self.winner = self.__detect_win()
+        self.last_move = {'row': row, 'column': column, 'icon': str(self.board[row, column])}
+        if self.winner is None:
+            self.winner = self.detect_win_at(row, column)
+        self.version += 1
 
-    def __detect_win(self) -> str | None:
+    def detect_win_at(self, row: int, column: int) -> str | None:
         """
-        Detect if there is a winner in the game.
+        Detect if the piece at the given cell completes four in a row.
+
+        Only the lines through this cell are inspected (as masks of the
+        precomputed line index against the bitboard), so this is enough to
+        detect a win right after the piece was dropped.
+
+        Parameters:
+            row (int): Row of the cell (0 is the top row).
+            column (int): Column of the cell (0-indexed).
 
         Returns:
-            str: The winning player's icon ('X' or 'O'), or None if no winner.
-        """
-        horizontal_group = np.array([[1, 1, 1, 1]])
-        vertical_group = np.array([[1], [1], [1], [1]])
-        diag_down_group = np.eye(4, dtype=int)
-        diag_up_group = np.flipud(diag_down_group)
-
-        for player_to_check in ['X', 'O']:
-            player_board = (self.board == player_to_check).astype(int)
-            if (convolve(player_board, horizontal_group, mode="constant", cval=0) == 4).any():
-                return player_to_check
-            if (convolve(player_board, vertical_group, mode="constant", cval=0) == 4).any():
-                return player_to_check
-            if (convolve(player_board, diag_down_group, mode="constant", cval=0) == 4).any():
-                return player_to_check
-            if (convolve(player_board, diag_up_group, mode="constant", cval=0) == 4).any():
-                return player_to_check
+            str: The icon at the cell ('X' or 'O') if it is part of four in a row, or None.
+        """
+        icon = self.board[row, column]
+        if icon == '':
+            return None
+
+        pieces = self.bitboard.x_mask if icon == 'X' else self.bitboard.o_mask
+        if completes_line(pieces, row, column):
+            return str(icon)
 
         return None
@@ -1,10 +1,10 @@
 
 import os
-import requests
+from api_client import GameClient
 from player import Player
+from lines import find_winner
 import numpy as np
 from random import randint
-from scipy.ndimage import convolve
 import time
 
 
@@ -13,18 +13,21 @@ class Bot_Player(Player):
     Local Player (uses Methods of the Game directly).
     """
 
-    def __init__(self, api_url: str) -> None:
+    def __init__(self, api_url: str, game_id: str | None = None) -> None:
         """ 
         Initialize a local player.
             Must Implement all Methods from Abstract Player Class
 
         Parameters:
-            game (Connect4): Instance of Connect4 game
+            api_url (str): The API URL for the Connect4 game server.
+            game_id (str | None): ID of the game to join, None for the server's default game.
         
        
         """
         super().__init__()  # Initialize id and icon from the abstract Player class
         self.api_url = api_url
+        self.game_id = game_id
+        self.client = GameClient(api_url, game_id)   # pooled keep-alive connection to the game
 
 
     def register_in_game(self) -> str:
@@ -34,13 +37,12 @@ class Bot_Player(Player):
         Returns:
             str: The player's icon.
         """
-        url = f"{self.api_url}/connect4/register"
         data = {
             'player_id' : str(self.id)
         }
         
         
-        response = requests.post(url, json=data)
+        response = self.client.post('register', json=data)
         
         
         if response.status_code == 200:
@@ -74,11 +76,18 @@ class Bot_Player(Player):
             - what turn is it?
       
         """
-        url = f"{self.api_url}/connect4/status"
-        
-        response = requests.get(url)
-        data = response.json()
-        return(data)
+        return(self.get_state()['status'])
+
+    def get_state(self) -> dict:
+        """
+        Get status, board, last move and version of the game in one request.
+            The server answers 304 if nothing changed since the last call,
+            the cached state is returned then.
+
+        Returns:
+            dict: A dictionary containing 'status', 'board' (flat list), 'last_move' and 'version'.
+        """
+        return(self.client.get_state())
 
 
     def make_move(self) -> int:
@@ -91,10 +100,7 @@ class Bot_Player(Player):
             url_move = f"{self.api_url}/connect4/make_move"
 
             def get_board():
-                url_board = f"{self.api_url}/connect4/board"
-                response = requests.get(url_board)
-                data = response.json()
-                board = np.array(data["board"]).reshape(7, 8)
+                board = np.array(self.get_state()["board"]).reshape(7, 8)
                 return board
             
             def check_move(move):
@@ -209,9 +215,8 @@ class Bot_Player(Player):
 
 
             
-            url = f"{self.api_url}/connect4/make_move"            
             data = {'column': max_index, 'player_id': str(self.id)}
-            requests.post(url, json=data)
+            self.client.post('make_move', json=data)
                 
 
                 
@@ -224,12 +229,7 @@ class Bot_Player(Player):
         """
         
         
-        url = f"{self.api_url}/connect4/board"
-        
-        response = requests.get(url)
-        data = response.json()
-        
-        board = np.array(data["board"]).reshape(7, 8)
+        board = np.array(self.get_state()["board"]).reshape(7, 8)
         board = np.where(board == '', ' ', board)
         
         
@@ -268,27 +268,7 @@ class Bot_Player(Player):
         Returns:
             True if there's a winner, False otherwise
         """    
-        # Define convolution kernels for detecting a win condition
-        horizontal_group = np.array([[1, 1, 1, 1]])
-        vertical_group = np.array([[1], [1], [1], [1]])
-        diag_down_group = np.eye(4, dtype=int)  # Top-left to bottom-right
-        diag_up_group = np.flipud(diag_down_group)  # Bottom-left to top-right
-
-        # Check for each player if there's a winning condition
-        for player_to_check in ["X", "O"]:
-            player_board = (board == player_to_check).astype(int)
-
-            # Check all directions using convolution for 4 in a row
-            if (convolve(player_board, horizontal_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, vertical_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, diag_down_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, diag_up_group, mode="constant", cval=0) == 4).any():
-                return True
-
-        # Return False if no win condition is found for either player
-        return False
+        # Check every line of four of the precomputed line index at once
+        return find_winner(board) is not None
     
 
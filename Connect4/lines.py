@@ -0,0 +1,137 @@
+import numpy as np
+
+from bitboard import BitBoard
+
+
+ROWS: int = BitBoard.ROWS
+COLS: int = BitBoard.COLS
+
+# Directions of four in a row on the string board as (row step, column step):
+# horizontal, vertical and both diagonals (row 0 is the top row)
+DIRECTIONS: tuple[tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def _lines() -> list[tuple[tuple[int, int], ...]]:
+    """
+    All windows of four cells in a row that fit on the board, as (row, column) cells.
+    """
+    lines = []
+    for d_row, d_col in DIRECTIONS:
+        for row in range(ROWS):
+            for col in range(COLS):
+                cells = tuple((row + i * d_row, col + i * d_col) for i in range(4))
+                if all(0 <= r < ROWS and 0 <= c < COLS for r, c in cells):
+                    lines.append(cells)
+    return lines
+
+
+# Every line of four cells on the 7x8 board (107 of them)
+LINES: list[tuple[tuple[int, int], ...]] = _lines()
+
+# Rows and columns of the cells of every line, (len(LINES), 4) arrays for fancy indexing:
+# board[LINE_ROWS, LINE_COLS] holds the four cells of every line
+LINE_ROWS: np.ndarray = np.array([[r for r, _ in line] for line in LINES])
+LINE_COLS: np.ndarray = np.array([[c for _, c in line] for line in LINES])
+
+# Indices (into LINES) of the lines through every cell (at most 16): LINES_THROUGH[row][col]
+LINES_THROUGH: list[list[tuple[int, ...]]] = [
+    [tuple(i for i, line in enumerate(LINES) if (row, col) in line) for col in range(COLS)]
+    for row in range(ROWS)
+]
+
+# Rows and columns of the lines through every cell, ready for fancy indexing:
+# board[CELL_LINES[row][col]] holds the four cells of every line through the cell
+CELL_LINES: list[list[tuple[np.ndarray, np.ndarray]]] = [
+    [(LINE_ROWS[list(LINES_THROUGH[row][col])], LINE_COLS[list(LINES_THROUGH[row][col])]) for col in range(COLS)]
+    for row in range(ROWS)
+]
+
+# Bit of every cell of the string board in the `BitBoard` layout
+CELL_BITS: np.ndarray = np.array([[1 << (col * BitBoard.COL_BITS + ROWS - 1 - row) for col in range(COLS)]
+                                  for row in range(ROWS)], dtype=np.uint64)
+
+# Every line as a bitboard mask (same order as LINES)
+LINE_MASKS: list[int] = [sum(int(CELL_BITS[r, c]) for r, c in line) for line in LINES]
+LINE_ARRAY: np.ndarray = np.array(LINE_MASKS, dtype=np.uint64)
+
+# Bitboard masks of the lines through every cell: LINE_MASKS_THROUGH[row][col]
+LINE_MASKS_THROUGH: list[list[tuple[int, ...]]] = [
+    [tuple(LINE_MASKS[i] for i in LINES_THROUGH[row][col]) for col in range(COLS)]
+    for row in range(ROWS)
+]
+
+
+def _direction_starts() -> dict[int, int]:
+    """
+    Group the line masks by their bitboard shift, keeping the lowest cell of every line.
+    """
+    starts = {}
+    for mask in LINE_MASKS:
+        low = mask & -mask
+        shift = ((mask ^ low) & -(mask ^ low)).bit_length() - low.bit_length()
+        starts[shift] = starts.get(shift, 0) | low
+    return dict(sorted(starts.items()))
+
+
+# The four directions as bitboard shifts (1 vertical, 7 and 9 diagonal, 8 horizontal),
+# each with the cells its lines start at (their lowest bit): the line starting at
+# bit b covers b, b + shift, b + 2 * shift and b + 3 * shift
+DIRECTION_STARTS: dict[int, int] = _direction_starts()
+
+
+def winner_at(board: np.ndarray, row: int, col: int) -> str | None:
+    """
+    Check if the piece at a cell is part of four in a row.
+
+    Only the (at most 16) lines through the cell are looked at, all in one
+    NumPy operation, which is enough right after a piece was dropped there.
+
+    Parameters:
+        board (np.ndarray): The 7x8 board containing 'X', 'O' or ''.
+        row (int): Row of the cell (0 is the top row).
+        col (int): Column of the cell.
+
+    Returns:
+        str | None: The icon at the cell if it completes four in a row, otherwise None.
+    """
+    icon = board[row, col]
+    if icon == '':
+        return None
+    if (board[CELL_LINES[row][col]] == icon).all(axis=1).any():
+        return str(icon)
+    return None
+
+
+def completes_line(pieces: int, row: int, col: int) -> bool:
+    """
+    Check if a player's pieces include a full line through a cell.
+
+    The bitboard version of `winner_at`: a few integer operations, no scan of the board.
+
+    Parameters:
+        pieces (int): Bitmask of the player's pieces in the `BitBoard` layout.
+        row (int): Row of the cell (0 is the top row).
+        col (int): Column of the cell.
+
+    Returns:
+        bool: True if one of the lines through the cell is full.
+    """
+    return any(pieces & mask == mask for mask in LINE_MASKS_THROUGH[row][col])
+
+
+def find_winner(board: np.ndarray) -> str | None:
+    """
+    Check the whole board for four in a row, all lines in one NumPy operation.
+
+    Parameters:
+        board (np.ndarray): The 7x8 board containing 'X', 'O' or ''.
+
+    Returns:
+        str | None: The icon with four in a row ('X' is reported if both have one), or None.
+    """
+    cells = board[LINE_ROWS, LINE_COLS]
+    first = cells[:, 0]
+    complete = (first != '') & (cells == first[:, np.newaxis]).all(axis=1)
+    if not complete.any():
+        return None
+    return 'X' if (first[complete] == 'X').any() else 'O'
@@ -1,6 +1,6 @@
 from multiprocessing import Pool
-import numpy as np
-from scipy.ndimage import convolve
+
+from lines import find_winner
 
 
 class MoveEvaluator:
@@ -93,25 +93,5 @@ class MoveEvaluator:
         Returns:
             True if there's a winner, False otherwise
         """    
-        # Define convolution kernels for detecting a win condition
-        horizontal_group = np.array([[1, 1, 1, 1]])
-        vertical_group = np.array([[1], [1], [1], [1]])
-        diag_down_group = np.eye(4, dtype=int)  # Top-left to bottom-right
-        diag_up_group = np.flipud(diag_down_group)  # Bottom-left to top-right
-
-        # Check for each player if there's a winning condition
-        for player_to_check in ["X", "O"]:
-            player_board = (board == player_to_check).astype(int)
-
-            # Check all directions using convolution for 4 in a row
-            if (convolve(player_board, horizontal_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, vertical_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, diag_down_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, diag_up_group, mode="constant", cval=0) == 4).any():
-                return True
-
-        # Return False if no win condition is found for either player
-        return False
+        # Check every line of four of the precomputed line index at once
+        return find_winner(board) is not None
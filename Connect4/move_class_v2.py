@@ -1,43 +1,237 @@
-from multiprocessing import Pool
+import os
+import random
+import time
+from multiprocessing import Pool, shared_memory
 import numpy as np
-from scipy.ndimage import convolve
+
+from board_codec import encode_board, decode_board
+from evaluation import HeuristicEvaluator
+from lines import find_winner
+from search_stats import SearchStats
+from transposition import TranspositionTable, EXACT, ZOBRIST_KEYS, ZOBRIST_PLAYER_O, zobrist_hash
+
+
+# State of a pool worker process, set once by `_init_worker`
+_worker = {}
+
+# Keys (XOR-ed into the position key) of the extra table entries holding the leaf
+# count and heuristic leaf total of a subtree; a shared table entry has room for one value
+_rng = random.Random(0x1EAF)
+_LEAVES_KEY: int = _rng.getrandbits(64)
+_LEAF_TOTAL_KEY: int = _rng.getrandbits(64)
+
+
+def _init_worker(evaluator, board_name):
+    """
+    Keep the evaluator and a zero-copy view of the shared root board in the worker.
+    """
+    _worker['evaluator'] = evaluator
+    _worker['board_shm'] = shared_memory.SharedMemory(name=board_name)
+    _worker['board'] = np.ndarray((7, 8), dtype=np.uint8, buffer=_worker['board_shm'].buf)
+
+
+def _evaluate_reply_task(col, reply, player_icon, opponent_icon):
+    """
+    Evaluate one (own move, opponent reply) pair on the shared root board.
+    """
+    evaluator = _worker['evaluator']
+    evaluator.player_icon = player_icon
+    evaluator.opponent_icon = opponent_icon
+    board = evaluator.place(col, player_icon, decode_board(_worker['board']))
+    return evaluator.evaluate_reply(col, reply, board)
 
 
 class MoveEvaluator:
-    def __init__(self, target_depth, n_col, api_url):
+    def __init__(self, target_depth, n_col, api_url, table: TranspositionTable | None = None,
+                 processes: int | None = None, heuristic: HeuristicEvaluator | None = None):
         self.target_depth = target_depth
         self.n_col = n_col
         self.api_url = api_url
-        
-        
-    
+        self.table = table
+        self.heuristic = heuristic      # scores the positions at the depth limit
+        self._leaf_total = 0
+        self.hash = 0
+        self.processes = processes or os.cpu_count()
+        self._pool = None
+        self._pool_settings = None
+        self._board_shm = None
+        self.stats = SearchStats('evaluator')
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def __getstate__(self):
+        # the pool stays in the parent process, workers only need the settings
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_pool_settings'] = None
+        state['_board_shm'] = None
+        return state
+
+
+    def _settings(self):
+        # what the workers copy from the evaluator when the pool starts
+        return self.target_depth, self.n_col, self.table, self.heuristic
+
+
+    def start(self):
+        """
+        Start the worker pool (once), it is reused for all following moves and games.
+
+        The evaluator (including its transposition table) is sent to every worker
+        only once; the board of each move is shared through shared memory.
+        The workers keep that copy, so if `target_depth`, `n_col`, `table` or
+        `heuristic` has been replaced since, the pool is restarted with the new
+        settings (changes made inside the table or heuristic objects don't reach it).
+        """
+        if self._pool is not None and self._pool_settings != self._settings():
+            self.close()
+        if self._pool is None:
+            self._pool_settings = self._settings()
+            self._board_shm = shared_memory.SharedMemory(create=True, size=7 * 8)
+            self._pool = Pool(processes=self.processes, initializer=_init_worker,
+                              initargs=(self, self._board_shm.name))
+        return self._pool
+
+
+    def close(self):
+        """
+        Shut down the worker pool and free the shared board.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_settings = None
+            self._board_shm.close()
+            self._board_shm.unlink()
+            self._board_shm = None
+
+
     def evaluate_moves(self, board, player_icon, opponent_icon):
+        """
+        Score every column and return the best one.
+
+        The counters and timings of all workers (including the transposition
+        table probes and hits) are added up in `stats` (time per root move is
+        the CPU time of its tasks). With a `heuristic`,
+        the average heuristic score of the evaluated positions at the depth
+        limit is added to the score of every column.
+        """
         self.player_icon = player_icon
         self.opponent_icon = opponent_icon
-        with Pool(processes=self.n_col) as pool:
-            results = pool.starmap(self.evaluate_column, [(col, board.copy()) for col in range(self.n_col)])
-        print(results)
-        best_move = max(results, key=lambda x: x[1])
-        return best_move[0]
-        
+        start = time.perf_counter()
+        self.stats = SearchStats('evaluator')
+
+        # one task per (own move, opponent reply), so full columns or columns
+        # with a quick win don't leave a worker idle
+        scores = {}
+        tasks = []
+        for col in range(self.n_col):
+            if not self.check_move(col, board):
+                scores[col] = -10000000
+                continue
+            child = self.place(col, self.player_icon, board.copy())
+            if np.sum(child != '') > 6 and self.__detect_win(child):
+                self.stats.terminals += 1
+                scores[col] = 10000000
+                continue
+            scores[col] = 0
+            if self.target_depth > 0:
+                tasks.extend((col, reply, player_icon, opponent_icon) for reply in range(self.n_col))
+
+        pool = self.start()
+        # the workers only read the board while the tasks of this move run
+        np.ndarray((7, 8), dtype=np.uint8, buffer=self._board_shm.buf)[:] = encode_board(board)
+        results = pool.starmap(_evaluate_reply_task, tasks, chunksize=1)
+        for col, score, _, _ in results:
+            scores[col] += score
+        if self.heuristic is not None:
+            for col in scores:
+                leaves = sum(task_stats.leaves for task_col, _, task_stats, _ in results if task_col == col)
+                if leaves:
+                    leaf_total = sum(total for task_col, _, _, total in results if task_col == col)
+                    scores[col] += round(leaf_total / leaves)
+
+        stats = SearchStats.combine([self.stats] + [task_stats for _, _, task_stats, _ in results])
+        stats.depth = self.target_depth
+        stats.elapsed = time.perf_counter() - start
+        stats.root_moves = [
+            {
+                'column': col,
+                'score': score,
+                'nodes': sum(task_stats.nodes for task_col, _, task_stats, _ in results if task_col == col),
+                'time_ms': 1000 * sum(task_stats.elapsed for task_col, _, task_stats, _ in results if task_col == col),
+            }
+            for col, score in scores.items()
+        ]
+        self.stats = stats
+        if self.table is not None:
+            # every worker counts hits and misses of its own table (or view of a shared one),
+            # the parent table keeps the running totals; this move's share is in `stats`
+            self.table.hits += stats.tt_hits
+            self.table.misses += stats.tt_probes - stats.tt_hits
+        return max(scores, key=scores.get)
 
-    def evaluate_column(self, col, board):
+
+    def evaluate_reply(self, col, reply, board):
+        """
+        Evaluate the subtree after our move in `col` and the opponent's answer in `reply`.
+
+        Returns:
+            tuple: The column, the score of the subtree, its `SearchStats` and the
+                sum of the heuristic scores of its leaves (0 without a `heuristic`).
+        """
         score_list = []
-        depth = 0
-        if self.check_move(col, board):
-            board = self.place(col,self.player_icon, board)
-            if np.sum(board != '') > 6:
-                if self.__detect_win(board):
-                    score_list.append(10000000)
+        depth = 1
+        start = time.perf_counter()
+        self.stats = SearchStats('evaluator')
+        self._leaf_total = 0
+        if self.table is not None:
+            self.hash = zobrist_hash(board)
+            hits, misses = self.table.hits, self.table.misses
+        if self.check_move(reply, board):
+            board = self.place(reply, self.opponent_icon, board)
+            if np.sum(board != '') > 6 and self.__detect_win(board):
+                self.stats.terminals += 1
+                score_list.append(-10 * (self.target_depth - depth))
+            elif depth != self.target_depth:
+                score_list, board, depth = self.evaluate_position(score_list, board, depth, self.player_icon)
             else:
-                score_list,board, depth = self.evaluate_position(score_list,board, depth, self.opponent_icon)
-        else:
-            score_list.append(-10000000)
-        print(sum(score_list))
-        return col, sum(score_list)
+                self._score_leaf(board)
+        if self.table is not None:
+            self.stats.tt_hits = self.table.hits - hits
+            self.stats.tt_probes = self.stats.tt_hits + self.table.misses - misses
+        self.stats.elapsed = time.perf_counter() - start
+        return col, sum(score_list), self.stats, self._leaf_total
 
 
     def evaluate_position(self, score_list, board, depth, current_icon):
+        self.stats.nodes += 1
+        if self.table is not None:
+            # the subtree only depends on the position, the remaining depth and
+            # which icon the scores are counted for
+            key = self.hash ^ (ZOBRIST_PLAYER_O if self.player_icon == 'O' else 0)
+            remaining = self.target_depth - depth
+            cached = self._probe(key, remaining)
+            if cached is not None:
+                # the leaves of the cached subtree still count towards the heuristic average
+                value, leaves, leaf_total = cached
+                self.stats.tt_cutoffs += 1
+                self.stats.leaves += leaves
+                self._leaf_total += leaf_total
+                score_list.append(value)
+                return score_list, board, depth
+            start = len(score_list)
+            leaves, leaf_total = self.stats.leaves, self._leaf_total
+
         depth += 1
 
         for col in range(self.n_col):
@@ -45,6 +239,7 @@ class MoveEvaluator:
                 board = self.place(col, current_icon, board)
                 if np.sum(board != '') > 6:
                     if self.__detect_win(board):
+                        self.stats.terminals += 1
                         if current_icon == self.player_icon:
                             score_list.append(self.target_depth - depth)
                         else:
@@ -53,18 +248,55 @@ class MoveEvaluator:
                         if depth != self.target_depth:
                             next_icon = self.opponent_icon if current_icon == self.player_icon else self.player_icon
                             score_list, board, depth = self.evaluate_position(score_list, board, depth, next_icon)
+                        else:
+                            self._score_leaf(board)
 
                 else:
                     if depth != self.target_depth:
                         next_icon = self.opponent_icon if current_icon == self.player_icon else self.player_icon
                         score_list, board, depth = self.evaluate_position(score_list, board, depth, next_icon)
+                    else:
+                        self._score_leaf(board)
                 board = self.undo(col, board)
 
         depth -= 1
+        if self.table is not None:
+            self.table.store(key, remaining, EXACT, sum(score_list[start:]))
+            self.table.store(key ^ _LEAVES_KEY, remaining, EXACT, self.stats.leaves - leaves)
+            self.table.store(key ^ _LEAF_TOTAL_KEY, remaining, EXACT, self._leaf_total - leaf_total)
         return score_list, board, depth
+
+
+    def _probe(self, key, remaining):
+        """
+        Look up the score, leaf count and heuristic leaf total of a subtree.
+
+        Returns:
+            tuple | None: The three values, or None unless all of them are stored
+                for `remaining` plies. Only the score entry counts as a probe in
+                the table's hits and misses.
+        """
+        entry = self.table.probe(key)
+        if entry is None or entry.depth != remaining:
+            return None
+        hits, misses = self.table.hits, self.table.misses
+        extra = [self.table.probe(key ^ extra_key) for extra_key in (_LEAVES_KEY, _LEAF_TOTAL_KEY)]
+        self.table.hits, self.table.misses = hits, misses
+        if any(e is None or e.depth != remaining for e in extra):
+            return None
+        return entry.value, extra[0].value, extra[1].value
     
 
 
+    def _score_leaf(self, board):
+        """
+        Count a position at the depth limit and add its heuristic score (player's view).
+        """
+        self.stats.leaves += 1
+        if self.heuristic is not None:
+            self._leaf_total += self.heuristic.evaluate_board(board, self.player_icon)
+
+
     def check_move(self, move, board):
         if board[0,move] == '':
             return True
@@ -74,16 +306,19 @@ class MoveEvaluator:
 
     def place(self, c, icon, board):
         if board[-1,c] == '':
-            board[-1,c] = icon
-            return board
+            row = board.shape[0] - 1
         else:
-            row = np.argmax(board[:, c] != '')
-            board[row-1, c] = icon
-            return board
+            row = np.argmax(board[:, c] != '') - 1
+        board[row, c] = icon
+        if self.table is not None:
+            self.hash ^= ZOBRIST_KEYS[icon][row][c]
+        return board
                     
                     
     def undo(self, c, board):
         row = np.argmax(board[:, c] != '')
+        if self.table is not None:
+            self.hash ^= ZOBRIST_KEYS[str(board[row, c])][row][c]
         board[row, c] = ''
         return board
             
@@ -96,25 +331,6 @@ class MoveEvaluator:
         Returns:
             True if there's a winner, False otherwise
         """    
-        # Define convolution kernels for detecting a win condition
-        horizontal_group = np.array([[1, 1, 1, 1]])
-        vertical_group = np.array([[1], [1], [1], [1]])
-        diag_down_group = np.eye(4, dtype=int)  # Top-left to bottom-right
-        diag_up_group = np.flipud(diag_down_group)  # Bottom-left to top-right
-
-        # Check for each player if there's a winning condition
-        for player_to_check in ["X", "O"]:
-            player_board = (board == player_to_check).astype(int)
-
-            # Check all directions using convolution for 4 in a row
-            if (convolve(player_board, horizontal_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, vertical_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, diag_down_group, mode="constant", cval=0) == 4).any():
-                return True
-            if (convolve(player_board, diag_up_group, mode="constant", cval=0) == 4).any():
-                return True
-
-        # Return False if no win condition is found for either player
-        return False
+        self.stats.win_checks += 1
+        # Check every line of four of the precomputed line index at once
+        return find_winner(board) is not None
@@ -0,0 +1,187 @@
+import mmap
+import struct
+
+import numpy as np
+
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from search import NegamaxSearch
+from transposition import TranspositionTable
+
+
+# File layout (little endian):
+#   header:  magic (4s), version (H), plies (B), depth (B), heuristic (B), count (I)
+#   keys:    count x uint64, sorted ascending (BitBoard.key() of every position)
+#   moves:   count x uint8, best column of the position with the same index
+#   scores:  count x int32, search score of that move (view of the player to move)
+MAGIC: bytes = b'C4BK'
+VERSION: int = 2
+HEADER = struct.Struct('<4sHBBBI')
+
+
+def collect_positions(plies: int) -> list[BitBoard]:
+    """
+    Collect all distinct positions that can be reached within a number of plies.
+
+    Positions that are already won are skipped, there is nothing to look up for them.
+
+    Parameters:
+        plies (int): Number of plies played from the empty board (positions with
+            0 to plies - 1 pieces are collected).
+
+    Returns:
+        list[BitBoard]: The positions.
+    """
+    positions = []
+    layer = {BitBoard().key(): BitBoard()}
+    for _ in range(plies):
+        positions.extend(layer.values())
+        next_layer = {}
+        for bb in layer.values():
+            for col in range(BitBoard.COLS):
+                if not bb.can_play(col):
+                    continue
+                child = bb.copy()
+                child.play(col)
+                if child.winner() is None:
+                    next_layer.setdefault(child.key(), child)
+        layer = next_layer
+    return positions
+
+
+def generate_book(path: str, plies: int = 4, depth: int = 12, table_mb: float = 256,
+                  heuristic: bool = True) -> int:
+    """
+    Search the best move of every early position and write them to a book file.
+
+    Without a heuristic, early positions have no forced result within the search
+    depth, so every move scores 0 and the book holds the first move of the search's
+    move order (center columns first).
+
+    Parameters:
+        path (str): Path of the book file to write.
+        plies (int): Positions with up to plies - 1 pieces are included.
+        depth (int): Search depth used for every position.
+        table_mb (float): Memory cap of the transposition table shared by all searches.
+        heuristic (bool): Score the positions at the depth limit with a `HeuristicEvaluator`.
+
+    Returns:
+        int: Number of positions written.
+    """
+    search = NegamaxSearch(depth, table=TranspositionTable(table_mb),
+                           heuristic=HeuristicEvaluator() if heuristic else None)
+    book = {}
+    positions = collect_positions(plies)
+    for i, bb in enumerate(positions):
+        result = search.search(bb)
+        book[bb.key()] = (result.move, result.score)
+        print(f"{i + 1}/{len(positions)} positions searched")
+
+    keys = np.array(sorted(book), dtype='<u8')
+    moves = np.array([book[key][0] for key in keys.tolist()], dtype=np.uint8)
+    scores = np.array([book[key][1] for key in keys.tolist()], dtype='<i4')
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, plies, depth, heuristic, len(keys)))
+        file.write(keys.tobytes())
+        file.write(moves.tobytes())
+        file.write(scores.tobytes())
+    return len(keys)
+
+
+class OpeningBook:
+    """
+    Read-only opening book backed by a memory-mapped book file.
+
+    Lookups are a binary search over the sorted keys directly in the mapped
+    file, so the book is neither parsed nor copied into memory.
+
+    Attributes:
+        path (str): Path of the book file.
+        plies (int): Positions with up to plies - 1 pieces are in the book.
+        depth (int): Search depth the book was generated with.
+        heuristic (bool): Whether the searches used a `HeuristicEvaluator`.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a book file.
+
+        Parameters:
+            path (str): Path of the book file written by `generate_book`.
+
+        Raises:
+            ValueError: If the file is not a valid book.
+        """
+        self.path: str = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.plies, self.depth, heuristic, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an opening book (version {VERSION})")
+        self.heuristic: bool = bool(heuristic)
+        self._keys = np.frombuffer(self._mmap, dtype='<u8', count=count, offset=HEADER.size)
+        self._moves = np.frombuffer(self._mmap, dtype=np.uint8, count=count, offset=HEADER.size + 8 * count)
+        self._scores = np.frombuffer(self._mmap, dtype='<i4', count=count, offset=HEADER.size + 9 * count)
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, bb: BitBoard) -> int | None:
+        """
+        Look up the best move of a position.
+
+        Parameters:
+            bb (BitBoard): The position.
+
+        Returns:
+            int: The best column, or None if the position is not in the book.
+        """
+        index = self._index(bb)
+        return None if index is None else int(self._moves[index])
+
+    def lookup_score(self, bb: BitBoard) -> int | None:
+        """
+        Look up the search score of the book move of a position.
+
+        Parameters:
+            bb (BitBoard): The position.
+
+        Returns:
+            int: The score from the view of the player to move, or None if the position is not in the book.
+        """
+        index = self._index(bb)
+        return None if index is None else int(self._scores[index])
+
+    def _index(self, bb: BitBoard) -> int | None:
+        """
+        Find the index of a position in the sorted keys (binary search).
+        """
+        key = np.uint64(bb.key())
+        index = int(np.searchsorted(self._keys, key))
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return None
+
+    def close(self) -> None:
+        """
+        Unmap and close the book file.
+        """
+        # the numpy views have to be gone before the map can be closed
+        self._keys = None
+        self._moves = None
+        self._scores = None
+        self._mmap.close()
+        self._file.close()
+
+
+if __name__ == '__main__':
+    count = generate_book('opening_book.bin', plies=4, depth=12)
+    print(f"Wrote {count} positions to opening_book.bin")
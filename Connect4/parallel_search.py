@@ -0,0 +1,132 @@
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from search import NegamaxSearch, SearchResult
+from search_stats import SearchStats
+from transposition import SharedTranspositionTable
+
+
+# State of a pool worker process, set once by `_init_worker`
+_worker = {}
+
+
+def _init_worker(table: SharedTranspositionTable, heuristic: HeuristicEvaluator | None) -> None:
+    """
+    Keep the (attached) shared transposition table and the heuristic evaluator in the worker.
+    """
+    _worker['table'] = table
+    _worker['heuristic'] = heuristic
+
+
+def _search_task(worker_id: int, bb: BitBoard, move_time_ms: float,
+                 max_depth: int | None) -> tuple[int, SearchResult, int, float]:
+    """
+    Run one Lazy SMP helper: an iterative deepening search on the shared table.
+
+    All helpers but the first use a different move order, so they explore
+    other parts of the tree first and fill the shared table for each other.
+    """
+    search = NegamaxSearch(table=_worker['table'], heuristic=_worker['heuristic'])
+    if worker_id:
+        random.Random(worker_id).shuffle(search.move_order)
+    start = time.perf_counter()
+    result = search.iterative_deepening(bb, move_time_ms, max_depth)
+    return worker_id, result, search.nodes, time.perf_counter() - start
+
+
+class LazySMPSearch:
+    """
+    Parallel search using Lazy SMP.
+
+    Every worker process searches the same root position with iterative
+    deepening and its own move ordering; they only cooperate through a
+    shared transposition table. The result of the deepest finished search
+    is used (the main worker wins ties).
+
+    Attributes:
+        processes (int): Number of worker processes.
+        table (SharedTranspositionTable): Transposition table shared by all workers.
+        heuristic (HeuristicEvaluator | None): Static evaluation used by all workers at the depth limit.
+        worker_stats (list[dict]): Per worker statistics of the last search.
+    """
+
+    def __init__(self, processes: int | None = None, table_mb: float = 64,
+                 heuristic: HeuristicEvaluator | None = None) -> None:
+        """
+        Initialize the search.
+
+        Parameters:
+            processes (int | None): Number of worker processes; defaults to `os.cpu_count()`.
+            table_mb (float): Memory cap of the shared transposition table in megabytes.
+            heuristic (HeuristicEvaluator | None): Static evaluation at the depth limit, none by default.
+        """
+        self.processes: int = processes or os.cpu_count()
+        self.table: SharedTranspositionTable = SharedTranspositionTable(table_mb)
+        self.heuristic: HeuristicEvaluator | None = heuristic
+        self.worker_stats: list[dict] = []
+        self._pool = None
+
+    def __enter__(self) -> 'LazySMPSearch':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def start(self) -> Pool:
+        """
+        Start the worker pool (once), it is reused for all following searches.
+
+        Returns:
+            Pool: The worker pool.
+        """
+        if self._pool is None:
+            self._pool = Pool(processes=self.processes, initializer=_init_worker,
+                              initargs=(self.table, self.heuristic))
+        return self._pool
+
+    def close(self) -> None:
+        """
+        Shut down the worker pool and free the shared transposition table.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+
+    def search(self, bb: BitBoard, move_time_ms: float, max_depth: int | None = None) -> SearchResult:
+        """
+        Search the best move with all workers.
+
+        Parameters:
+            bb (BitBoard): The position to search. It is not modified.
+            move_time_ms (float): Time budget for the move in milliseconds.
+            max_depth (int | None): Maximum depth; defaults to the number of empty cells.
+
+        Returns:
+            SearchResult: The result of the deepest finished search, with the
+                statistics of all workers added up.
+        """
+        tasks = [(worker_id, bb, move_time_ms, max_depth) for worker_id in range(self.processes)]
+        results = self.start().starmap(_search_task, tasks, chunksize=1)
+
+        self.worker_stats = [
+            {
+                'worker': worker_id,
+                'depth': result.depth,
+                'nodes': nodes,
+                'nodes_per_sec': nodes / elapsed if elapsed else 0.0,
+            }
+            for worker_id, result, nodes, elapsed in results
+        ]
+        # deepest result wins, results are ordered by worker id so the main worker wins ties
+        best = max(results, key=lambda entry: entry[1].depth)
+        others = [result.stats for _, result, _, _ in results if result is not best[1]]
+        return best[1]._replace(stats=SearchStats.combine([best[1].stats] + others, engine='smp'))
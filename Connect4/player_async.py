@@ -0,0 +1,154 @@
+import asyncio
+import os
+from random import choice
+from typing import Callable
+
+import numpy as np
+
+from api_client import AsyncGameClient
+from player import Player
+
+
+def random_strategy(board: np.ndarray, icon: str) -> int:
+    """
+    Pick a random column that is not full.
+
+    Parameters:
+        board (np.ndarray): The 7x8 board.
+        icon (str): Icon of the player to move.
+
+    Returns:
+        int: The chosen column.
+    """
+    return choice([col for col in range(board.shape[1]) if board[0, col] == ''])
+
+
+class Player_Async(Player):
+    """
+    Remote Player for asyncio, one of many players driven by a single process.
+
+    Implements the methods of `Player` as coroutines. Moves are chosen by a
+    strategy function, which runs in a worker thread so a long search does not
+    block the other players on the event loop.
+
+    Attributes:
+        client (AsyncGameClient): Connection to the player's game on the server.
+        strategy (Callable[[np.ndarray, str], int]): Chooses the column to play
+            from the 7x8 board and the player's icon.
+        verbose (bool): Whether the board is printed to the console.
+    """
+
+    def __init__(self, client: AsyncGameClient,
+                 strategy: Callable[[np.ndarray, str], int] = random_strategy, verbose: bool = False) -> None:
+        """
+        Initialize an asyncio remote player.
+
+        Parameters:
+            client (AsyncGameClient): Connection to the game the player joins.
+            strategy (Callable[[np.ndarray, str], int]): Move selection, random legal moves by default.
+            verbose (bool): Whether the board is printed to the console.
+        """
+        super().__init__()
+        self.client: AsyncGameClient = client
+        self.strategy: Callable[[np.ndarray, str], int] = strategy
+        self.verbose: bool = verbose
+
+    async def register_in_game(self) -> str:
+        """
+        Register the player in the game and assign the player an icon.
+
+        Returns:
+            str: The player's icon ('X' or 'O').
+        """
+        response = await self.client.post('register', json={'player_id': str(self.id)})
+        if response.status_code == 200:
+            return response.json().get('player_icon')
+        else:
+            raise ConnectionError(f"Failed to register player: {response.status_code}")
+
+    async def is_my_turn(self) -> bool:
+        """
+        Check if it is the player's turn.
+
+        Returns:
+            bool: True if it's the player's turn, False otherwise.
+        """
+        status = await self.get_game_status()
+        return str(self.id) == str(status.get('active_id'))
+
+    async def get_game_status(self) -> dict:
+        """
+        Retrieve the current status of the game.
+
+        Returns:
+            dict: A dictionary containing the game's status, such as active player, winner, and turn.
+        """
+        return (await self.client.get_state())['status']
+
+    async def get_board(self) -> np.ndarray:
+        """
+        Retrieve the current board.
+
+        Returns:
+            np.ndarray: The 7x8 board.
+        """
+        return np.array((await self.client.get_state())['board']).reshape(self.board_height, self.board_width)
+
+    async def wait_for_turn(self, timeout: float = 30) -> dict:
+        """
+        Wait until it is the player's turn, the game is over or the timeout has passed (long-polling).
+
+        Parameters:
+            timeout (float): Maximum number of seconds the server waits.
+
+        Returns:
+            dict: The game's status when the wait ended.
+        """
+        return await self.client.wait_for_turn(str(self.id), timeout)
+
+    async def make_move(self) -> int:
+        """
+        Choose a column with the strategy and play it.
+
+        Returns:
+            int: The column played.
+
+        Raises:
+            ValueError: If the server rejects the chosen move.
+        """
+        board = await self.get_board()
+        turn = self.client.state['status']['turn']
+        column = int(await asyncio.to_thread(self.strategy, board, self.icon))
+        data = {'column': column, 'player_id': str(self.id), 'turn': turn}    # rejected if the turn has passed
+        response = await self.client.post('make_move', json=data)
+        if response.status_code != 200:
+            raise ValueError(f"Move {column} of player {self.icon} was rejected")
+        return column
+
+    async def visualize(self) -> None:
+        """
+        Print the current state of the Connect4 board to the console (only if `verbose`).
+        """
+        if not self.verbose:
+            return
+        board = await self.get_board()
+        board = np.where(board == '', ' ', board)
+        os.system('cls' if os.name == 'nt' else 'clear')
+        print('│  0  │  1  │  2  │  3  │  4  │  5  │  6  │  7  │')
+        print('╔═════╦═════╦═════╦═════╦═════╦═════╦═════╦═════╗')
+        for i in range(13):
+            if i % 2:
+                print('╠═════╬═════╬═════╬═════╬═════╬═════╬═════╬═════╣')
+            else:
+                for j in range(8):
+                    print(f'║  {board[int(i/2), j]}  ', end='')
+                print('║')
+        print('╚═════╩═════╩═════╩═════╩═════╩═════╩═════╩═════╝')
+
+    async def celebrate_win(self) -> None:
+        """
+        Celebrate the win by displaying a message in the console.
+        """
+        await self.visualize()
+        winner = (await self.get_game_status()).get('winner')
+        print(f"Player {winner} won.")
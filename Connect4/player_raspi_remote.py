@@ -1,5 +1,4 @@
 import time
-import requests
 from player_remote import Player_Remote
 import numpy as np
 from sense_hat import SenseHat
@@ -57,10 +56,7 @@ class Player_Raspi_Remote(Player_Remote):
         """
         Override visualization to update the Sense HAT LED matrix with the current board state.
         """
-        url = f"{self.api_url}/connect4/board"
-        response = requests.get(url)
-        data = response.json()
-        board = np.array(data["board"]).reshape(7, 8)
+        board = np.array(self.get_state()["board"]).reshape(7, 8)
         for i in range(7):
             for j in range(8):
                 if board[i, j] == 'X':
@@ -77,7 +73,6 @@ class Player_Raspi_Remote(Player_Remote):
             int: The selected column for the move.
         """
         col = 0
-        url = f"{self.api_url}/connect4/make_move"
         while True:
             self.visualize_choice(col)
             for event in self.sense.stick.get_events():
@@ -88,7 +83,7 @@ class Player_Raspi_Remote(Player_Remote):
                         col = (col + 1) % 8
                     elif event.direction == 'middle':
                         data = {"column": col, "player_id": str(self.id)}
-                        response = requests.post(url, json=data)
+                        response = self.client.post('make_move', json=data)
                         if response.status_code == 200:
                             return col
             time.sleep(0.1)
@@ -1,6 +1,6 @@
 
 import os
-import requests
+from api_client import GameClient
 from player import Player
 import numpy as np
 
@@ -13,17 +13,22 @@ class Player_Remote(Player):
 
     Attributes:
         api_url (str): The API URL for the Connect4 game server.
+        game_id (str | None): ID of the game on the server, None for the server's default game.
+        client (GameClient): Pooled HTTP connection to the game's endpoints.
     """
 
-    def __init__(self, api_url: str) -> None:
+    def __init__(self, api_url: str, game_id: str | None = None) -> None:
         """
         Initialize a remote player.
 
         Parameters:
             api_url (str): The API URL for the Connect4 game server.
+            game_id (str | None): ID of the game to join, None for the server's default game.
         """
         super().__init__()
         self.api_url: str = api_url
+        self.game_id: str | None = game_id
+        self.client: GameClient = GameClient(api_url, game_id)
 
     def register_in_game(self) -> str:
         """
@@ -32,9 +37,8 @@ class Player_Remote(Player):
         Returns:
             str: The player's icon ('X' or 'O').
         """
-        url = f"{self.api_url}/connect4/register"
         data = {'player_id': str(self.id)}
-        response = requests.post(url, json=data)
+        response = self.client.post('register', json=data)
         if response.status_code == 200:
             player_icon = response.json().get('player_icon')
             return player_icon
@@ -57,12 +61,33 @@ class Player_Remote(Player):
         Returns:
             dict: A dictionary containing the game's status, such as active player, winner, and turn.
         """
-        url = f"{self.api_url}/connect4/status"
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise ConnectionError(f"Failed to retrieve game status: {response.status_code}")
+        return self.get_state()['status']
+
+    def get_state(self) -> dict:
+        """
+        Retrieve status, board, last move and version of the game in one request.
+
+        The server answers 304 if nothing changed since the last call; the cached state is returned then.
+
+        Returns:
+            dict: A dictionary containing 'status', 'board' (flat list), 'last_move' and 'version'.
+        """
+        return self.client.get_state()
+
+    def wait_for_turn(self, timeout: float = 30) -> dict:
+        """
+        Block until it is the player's turn, the game is over or the timeout has passed.
+
+        The server holds the request open (long-polling) instead of the client polling
+        the status over and over.
+
+        Parameters:
+            timeout (float): Maximum number of seconds the server waits.
+
+        Returns:
+            dict: The game's status when the wait ended.
+        """
+        return self.client.wait_for_turn(str(self.id), timeout)
 
     def make_move(self) -> int:
         """
@@ -71,14 +96,13 @@ class Player_Remote(Player):
         Returns:
             int: The column chosen by the player for their move.
         """
-        url = f"{self.api_url}/connect4/make_move"
         print(f"It's {self.icon}'s turn. Which column do you select? [0-7]")
         while True:
             try:
                 move = int(input())
                 if 0 <= move <= 7:
                     data = {'column': move, 'player_id': str(self.id)}
-                    response = requests.post(url, json=data)
+                    response = self.client.post('make_move', json=data)
                     if response.status_code == 200:
                         return move
                     else:
@@ -92,24 +116,25 @@ class Player_Remote(Player):
         """
         Visualize the current state of the Connect4 board in the console.
         """
-        url = f"{self.api_url}/connect4/board"
-        response = requests.get(url)
-        if response.status_code == 200:
-            board = np.array(response.json()["board"]).reshape(7, 8)
-            board = np.where(board == '', ' ', board)
-            os.system('cls' if os.name == 'nt' else 'clear')
-            print('│  0  │  1  │  2  │  3  │  4  │  5  │  6  │  7  │')
-            print('╔═════╦═════╦═════╦═════╦═════╦═════╦═════╦═════╗')
-            for i in range(13):
-                if i % 2:
-                    print('╠═════╬═════╬═════╬═════╬═════╬═════╬═════╬═════╣')
-                else:
-                    for j in range(8):
-                        print(f'║  {board[int(i/2), j]}  ', end='')
-                    print('║')
-            print('╚═════╩═════╩═════╩═════╩═════╩═════╩═════╩═════╝')
-        else:
-            raise ConnectionError(f"Failed to retrieve board: {response.status_code}")
+        board = np.array(self.get_state()["board"]).reshape(7, 8)
+        board = np.where(board == '', ' ', board)
+        os.system('cls' if os.name == 'nt' else 'clear')
+        print('│  0  │  1  │  2  │  3  │  4  │  5  │  6  │  7  │')
+        print('╔═════╦═════╦═════╦═════╦═════╦═════╦═════╦═════╗')
+        for i in range(13):
+            if i % 2:
+                print('╠═════╬═════╬═════╬═════╬═════╬═════╬═════╬═════╣')
+            else:
+                for j in range(8):
+                    print(f'║  {board[int(i/2), j]}  ', end='')
+                print('║')
+        print('╚═════╩═════╩═════╩═════╩═════╩═════╩═════╩═════╝')
+
+    def close(self) -> None:
+        """
+        Close the connection to the server.
+        """
+        self.client.close()
 
     def celebrate_win(self) -> None:
         """
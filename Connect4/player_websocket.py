@@ -0,0 +1,227 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from player import Player
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+
+class Player_WebSocket(Player):
+    """
+    Remote Player that talks to the Connect4 server over a single WebSocket.
+
+    The server pushes every change of the game (one small delta per move), so
+    the player keeps a local copy of the board and status instead of polling
+    the REST endpoints.
+
+    Attributes:
+        api_url (str): The API URL for the Connect4 game server.
+        game_id (str | None): ID of the game on the server, None for the server's default game.
+        ws_url (str): URL of the game's WebSocket endpoint.
+        board (np.ndarray): Local copy of the 7x8 board.
+        status (dict): Local copy of the game status.
+        version (int): Version of the game state the local copy belongs to.
+    """
+    # Shortest wait of a poll: websocket-client treats a timeout of 0 as a non-blocking socket
+    POLL_TIMEOUT: float = 0.001
+
+    def __init__(self, api_url: str, game_id: str | None = None) -> None:
+        """
+        Initialize a WebSocket player and connect to the server.
+
+        Parameters:
+            api_url (str): The API URL for the Connect4 game server (http:// or https://).
+            game_id (str | None): ID of the game to join, None for the server's default game.
+
+        Raises:
+            ImportError: If the websocket-client package is not installed.
+        """
+        super().__init__()
+        if websocket is None:
+            raise ImportError("websocket-client module is not installed, it is required for Player_WebSocket.")
+        self.api_url: str = api_url
+        self.game_id: str | None = game_id
+        base_url = 'ws' + api_url[len('http'):] if api_url.startswith('http') else api_url
+        self.ws_url: str = f"{base_url}/connect4/ws" if game_id is None else f"{base_url}/connect4/{game_id}/ws"
+
+        self.board: np.ndarray = np.full((self.board_height, self.board_width), '')
+        self.status: dict = {}
+        self.version: int = -1
+        self._replies: list[dict] = []
+        self._ws = websocket.create_connection(self.ws_url)
+        while self.version < 0:     # the server sends the full state right after connecting
+            self._receive()
+
+    def close(self) -> None:
+        """
+        Close the WebSocket connection.
+        """
+        self._ws.close()
+
+    def _receive(self, timeout: float | None = None) -> bool:
+        """
+        Receive one message and apply it to the local state (replies are queued).
+
+        Parameters:
+            timeout (float | None): Maximum number of seconds to wait, None to block.
+
+        Returns:
+            bool: False if no message arrived within the timeout.
+
+        Raises:
+            ConnectionError: If the server reports an error.
+        """
+        # websocket-client's own timeout also covers frames it (or the SSL layer) already buffered
+        self._ws.settimeout(None if timeout is None else max(timeout, self.POLL_TIMEOUT))
+        try:
+            message = json.loads(self._ws.recv())
+        except websocket.WebSocketTimeoutException:
+            return False
+        finally:
+            self._ws.settimeout(None)
+
+        # a move's result carries its delta too, so pushes can arrive after the state they describe
+        if message['type'] == 'state':
+            if message['version'] >= self.version:
+                self.board = np.array(message['board']).reshape(self.board_height, self.board_width)
+                self.status = message['status']
+                self.version = message['version']
+        elif message['type'] == 'delta':
+            self._apply_delta(message)
+        elif message['type'] == 'error':
+            raise ConnectionError(f"Server error: {message['error']}")
+        else:
+            self._replies.append(message)
+        return True
+
+    def _apply_delta(self, message: dict) -> None:
+        """
+        Apply a move to the local state if it follows the local version (older ones are already applied).
+
+        Parameters:
+            message (dict): A 'delta' or successful 'move_result' message with the move, status and version.
+        """
+        if message['version'] == self.version + 1:
+            move = message['move']
+            self.board[move['row'], move['column']] = move['icon']
+            self.status = message['status']
+            self.version = message['version']
+
+    def _request(self, message: dict, reply_type: str) -> dict:
+        """
+        Send a message and wait for its reply, applying pushed updates meanwhile.
+        """
+        self._ws.send(json.dumps(message))
+        while not any(reply['type'] == reply_type for reply in self._replies):
+            self._receive()
+        reply = next(reply for reply in self._replies if reply['type'] == reply_type)
+        self._replies.remove(reply)
+        return reply
+
+    def register_in_game(self) -> str:
+        """
+        Register the player in the game and assign the player an icon.
+
+        Returns:
+            str: The player's icon ('X' or 'O').
+        """
+        reply = self._request({'type': 'register', 'player_id': str(self.id)}, 'registered')
+        return reply['player_icon']
+
+    def is_my_turn(self) -> bool:
+        """
+        Check if it is the player's turn.
+
+        Returns:
+            bool: True if it's the player's turn, False otherwise.
+        """
+        return str(self.id) == str(self.get_game_status().get('active_id'))
+
+    def get_game_status(self) -> dict:
+        """
+        Get the current status of the game, after applying all updates pushed so far.
+
+        Returns:
+            dict: A dictionary containing the game's status, such as active player, winner, and turn.
+        """
+        while self._receive(timeout=0):
+            pass
+        return self.status
+
+    def wait_for_turn(self, timeout: float = 30) -> dict:
+        """
+        Block until it is the player's turn, the game is over or the timeout has passed.
+
+        Parameters:
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            dict: The game's status when the wait ended.
+        """
+        deadline = time.monotonic() + timeout
+        status = self.get_game_status()
+        while status.get('winner') is None and str(status.get('active_id')) != str(self.id):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._receive(timeout=remaining):
+                break
+            status = self.status
+        return status
+
+    def make_move(self) -> int:
+        """
+        Prompt the remote player to select a column and make a move.
+
+        Returns:
+            int: The column chosen by the player for their move.
+        """
+        print(f"It's {self.icon}'s turn. Which column do you select? [0-7]")
+        while True:
+            try:
+                move = int(input())
+                if 0 <= move <= 7:
+                    reply = self._request({'type': 'move', 'player_id': str(self.id), 'column': move}, 'move_result')
+                    if reply['success']:
+                        # the local state shows the move before this returns; if updates before
+                        # it are still on their way, wait for them to be pushed
+                        self._apply_delta(reply)
+                        while self.version < reply['version']:
+                            self._receive()
+                        return move
+                    else:
+                        print("Invalid move! Column is full.")
+                else:
+                    print("Invalid input! Please enter a number between 0 and 7.")
+            except ValueError:
+                print("Invalid input! Please enter a number between 0 and 7.")
+
+    def visualize(self) -> None:
+        """
+        Visualize the current state of the Connect4 board in the console.
+        """
+        self.get_game_status()
+        board = np.where(self.board == '', ' ', self.board)
+        os.system('cls' if os.name == 'nt' else 'clear')
+        print('│  0  │  1  │  2  │  3  │  4  │  5  │  6  │  7  │')
+        print('╔═════╦═════╦═════╦═════╦═════╦═════╦═════╦═════╗')
+        for i in range(13):
+            if i % 2:
+                print('╠═════╬═════╬═════╬═════╬═════╬═════╬═════╬═════╣')
+            else:
+                for j in range(8):
+                    print(f'║  {board[int(i/2), j]}  ', end='')
+                print('║')
+        print('╚═════╩═════╩═════╩═════╩═════╩═════╩═════╩═════╝')
+
+    def celebrate_win(self) -> None:
+        """
+        Celebrate the win by displaying a message in the console.
+        """
+        self.visualize()
+        winner = self.get_game_status().get('winner')
+        print(f"Player {winner} won.")
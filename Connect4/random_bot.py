@@ -1,6 +1,6 @@
 
 import os
-import requests
+from api_client import GameClient
 from player import Player
 import numpy as np
 from random import randint
@@ -11,18 +11,21 @@ class Bot_Player(Player):
     Local Player (uses Methods of the Game directly).
     """
 
-    def __init__(self, api_url: str) -> None:
+    def __init__(self, api_url: str, game_id: str | None = None) -> None:
         """ 
         Initialize a local player.
             Must Implement all Methods from Abstract Player Class
 
         Parameters:
-            game (Connect4): Instance of Connect4 game
+            api_url (str): The API URL for the Connect4 game server.
+            game_id (str | None): ID of the game to join, None for the server's default game.
         
        
         """
         super().__init__()  # Initialize id and icon from the abstract Player class
         self.api_url = api_url
+        self.game_id = game_id
+        self.client = GameClient(api_url, game_id)   # pooled keep-alive connection to the game
 
 
     def register_in_game(self) -> str:
@@ -32,13 +35,12 @@ class Bot_Player(Player):
         Returns:
             str: The player's icon.
         """
-        url = f"{self.api_url}/connect4/register"
         data = {
             'player_id' : str(self.id)
         }
         
         
-        response = requests.post(url, json=data)
+        response = self.client.post('register', json=data)
         
         
         if response.status_code == 200:
@@ -67,11 +69,18 @@ class Bot_Player(Player):
             - what turn is it?
       
         """
-        url = f"{self.api_url}/connect4/status"
-        
-        response = requests.get(url)
-        data = response.json()
-        return(data)
+        return(self.get_state()['status'])
+
+    def get_state(self) -> dict:
+        """
+        Get status, board, last move and version of the game in one request.
+            The server answers 304 if nothing changed since the last call,
+            the cached state is returned then.
+
+        Returns:
+            dict: A dictionary containing 'status', 'board' (flat list), 'last_move' and 'version'.
+        """
+        return(self.client.get_state())
 
     def make_move(self) -> int:
         """ 
@@ -80,7 +89,6 @@ class Bot_Player(Player):
         Returns:
             int: The column chosen by the player for the move.
         """
-        url = f"{self.api_url}/connect4/make_move"
         
         print(f"It's {self.icon}'s turn, which column do you select? [0-7]")
         
@@ -92,7 +100,7 @@ class Bot_Player(Player):
                     "player_id": str(self.id)
                     }
             
-            response = requests.post(url, json=data)
+            response = self.client.post('make_move', json=data)
             print(response)
             
             if response.status_code == 200:  # Use self.game to validate
@@ -110,12 +118,7 @@ class Bot_Player(Player):
         """
         
         
-        url = f"{self.api_url}/connect4/board"
-        
-        response = requests.get(url)
-        data = response.json()
-        
-        board = np.array(data["board"]).reshape(7, 8)
+        board = np.array(self.get_state()["board"]).reshape(7, 8)
         board = np.where(board == '', ' ', board)
         
         
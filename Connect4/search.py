@@ -0,0 +1,303 @@
+import time
+from typing import NamedTuple
+
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from search_stats import SearchStats
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+
+class SearchResult(NamedTuple):
+    """
+    Result of a search.
+
+    Attributes:
+        move (int): The best column found.
+        score (int): Minimax score of the move from the view of the player to move.
+        depth (int): The depth (in plies) the move was searched to.
+        stats (SearchStats | None): Counters and timings of the search that found the move.
+    """
+    move: int
+    score: int
+    depth: int
+    stats: SearchStats | None = None
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget of a move is used up.
+    """
+
+
+class NegamaxSearch:
+    """
+    Depth-limited negamax search with alpha-beta pruning on a `BitBoard`.
+
+    Scores are always given from the view of the player to move:
+        - WIN_SCORE - ply for a win after `ply` plies (faster wins score higher)
+        - -(WIN_SCORE - ply) for a loss
+        - 0 for a draw
+        - 0 for an undecided position at the depth limit, or its heuristic score
+          if a `heuristic` is given (always far from the win scores)
+
+    Attributes:
+        target_depth (int): Maximum search depth in plies.
+        n_col (int): Number of columns of the board.
+        move_order (list[int]): Columns ordered from the center outwards.
+        table (TranspositionTable | None): Optional transposition table shared between searches.
+        heuristic (HeuristicEvaluator | None): Static evaluation of the positions at the depth limit.
+        nodes (int): Number of nodes visited during the last search.
+        stats (SearchStats): Counters and timings of the last search (also returned with its result).
+    """
+    WIN_SCORE: int = 1_000_000
+    MAX_PLIES: int = BitBoard.ROWS * BitBoard.COLS
+    TIME_CHECK_NODES: int = 1023   # check the clock every 1024 nodes
+
+    def __init__(self, target_depth: int = 8, n_col: int = BitBoard.COLS,
+                 table: TranspositionTable | None = None, heuristic: HeuristicEvaluator | None = None) -> None:
+        """
+        Initialize the search.
+
+        Parameters:
+            target_depth (int): Maximum search depth in plies.
+            n_col (int): Number of columns of the board.
+            table (TranspositionTable | None): Transposition table to cache positions in.
+            heuristic (HeuristicEvaluator | None): Scores the positions at the depth limit
+                (they count as 0 without one).
+        """
+        self.target_depth: int = target_depth
+        self.n_col: int = n_col
+        self.table: TranspositionTable | None = table
+        self.heuristic: HeuristicEvaluator | None = heuristic
+        center = (n_col - 1) / 2
+        self.move_order: list[int] = sorted(range(n_col), key=lambda col: abs(col - center))
+        self.nodes: int = 0
+        self.stats: SearchStats = SearchStats('negamax')
+        self._deadline: float | None = None
+
+    def search(self, bb: BitBoard) -> SearchResult:
+        """
+        Search the best move for the player to move.
+
+        Parameters:
+            bb (BitBoard): The position to search. It is restored before returning.
+
+        Returns:
+            SearchResult: The best move, its score and the searched depth.
+
+        Raises:
+            ValueError: If there is no legal move left.
+        """
+        self.nodes = 0
+        self.stats = SearchStats('negamax')
+        start = time.perf_counter()
+        result = self._search_root(bb, self.target_depth)
+        self.stats.depth = result.depth
+        self.stats.nodes = self.nodes
+        self.stats.elapsed = time.perf_counter() - start
+        return result._replace(stats=self.stats)
+
+    def iterative_deepening(self, bb: BitBoard, move_time_ms: float, max_depth: int | None = None) -> SearchResult:
+        """
+        Search with increasing depth until the time budget is used up.
+
+        Every iteration tries the best move of the previous one first (and the
+        transposition table, if any, keeps the best moves of all inner positions),
+        so the deeper iterations are searched with good move ordering.
+        The first iteration is always completed, so there is always a move.
+
+        Parameters:
+            bb (BitBoard): The position to search. It is not modified.
+            move_time_ms (float): Time budget for the move in milliseconds.
+            max_depth (int | None): Maximum depth; defaults to the number of empty cells.
+
+        Returns:
+            SearchResult: The result of the deepest completed iteration.
+
+        Raises:
+            ValueError: If there is no legal move left.
+        """
+        if max_depth is None:
+            max_depth = self.MAX_PLIES - bb.moves
+        start = time.perf_counter()
+        deadline = start + move_time_ms / 1000
+        work = bb.copy()    # an interrupted iteration leaves its pieces on the board
+        self.nodes = 0
+        self.stats = SearchStats('negamax')
+        best = None
+
+        try:
+            for depth in range(1, max(max_depth, 1) + 1):
+                result = self._search_root(work, depth, None if best is None else best.move)
+                best = result
+                self.stats.iterations.append({
+                    'depth': depth, 'move': result.move, 'score': result.score,
+                    'nodes': self.nodes, 'time_ms': 1000 * (time.perf_counter() - start),
+                })
+                if abs(result.score) > self.WIN_SCORE - self.MAX_PLIES:
+                    break   # forced win or loss found, deeper search can't change it
+                self._deadline = deadline
+                if time.perf_counter() > deadline:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+
+        self.stats.depth = best.depth
+        self.stats.nodes = self.nodes
+        self.stats.elapsed = time.perf_counter() - start
+        return best._replace(stats=self.stats)
+
+    def _search_root(self, bb: BitBoard, depth: int, first_move: int | None = None) -> SearchResult:
+        """
+        Search all moves of the root position to the given depth.
+
+        The score, nodes and time of every root move are kept in `stats.root_moves`
+        once all of them are searched.
+
+        Parameters:
+            bb (BitBoard): The position to search.
+            depth (int): Search depth in plies.
+            first_move (int | None): Move to search first.
+
+        Returns:
+            SearchResult: The best move, its score and the searched depth.
+        """
+        alpha = -self.WIN_SCORE - 1
+        beta = self.WIN_SCORE + 1
+        best_move = None
+        best_score = alpha
+
+        move_order = self.move_order
+        if first_move is not None:
+            move_order = [first_move] + [col for col in self.move_order if col != first_move]
+
+        root_moves = []
+        for col in move_order:
+            if not bb.can_play(col):
+                continue
+            nodes, start = self.nodes, time.perf_counter()
+            score = self._score_move(bb, col, depth, alpha, beta, 0)
+            root_moves.append({'column': col, 'score': score, 'nodes': self.nodes - nodes,
+                               'time_ms': 1000 * (time.perf_counter() - start)})
+            if best_move is None or score > best_score:
+                best_move = col
+                best_score = score
+            alpha = max(alpha, score)
+
+        if best_move is None:
+            raise ValueError("No legal move left")
+        self.stats.root_moves = root_moves
+        return SearchResult(best_move, best_score, depth)
+
+    def negamax(self, bb: BitBoard, depth: int, alpha: int, beta: int, ply: int = 0) -> int:
+        """
+        Evaluate a position with negamax and alpha-beta pruning.
+
+        Parameters:
+            bb (BitBoard): The position to evaluate. It is restored before returning.
+            depth (int): Remaining depth in plies.
+            alpha (int): Lower bound of the search window.
+            beta (int): Upper bound of the search window.
+            ply (int): Distance to the root of the search.
+
+        Returns:
+            int: Score of the position from the view of the player to move.
+        """
+        self.nodes += 1
+        if (self._deadline is not None and not self.nodes & self.TIME_CHECK_NODES
+                and time.perf_counter() > self._deadline):
+            raise SearchTimeout()
+        if bb.moves == BitBoard.ROWS * self.n_col:
+            self.stats.terminals += 1
+            return 0
+        if depth == 0:
+            self.stats.leaves += 1
+            return 0 if self.heuristic is None else self.heuristic.evaluate_bitboard(bb)
+
+        move_order = self.move_order
+        if self.table is not None:
+            alpha_orig = alpha
+            key = bb.key()
+            entry = self.table.probe(key)
+            self.stats.tt_probes += 1
+            if entry is not None:
+                self.stats.tt_hits += 1
+                if entry.depth >= depth:
+                    value = self._value_from_table(entry.value, ply)
+                    if entry.flag == EXACT:
+                        self.stats.tt_cutoffs += 1
+                        return value
+                    if entry.flag == LOWER_BOUND:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        self.stats.tt_cutoffs += 1
+                        return value
+                if entry.move is not None:
+                    move_order = [entry.move] + [col for col in self.move_order if col != entry.move]
+
+        best_score = -self.WIN_SCORE - 1
+        best_move = None
+        for col in move_order:
+            if not bb.can_play(col):
+                continue
+            score = self._score_move(bb, col, depth, alpha, beta, ply)
+            if score > best_score:
+                best_score = score
+                best_move = col
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.stats.cutoffs += 1
+                break
+
+        if self.table is not None:
+            if best_score <= alpha_orig:
+                flag = UPPER_BOUND
+            elif best_score >= beta:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            self.table.store(key, depth, flag, self._value_to_table(best_score, ply), best_move)
+        return best_score
+
+    def _score_move(self, bb: BitBoard, col: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Play a move, score it and take it back.
+
+        Returns:
+            int: Score of the move from the view of the player making it.
+        """
+        mover_is_x = bb.moves % 2 == 0
+        bb.play(col, 'X' if mover_is_x else 'O')
+        self.stats.win_checks += 1
+        if BitBoard.has_four(bb.x_mask if mover_is_x else bb.o_mask):
+            self.stats.terminals += 1
+            score = self.WIN_SCORE - (ply + 1)
+        else:
+            score = -self.negamax(bb, depth - 1, -beta, -alpha, ply + 1)
+        bb.undo(col)
+        return score
+
+    def _value_to_table(self, score: int, ply: int) -> int:
+        """
+        Make win/loss scores relative to the stored position instead of the root.
+        """
+        if score > self.WIN_SCORE - self.MAX_PLIES:
+            return score + ply
+        if score < -self.WIN_SCORE + self.MAX_PLIES:
+            return score - ply
+        return score
+
+    def _value_from_table(self, value: int, ply: int) -> int:
+        """
+        Convert a stored win/loss score back to be relative to the root.
+        """
+        if value > self.WIN_SCORE - self.MAX_PLIES:
+            return value - ply
+        if value < -self.WIN_SCORE + self.MAX_PLIES:
+            return value + ply
+        return value
@@ -0,0 +1,130 @@
+import json
+
+
+class SearchStats:
+    """
+    Counters and timings of one move decision of a search engine.
+
+    Every engine fills in the counters it has (e.g. `MoveEvaluator` has no
+    cutoffs); the others stay 0.
+
+    Attributes:
+        engine (str): Name of the engine that searched ('negamax', 'smp', 'evaluator', ...).
+        depth (int): Depth (in plies) of the deepest completed search.
+        nodes (int): Positions visited.
+        leaves (int): Positions cut off by the depth limit.
+        terminals (int): Positions where the game ended (win or full board).
+        win_checks (int): Number of win detections.
+        cutoffs (int): Beta cutoffs (alpha-beta pruning).
+        tt_probes (int): Transposition table lookups.
+        tt_hits (int): Lookups that found their position.
+        tt_cutoffs (int): Hits whose stored value ended the search of the position.
+        elapsed (float): Wall clock time of the decision in seconds.
+        root_moves (list[dict]): Per root move of the last completed iteration:
+            'column', 'score', 'nodes' and 'time_ms'.
+        iterations (list[dict]): Per completed iteration of iterative deepening:
+            'depth', 'move', 'score', 'nodes' and 'time_ms' (both since the start).
+    """
+    COUNTERS: tuple[str, ...] = ('nodes', 'leaves', 'terminals', 'win_checks', 'cutoffs',
+                                 'tt_probes', 'tt_hits', 'tt_cutoffs')
+
+    def __init__(self, engine: str = '') -> None:
+        """
+        Initialize empty statistics.
+
+        Parameters:
+            engine (str): Name of the engine the statistics belong to.
+        """
+        self.engine: str = engine
+        self.depth: int = 0
+        self.nodes: int = 0
+        self.leaves: int = 0
+        self.terminals: int = 0
+        self.win_checks: int = 0
+        self.cutoffs: int = 0
+        self.tt_probes: int = 0
+        self.tt_hits: int = 0
+        self.tt_cutoffs: int = 0
+        self.elapsed: float = 0.0
+        self.root_moves: list[dict] = []
+        self.iterations: list[dict] = []
+
+    @property
+    def nodes_per_sec(self) -> float:
+        """
+        Search speed (0.0 if no time was measured).
+        """
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """
+        Share of table lookups that found their position (0.0 without lookups).
+        """
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @classmethod
+    def combine(cls, stats: list['SearchStats'], engine: str | None = None) -> 'SearchStats':
+        """
+        Add up the statistics of searches that ran at the same time (e.g. worker processes).
+
+        The counters are summed, the elapsed time is the longest one, and the
+        depth, root moves and iterations are taken from the first entry.
+
+        Parameters:
+            stats (list[SearchStats]): The statistics to combine, the main search first.
+            engine (str | None): Engine name of the result; defaults to the one of the first entry.
+
+        Returns:
+            SearchStats: The combined statistics.
+        """
+        combined = cls(engine if engine is not None else (stats[0].engine if stats else ''))
+        for entry in stats:
+            for counter in cls.COUNTERS:
+                setattr(combined, counter, getattr(combined, counter) + getattr(entry, counter))
+            combined.elapsed = max(combined.elapsed, entry.elapsed)
+        if stats:
+            combined.depth = stats[0].depth
+            combined.root_moves = list(stats[0].root_moves)
+            combined.iterations = list(stats[0].iterations)
+        return combined
+
+    def as_dict(self) -> dict:
+        """
+        Get the statistics as a JSON serializable dictionary.
+
+        Returns:
+            dict: All attributes plus 'nodes_per_sec' and 'tt_hit_rate'.
+        """
+        data = {'engine': self.engine, 'depth': self.depth}
+        data.update({counter: getattr(self, counter) for counter in self.COUNTERS})
+        data.update({
+            'elapsed': self.elapsed,
+            'nodes_per_sec': self.nodes_per_sec,
+            'tt_hit_rate': self.tt_hit_rate,
+            'root_moves': self.root_moves,
+            'iterations': self.iterations,
+        })
+        return data
+
+    def to_json(self, path: str | None = None) -> str:
+        """
+        Export the statistics as JSON.
+
+        Parameters:
+            path (str | None): File to append the statistics to as one line (JSON Lines),
+                so the decisions of a whole game can be collected in one file.
+
+        Returns:
+            str: The statistics as a JSON string.
+        """
+        text = json.dumps(self.as_dict())
+        if path is not None:
+            with open(path, 'a') as f:
+                f.write(text + '\n')
+        return text
+
+    def __repr__(self) -> str:
+        return (f"SearchStats({self.engine}: depth {self.depth}, {self.nodes} nodes, "
+                f"{self.nodes_per_sec:.0f} nodes/s, {self.cutoffs} cutoffs, "
+                f"{self.tt_hits}/{self.tt_probes} table hits, {1000 * self.elapsed:.1f} ms)")
@@ -1,9 +1,20 @@
+import argparse
+import json
+import math
 import uuid
 import socket
+import threading
 from flask import Flask, request, jsonify
 from flask_swagger_ui import get_swaggerui_blueprint
 
+try:
+    from flask_sock import Sock
+    from simple_websocket import ConnectionClosed
+except ImportError:     # the WebSocket endpoint is optional
+    Sock = None
+
 from game import Connect4
+from sessions import SessionRegistry, SQLiteSessionRegistry, GameNotFound
 
 
 class Connect4Server:
@@ -11,19 +22,38 @@ class Connect4Server:
     Game Server for Connect4.
 
     Hosts a Flask-based API to manage game logic and allow players to interact remotely.
+    The server hosts many games at once, every game is a session identified by its game ID.
+    The routes without a game ID (e.g. `/connect4/status`) use the default game.
 
     Attributes:
-        game (Connect4): Instance of the Connect4 game.
+        sessions (SessionRegistry): Registry of all hosted games (in memory or SQLite).
         app (Flask): Flask application instance for handling HTTP requests.
+        websocket (bool): Whether the WebSocket endpoint (`/connect4/ws`) is served.
     """
+    DEFAULT_GAME_ID: str = 'default'
+    MAX_WAIT: float = 60    # longest a wait request may block (seconds)
 
-    def __init__(self):
+    def __init__(self, idle_timeout: float = 3600, store_path: str | None = None, websocket: bool = True):
         """
         Initialize the Connect4 server.
 
         Sets up the Flask app, Swagger documentation, and API routes.
+
+        Parameters:
+            idle_timeout (float): Seconds after which an idle game is removed.
+            store_path (str | None): SQLite file to keep the games in, so several worker
+                processes can share them. None keeps them in memory (one process only).
+            websocket (bool): Serve the WebSocket endpoint (needs flask-sock and a WSGI server
+                that hands out the raw socket: the development server or gunicorn, not waitress).
         """
-        self.game = Connect4()
+        if store_path is None:
+            self.sessions = SessionRegistry(idle_timeout)
+        else:
+            self.sessions = SQLiteSessionRegistry(store_path, idle_timeout)
+        try:
+            self.sessions.create(self.DEFAULT_GAME_ID, persistent=True)
+        except KeyError:
+            pass    # already created by another worker (or an earlier run) in the shared store
         self.app = Flask(__name__)
 
         swagger_url = '/swagger/connect4/'
@@ -35,30 +65,85 @@ class Connect4Server:
         )
         self.app.register_blueprint(swaggerui_blueprint, url_prefix=swagger_url)
 
+        self.websocket: bool = websocket and Sock is not None
         self.setup_routes()
+        if self.websocket:
+            self.setup_websocket_routes()
+
+    @property
+    def game(self) -> Connect4:
+        """
+        The game of the default session.
+        """
+        return self.sessions.get(self.DEFAULT_GAME_ID).game
 
     def setup_routes(self) -> None:
         """
         Define the API routes for interacting with the Connect4 game.
         """
+        default = {'game_id': self.DEFAULT_GAME_ID}
+
+        @self.app.before_request
+        def evict_idle_games():
+            self.sessions.maybe_evict()
+
+        @self.app.errorhandler(GameNotFound)
+        def game_not_found(error):
+            return jsonify({'error': 'Game not found'}), 404
 
         @self.app.route('/')
         def index():
             return "Welcome to the Connect 4 API!"
 
-        @self.app.route('/connect4/status', methods=['GET'])
-        def get_status():
+        @self.app.route('/connect4/games', methods=['POST'])
+        def create_game():
+            """
+            Create a new game.
+
+            Returns:
+                JSON response with the ID of the new game.
+            """
+            session = self.sessions.create()
+            return jsonify({'game_id': session.game_id}), 201
+
+        @self.app.route('/connect4/games', methods=['GET'])
+        def list_games():
+            """
+            List all hosted games.
+
+            Returns:
+                JSON response with the ID, number of players, turn and winner of every game.
+            """
+            return jsonify({'games': self.sessions.list_sessions()}), 200
+
+        @self.app.route('/connect4/<game_id>', methods=['DELETE'])
+        def delete_game(game_id):
+            """
+            Delete a game.
+
+            Returns:
+                JSON response indicating success, or 404 if the game does not exist.
+            """
+            if game_id == self.DEFAULT_GAME_ID or not self.sessions.delete(game_id):
+                return jsonify({'error': 'Game not found'}), 404
+            return jsonify({"success": True}), 200
+
+        @self.app.route('/connect4/status', methods=['GET'], defaults=default)
+        @self.app.route('/connect4/<game_id>/status', methods=['GET'])
+        def get_status(game_id):
             """
             Get the current status of the game.
 
             Returns:
                 JSON response with game status, including active player, winner, and turn.
             """
-            data = self.game.get_status()
+            with self.sessions.open(game_id, write=False) as session:
+                data = session.game.get_status()
             return jsonify(data), 200
 
-        @self.app.route('/connect4/register', methods=['POST'])
-        def register_player():
+        @self.app.route('/connect4/register', methods=['POST'], defaults=default)
+        @self.app.route('/connect4/<game_id>/register', methods=['POST'])
+        def register_player(game_id):
             """
             Register a player in the game.
 
@@ -73,32 +158,92 @@ class Connect4Server:
             if not player_id:
                 return jsonify({'error': 'Invalid input'}), 400
 
-            icon = self.game.register_player(player_id)
+            with self.sessions.open(game_id) as session:
+                icon = session.game.register_player(player_id)
+                if icon:
+                    session.notify_changed()
             if icon:
                 return jsonify({'player_icon': icon}), 200
             else:
                 return jsonify({'error': 'Game Full'}), 400
 
-        @self.app.route('/connect4/board', methods=['GET'])
-        def get_board():
+        @self.app.route('/connect4/wait', methods=['GET'], defaults=default)
+        @self.app.route('/connect4/<game_id>/wait', methods=['GET'])
+        def wait_for_turn(game_id):
+            """
+            Wait (long-poll) until it is the player's turn or the game is over.
+
+            Query Parameters:
+                - player_id (str): Unique identifier for the player.
+                - timeout (float): Maximum seconds to wait (default 30, clamped to 0..MAX_WAIT;
+                  nan and inf are rejected).
+
+            Returns:
+                JSON response with the game status (like /status) once it is the
+                player's turn, the game is over or the timeout has passed.
+            """
+            player_id = request.args.get('player_id')
+            if not player_id:
+                return jsonify({'error': 'Invalid input'}), 400
+            try:
+                timeout = float(request.args.get('timeout', 30))
+            except ValueError:
+                return jsonify({'error': 'Invalid input'}), 400
+            if not math.isfinite(timeout):
+                return jsonify({'error': 'Invalid input'}), 400
+            timeout = max(0.0, min(timeout, self.MAX_WAIT))
+
+            with self.sessions.open(game_id, write=False) as session:
+                session.wait_for_turn(player_id, timeout)
+                data = session.game.get_status()
+            return jsonify(data), 200
+
+        @self.app.route('/connect4/state', methods=['GET'], defaults=default)
+        @self.app.route('/connect4/<game_id>/state', methods=['GET'])
+        def get_state(game_id):
+            """
+            Get the status, board, last move and version of the game in one response.
+
+            The response carries an ETag derived from the game's version; a request
+            with a matching If-None-Match header gets an empty 304 response instead.
+
+            Returns:
+                JSON response with the game state, or 304 if it has not changed.
+            """
+            with self.sessions.open(game_id, write=False) as session:
+                etag = f"{session.game_id}-{session.game.version}"
+                if etag in request.if_none_match:
+                    response = self.app.response_class(status=304)
+                else:
+                    response = jsonify(session.game.get_state())
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        @self.app.route('/connect4/board', methods=['GET'], defaults=default)
+        @self.app.route('/connect4/<game_id>/board', methods=['GET'])
+        def get_board(game_id):
             """
             Get the current state of the game board.
 
             Returns:
                 JSON response with the board as a list.
             """
-            board = self.game.get_board()
-            board_list = board.flatten().tolist()
+            with self.sessions.open(game_id, write=False) as session:
+                board_list = session.game.get_board().flatten().tolist()
             return jsonify({'board': board_list})
 
-        @self.app.route('/connect4/make_move', methods=['POST'])
-        def make_move():
+        @self.app.route('/connect4/make_move', methods=['POST'], defaults=default)
+        @self.app.route('/connect4/<game_id>/make_move', methods=['POST'])
+        def make_move(game_id):
             """
             Make a move in the game.
 
             Request Body:
                 - player_id (str): Unique identifier for the player.
                 - column (int): Column where the player wants to place their piece.
+                - turn (int, optional): Turn number the move was chosen for; the move is
+                  rejected with 409 if the game has moved on since (compare-and-swap).
 
             Returns:
                 JSON response indicating success or failure of the move.
@@ -106,15 +251,126 @@ class Connect4Server:
             data = request.get_json()
             player_id = data.get('player_id')
             column = data.get('column')
+            turn = data.get('turn')
+            if turn is not None and (isinstance(turn, bool) or not isinstance(turn, int)):
+                return jsonify({'error': 'Invalid input'}), 400
 
-            if self.game.check_move(column, player_id):
+            with self.sessions.open(game_id) as session:
+                if turn is not None and turn != session.game.turn_counter:
+                    return jsonify({'error': 'Turn has changed'}), 409
+                valid = session.game.check_move(column, player_id, turn)
+                if valid:
+                    session.notify_changed()
+            if valid:
                 return jsonify({"success": True}), 200
             else:
                 return jsonify({'error': 'Invalid input'}), 400
 
+    def setup_websocket_routes(self) -> None:
+        """
+        Define the WebSocket route (`/connect4/ws`, `/connect4/<game_id>/ws`), requires flask-sock.
+
+        Protocol (JSON text messages):
+            Client -> Server:
+                - {"type": "register", "player_id": str}
+                - {"type": "move", "player_id": str, "column": int, "turn": int (optional, see make_move)}
+            Server -> Client:
+                - {"type": "state", "status": dict, "board": list, "last_move": dict, "version": int}
+                  full state, sent on connect and whenever changes were missed
+                - {"type": "delta", "move": dict, "status": dict, "version": int}
+                  one move (row, column, icon) and the new status
+                - {"type": "registered", "player_icon": str} reply to "register"
+                - {"type": "move_result", "success": bool} reply to "move", with the
+                  "move", "status" and "version" of the delta if it succeeded
+                - {"type": "error", "error": str}
+        """
+        sock = Sock(self.app)
+
+        def state_message(game: Connect4) -> dict:
+            return {'type': 'state', **game.get_state()}
+
+        def game_socket(ws, game_id):
+            if self.sessions.get(game_id) is None:
+                ws.send(json.dumps({'type': 'error', 'error': 'Game not found'}))
+                return
+
+            send_lock = threading.Lock()
+            closed = threading.Event()
+
+            def send(message: dict) -> None:
+                with send_lock:
+                    ws.send(json.dumps(message, default=str))   # player IDs are UUIDs
+
+            def push_changes() -> None:
+                version = None
+                while not closed.is_set() and ws.connected:
+                    try:
+                        with self.sessions.open(game_id, write=False) as session:
+                            if version is not None:
+                                session.wait_for_change(version, timeout=1)
+                            game = session.game
+                            if game.version == version:
+                                continue
+                            if version is not None and game.version == version + 1 and game.last_move is not None:
+                                message = {'type': 'delta', 'move': game.last_move,
+                                           'status': game.get_status(), 'version': game.version}
+                            else:
+                                message = state_message(game)
+                            version = game.version
+                    except GameNotFound:
+                        message = {'type': 'error', 'error': 'Game not found'}
+                        closed.set()
+                    try:
+                        send(message)
+                    except ConnectionClosed:    # the client left while the change was prepared
+                        return
+
+            pusher = threading.Thread(target=push_changes, daemon=True)
+            pusher.start()
+            try:
+                while True:
+                    try:
+                        data = json.loads(ws.receive())
+                    except (TypeError, ValueError):
+                        send({'type': 'error', 'error': 'Invalid input'})
+                        continue
+                    player_id = data.get('player_id')
+                    if not player_id:
+                        send({'type': 'error', 'error': 'Invalid input'})
+                    elif data.get('type') == 'register':
+                        with self.sessions.open(game_id) as session:
+                            icon = session.game.register_player(player_id)
+                            if icon:
+                                session.notify_changed()
+                        if icon:
+                            send({'type': 'registered', 'player_icon': icon})
+                        else:
+                            send({'type': 'error', 'error': 'Game Full'})
+                    elif data.get('type') == 'move':
+                        with self.sessions.open(game_id) as session:
+                            game = session.game
+                            valid = game.check_move(data.get('column'), player_id, data.get('turn'))
+                            if valid:
+                                session.notify_changed()
+                                # the delta of the move, so the mover sees it before the push arrives
+                                result = {'type': 'move_result', 'success': True, 'move': game.last_move,
+                                          'status': game.get_status(), 'version': game.version}
+                            else:
+                                result = {'type': 'move_result', 'success': False}
+                        send(result)
+                    else:
+                        send({'type': 'error', 'error': 'Invalid input'})
+            except GameNotFound:
+                send({'type': 'error', 'error': 'Game not found'})
+            finally:
+                closed.set()
+
+        sock.route('/connect4/ws', defaults={'game_id': self.DEFAULT_GAME_ID}, endpoint='game_socket_default')(game_socket)
+        sock.route('/connect4/<game_id>/ws')(game_socket)
+
     def run(self, debug: bool = True, host: str = '0.0.0.0', port: int = 5000) -> None:
         """
-        Start the Flask server.
+        Start the Flask development server.
 
         Parameters:
             debug (bool): Whether to run the server in debug mode.
@@ -126,7 +382,52 @@ class Connect4Server:
         print(f"Server is running on {local_ip}:{port}")
         self.app.run(debug=debug, host=host, port=port)
 
+    def serve(self, host: str = '0.0.0.0', port: int = 5000, threads: int = 16) -> None:
+        """
+        Start the server with the production WSGI server waitress (no debugger, no reloader).
+
+        Every request is handled by one of the worker threads, so a slow client only
+        blocks its own thread. Waiting (long-poll) requests each hold a thread while
+        they wait, so choose enough threads for all players. For several worker
+        processes, use a WSGI server like gunicorn with `wsgi.py` instead.
+
+        waitress can't hand the connection over to a WebSocket, so the server has to be
+        created with `websocket=False`; for the WebSocket endpoint use gunicorn with
+        threads (`wsgi.py`).
+
+        Parameters:
+            host (str): The host address to bind the server to.
+            port (int): The port to run the server on.
+            threads (int): Number of worker threads.
+
+        Raises:
+            RuntimeError: If the WebSocket endpoint is enabled.
+            ImportError: If the waitress module is not installed.
+        """
+        if self.websocket:
+            raise RuntimeError("waitress can't serve the WebSocket endpoint: create the server with "
+                               "websocket=False, or serve it with gunicorn (see wsgi.py)")
+        try:
+            from waitress import serve
+        except ImportError:
+            raise ImportError("waitress module is not installed, it is required for Connect4Server.serve.")
+        hostname = socket.gethostname()
+        local_ip = socket.gethostbyname(hostname)
+        print(f"Server is running on {local_ip}:{port} ({threads} threads)")
+        serve(self.app, host=host, port=port, threads=threads)
+
 
 if __name__ == '__main__':
-    server = Connect4Server()
-    server.run()
+    parser = argparse.ArgumentParser(description="Connect4 game server")
+    parser.add_argument('--production', action='store_true', help="serve with waitress instead of the Flask dev server (without the WebSocket endpoint)")
+    parser.add_argument('--threads', type=int, default=16, help="worker threads of the production server")
+    parser.add_argument('--store', default=None, help="SQLite file to keep the games in (default: in memory)")
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    # waitress can't serve WebSockets, the players use the REST endpoints then
+    server = Connect4Server(store_path=args.store, websocket=not args.production)
+    if args.production:
+        server.serve(port=args.port, threads=args.threads)
+    else:
+        server.run(port=args.port)
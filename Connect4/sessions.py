@@ -0,0 +1,585 @@
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+from game import Connect4
+
+
+class GameNotFound(KeyError):
+    """
+    Raised when a game ID does not belong to any session.
+    """
+
+
+class GameSession:
+    """
+    One Connect4 match hosted by the server.
+
+    Attributes:
+        game_id (str): Unique identifier of the session.
+        game (Connect4): The game played in this session.
+        lock (threading.RLock): Lock that has to be held while using the game.
+        condition (threading.Condition): Condition on `lock`, notified whenever the game changes.
+        created (float): Creation time (seconds since the epoch).
+        last_access (float): Time of the last request for this session.
+        persistent (bool): Persistent sessions are never evicted for being idle.
+    """
+
+    def __init__(self, game_id: str, persistent: bool = False) -> None:
+        """
+        Initialize a session with a new game.
+
+        Parameters:
+            game_id (str): Unique identifier of the session.
+            persistent (bool): Whether the session is exempt from idle eviction.
+        """
+        self.game_id: str = game_id
+        self.game: Connect4 = Connect4()
+        self.lock: threading.RLock = threading.RLock()
+        self.condition: threading.Condition = threading.Condition(self.lock)
+        self.created: float = time.time()
+        self.last_access: float = self.created
+        self.persistent: bool = persistent
+
+    def touch(self) -> None:
+        """
+        Mark the session as used right now.
+        """
+        self.last_access = time.time()
+
+    def notify_changed(self) -> None:
+        """
+        Wake up all requests waiting for this game to change (the lock must be held).
+        """
+        self.condition.notify_all()
+
+    def wait_for_turn(self, player_id: str, timeout: float) -> bool:
+        """
+        Block until it is the player's turn or the game is over (the lock must be held).
+
+        Parameters:
+            player_id (str): Unique identifier of the waiting player.
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if it is the player's turn or there is a winner, False on timeout.
+        """
+        def ready() -> bool:
+            status = self.game.get_status()
+            return status['winner'] is not None or str(status['active_id']) == str(player_id)
+
+        return self.condition.wait_for(ready, timeout)
+
+    def wait_for_change(self, version: int, timeout: float) -> bool:
+        """
+        Block until the game's version differs from the given one (the lock must be held).
+
+        Parameters:
+            version (int): The version the caller has already seen.
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the game changed, False on timeout.
+        """
+        return self.condition.wait_for(lambda: self.game.version != version, timeout)
+
+    def summary(self) -> dict[str, str | int | float | None]:
+        """
+        Get a short description of the session.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'game_id' (str): Identifier of the session.
+                - 'players' (int): Number of registered players (0-2).
+                - 'turn' (int): Current turn number.
+                - 'winner' (str | None): Icon of the winner, if any.
+                - 'idle' (float): Seconds since the last request.
+        """
+        return {
+            'game_id': self.game_id,
+            'players': sum(player is not None for player in (self.game.p1, self.game.p2)),
+            'turn': self.game.turn_counter,
+            'winner': self.game.winner,
+            'idle': time.time() - self.last_access,
+        }
+
+
+class SessionRegistry:
+    """
+    In-memory registry of all game sessions of a server.
+
+    The registry lock only protects the session dictionary; every session has
+    its own lock, so requests for different games never block each other.
+
+    Attributes:
+        idle_timeout (float): Sessions idle for longer than this (seconds) are evicted.
+        sweep_interval (float): Minimum time between two automatic eviction sweeps.
+    """
+
+    def __init__(self, idle_timeout: float = 3600, sweep_interval: float = 60) -> None:
+        """
+        Initialize an empty registry.
+
+        Parameters:
+            idle_timeout (float): Seconds after which an idle session is evicted.
+            sweep_interval (float): Minimum seconds between two automatic sweeps (see `maybe_evict`).
+        """
+        self.idle_timeout: float = idle_timeout
+        self.sweep_interval: float = sweep_interval
+        self._sessions: dict[str, GameSession] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._last_sweep: float = time.time()
+
+    def create(self, game_id: str | None = None, persistent: bool = False) -> GameSession:
+        """
+        Create a new session.
+
+        Parameters:
+            game_id (str | None): Identifier of the session; a random one is generated if None.
+            persistent (bool): Whether the session is exempt from idle eviction.
+
+        Returns:
+            GameSession: The new session.
+
+        Raises:
+            KeyError: If a session with this identifier already exists.
+        """
+        game_id = game_id or uuid.uuid4().hex
+        with self._lock:
+            if game_id in self._sessions:
+                raise KeyError(f"Game {game_id} already exists")
+            session = GameSession(game_id, persistent)
+            self._sessions[game_id] = session
+        return session
+
+    def get(self, game_id: str) -> GameSession | None:
+        """
+        Get a session and mark it as used.
+
+        Parameters:
+            game_id (str): Identifier of the session.
+
+        Returns:
+            GameSession: The session, or None if it does not exist.
+        """
+        with self._lock:
+            session = self._sessions.get(game_id)
+        if session is not None:
+            session.touch()
+        return session
+
+    @contextmanager
+    def open(self, game_id: str, write: bool = True) -> Iterator[GameSession]:
+        """
+        Use a session while holding its lock.
+
+        Parameters:
+            game_id (str): Identifier of the session.
+            write (bool): Whether the game may be changed. In memory every use holds the
+                session's lock either way; see `SQLiteSessionRegistry.open`.
+
+        Yields:
+            GameSession: The locked session.
+
+        Raises:
+            GameNotFound: If the session does not exist.
+        """
+        session = self.get(game_id)
+        if session is None:
+            raise GameNotFound(game_id)
+        with session.lock:
+            yield session
+
+    def delete(self, game_id: str) -> bool:
+        """
+        Remove a session.
+
+        Parameters:
+            game_id (str): Identifier of the session.
+
+        Returns:
+            bool: True if the session existed.
+        """
+        with self._lock:
+            return self._sessions.pop(game_id, None) is not None
+
+    def list_sessions(self) -> list[dict[str, str | int | float | None]]:
+        """
+        Describe all sessions.
+
+        Returns:
+            list[dict]: The `GameSession.summary()` of every session.
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [session.summary() for session in sessions]
+
+    def evict_idle(self) -> list[str]:
+        """
+        Remove all non-persistent sessions that have been idle for longer than `idle_timeout`.
+
+        Returns:
+            list[str]: Identifiers of the evicted sessions.
+        """
+        now = time.time()
+        with self._lock:
+            self._last_sweep = now
+            evicted = [
+                game_id for game_id, session in self._sessions.items()
+                if not session.persistent and now - session.last_access > self.idle_timeout
+            ]
+            for game_id in evicted:
+                del self._sessions[game_id]
+        return evicted
+
+    def maybe_evict(self) -> list[str]:
+        """
+        Evict idle sessions if the last sweep was more than `sweep_interval` ago.
+
+        Returns:
+            list[str]: Identifiers of the evicted sessions.
+        """
+        if time.time() - self._last_sweep < self.sweep_interval:
+            return []
+        return self.evict_idle()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteGameSession(GameSession):
+    """
+    Session of a `SQLiteSessionRegistry`, a copy of one stored game.
+
+    Sessions returned by `SQLiteSessionRegistry.open` hold the store's write lock
+    until the `with` block ends; then the game is written back if it changed.
+    Read-only sessions (`open(game_id, write=False)`) take no lock at all.
+    Waiting releases the lock and polls the stored version, since other worker
+    processes cannot notify a condition of this process.
+
+    Attributes:
+        (see GameSession; `lock` and `condition` are unused)
+    """
+
+    def __init__(self, registry: 'SQLiteSessionRegistry', game_id: str, game: Connect4, persistent: bool,
+                 created: float, last_access: float) -> None:
+        """
+        Initialize a session from a stored row.
+
+        Parameters:
+            registry (SQLiteSessionRegistry): The registry the session was loaded from.
+            game_id (str): Unique identifier of the session.
+            game (Connect4): The stored game.
+            persistent (bool): Whether the session is exempt from idle eviction.
+            created (float): Creation time (seconds since the epoch).
+            last_access (float): Time of the last request for this session.
+        """
+        super().__init__(game_id, persistent)
+        self.game = game
+        self.created = created
+        self.last_access = last_access
+        self._registry = registry
+        self._stored_version: int = game.version
+        self._writable: bool = True
+
+    def touch(self) -> None:
+        """
+        Mark the session as used right now (in the store).
+
+        The stored access time is only used for idle eviction, so it is written at
+        most every `SQLiteSessionRegistry.TOUCH_INTERVAL` seconds.
+        """
+        now = time.time()
+        if now - self.last_access >= self._registry.TOUCH_INTERVAL:
+            self.last_access = now
+            self._registry._touch(self.game_id, now)
+
+    def notify_changed(self) -> None:
+        """
+        Nothing to do, waiting requests poll the stored version.
+        """
+
+    def wait_for_change(self, version: int, timeout: float) -> bool:
+        """
+        Block until the game's version differs from the given one (inside `SQLiteSessionRegistry.open`).
+
+        Parameters:
+            version (int): The version the caller has already seen.
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the game changed, False on timeout.
+        """
+        if self.game.version == version:
+            self._registry._wait(self, version, timeout)
+        return self.game.version != version
+
+    def wait_for_turn(self, player_id: str, timeout: float) -> bool:
+        """
+        Block until it is the player's turn or the game is over (inside `SQLiteSessionRegistry.open`).
+
+        Parameters:
+            player_id (str): Unique identifier of the waiting player.
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if it is the player's turn or there is a winner, False on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.game.get_status()
+            if status['winner'] is not None or str(status['active_id']) == str(player_id):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self.wait_for_change(self.game.version, remaining)
+
+
+class SQLiteSessionRegistry(SessionRegistry):
+    """
+    Registry storing all game sessions in an SQLite file, shared by all worker processes.
+
+    Has the same interface as `SessionRegistry`, so a server can run behind a
+    multi-process WSGI server (e.g. gunicorn with several workers) and every worker
+    sees the same games. `open` serializes all changes with SQLite's write lock
+    (`BEGIN IMMEDIATE`); read-only requests (`open(game_id, write=False)`) read
+    the last committed game without it, so they never queue behind the writers.
+    Games are stored pickled, together with their version, so waiting requests
+    only poll one integer. The access time of a game is written with its changes,
+    otherwise at most every `TOUCH_INTERVAL` seconds.
+
+    Attributes:
+        path (str): Path of the SQLite file.
+        poll_interval (float): Seconds between two checks of a waiting request.
+        (see SessionRegistry for the remaining attributes)
+    """
+    TOUCH_INTERVAL: float = 5     # seconds between two writes of an unchanged game's access time
+
+    def __init__(self, path: str = 'connect4_games.sqlite', idle_timeout: float = 3600,
+                 sweep_interval: float = 60, poll_interval: float = 0.05) -> None:
+        """
+        Open (and if necessary create) the store.
+
+        Parameters:
+            path (str): Path of the SQLite file.
+            idle_timeout (float): Seconds after which an idle session is evicted.
+            sweep_interval (float): Minimum seconds between two automatic sweeps (see `maybe_evict`).
+            poll_interval (float): Seconds between two checks of a waiting request.
+        """
+        super().__init__(idle_timeout, sweep_interval)
+        self.path: str = path
+        self.poll_interval: float = poll_interval
+        self._local = threading.local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS games ('
+            'game_id TEXT PRIMARY KEY, game BLOB NOT NULL, version INTEGER NOT NULL, '
+            'persistent INTEGER NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get the connection of the calling thread (SQLite connections must not be shared between threads).
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')       # readers never block the writer
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _row_to_session(self, row: tuple) -> SQLiteGameSession:
+        """
+        Build a session from a (game_id, game, persistent, created, last_access) row.
+        """
+        game_id, game, persistent, created, last_access = row
+        return SQLiteGameSession(self, game_id, pickle.loads(game), bool(persistent), created, last_access)
+
+    def _load(self, game_id: str) -> SQLiteGameSession:
+        """
+        Load a session.
+
+        Raises:
+            GameNotFound: If the session does not exist.
+        """
+        row = self._connection().execute(
+            'SELECT game_id, game, persistent, created, last_access FROM games WHERE game_id = ?', (game_id,)
+        ).fetchone()
+        if row is None:
+            raise GameNotFound(game_id)
+        return self._row_to_session(row)
+
+    def _save(self, session: SQLiteGameSession) -> None:
+        """
+        Write the session's game back to the store if it changed, otherwise just touch it.
+
+        Raises:
+            RuntimeError: If the game of a read-only session was changed.
+        """
+        if session.game.version == session._stored_version:
+            session.touch()
+        elif not session._writable:
+            raise RuntimeError(f"Game {session.game_id} was changed in a read-only session")
+        else:
+            session.last_access = time.time()
+            self._connection().execute(
+                'UPDATE games SET game = ?, version = ?, last_access = ? WHERE game_id = ?',
+                (pickle.dumps(session.game), session.game.version, session.last_access, session.game_id)
+            )
+            session._stored_version = session.game.version
+
+    def _touch(self, game_id: str, last_access: float) -> None:
+        """
+        Update the access time of a session.
+        """
+        self._connection().execute('UPDATE games SET last_access = ? WHERE game_id = ?', (last_access, game_id))
+
+    def _wait(self, session: SQLiteGameSession, version: int, timeout: float) -> None:
+        """
+        Release the write lock, poll until the stored version changes or the timeout
+        has passed, then take the lock again and reload the session's game
+        (read-only sessions hold no lock and only reload).
+        """
+        connection = self._connection()
+        if session._writable:
+            self._save(session)
+            connection.execute('COMMIT')
+        deadline = time.monotonic() + timeout
+        while True:
+            row = connection.execute('SELECT version FROM games WHERE game_id = ?', (session.game_id,)).fetchone()
+            remaining = deadline - time.monotonic()
+            if row is None or row[0] != version or remaining <= 0:
+                break
+            time.sleep(min(self.poll_interval, remaining))
+        if session._writable:
+            connection.execute('BEGIN IMMEDIATE')
+        stored = self._load(session.game_id)
+        session.game = stored.game
+        session._stored_version = stored.game.version
+
+    def create(self, game_id: str | None = None, persistent: bool = False) -> SQLiteGameSession:
+        """
+        Create a new session.
+
+        Parameters:
+            game_id (str | None): Identifier of the session; a random one is generated if None.
+            persistent (bool): Whether the session is exempt from idle eviction.
+
+        Returns:
+            SQLiteGameSession: The new session.
+
+        Raises:
+            KeyError: If a session with this identifier already exists.
+        """
+        game_id = game_id or uuid.uuid4().hex
+        game = Connect4()
+        now = time.time()
+        try:
+            self._connection().execute(
+                'INSERT INTO games (game_id, game, version, persistent, created, last_access) VALUES (?, ?, ?, ?, ?, ?)',
+                (game_id, pickle.dumps(game), game.version, int(persistent), now, now)
+            )
+        except sqlite3.IntegrityError:
+            raise KeyError(f"Game {game_id} already exists")
+        return SQLiteGameSession(self, game_id, game, persistent, now, now)
+
+    def get(self, game_id: str) -> SQLiteGameSession | None:
+        """
+        Get a copy of a session and mark it as used.
+
+        Parameters:
+            game_id (str): Identifier of the session.
+
+        Returns:
+            SQLiteGameSession: The session, or None if it does not exist.
+        """
+        try:
+            session = self._load(game_id)
+        except GameNotFound:
+            return None
+        session.touch()
+        return session
+
+    @contextmanager
+    def open(self, game_id: str, write: bool = True) -> Iterator[SQLiteGameSession]:
+        """
+        Use a session while holding the store's write lock; changes are saved at the end.
+
+        Parameters:
+            game_id (str): Identifier of the session.
+            write (bool): Whether the game may be changed. Read-only sessions are a copy
+                of the last committed game and take no lock.
+
+        Yields:
+            SQLiteGameSession: The session (locked unless read-only).
+
+        Raises:
+            GameNotFound: If the session does not exist.
+            RuntimeError: If the game of a read-only session was changed.
+        """
+        if not write:
+            session = self._load(game_id)
+            session._writable = False
+            yield session
+            self._save(session)
+            return
+
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            session = self._load(game_id)
+            yield session
+            self._save(session)
+        except BaseException:
+            # `_wait` commits and begins again, so a failure in between leaves no transaction open
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def delete(self, game_id: str) -> bool:
+        """
+        Remove a session.
+
+        Parameters:
+            game_id (str): Identifier of the session.
+
+        Returns:
+            bool: True if the session existed.
+        """
+        cursor = self._connection().execute('DELETE FROM games WHERE game_id = ?', (game_id,))
+        return cursor.rowcount > 0
+
+    def list_sessions(self) -> list[dict[str, str | int | float | None]]:
+        """
+        Describe all sessions.
+
+        Returns:
+            list[dict]: The `GameSession.summary()` of every session.
+        """
+        rows = self._connection().execute(
+            'SELECT game_id, game, persistent, created, last_access FROM games'
+        ).fetchall()
+        return [self._row_to_session(row).summary() for row in rows]
+
+    def evict_idle(self) -> list[str]:
+        """
+        Remove all non-persistent sessions that have been idle for longer than `idle_timeout`.
+
+        Returns:
+            list[str]: Identifiers of the evicted sessions.
+        """
+        now = time.time()
+        self._last_sweep = now
+        rows = self._connection().execute(
+            'DELETE FROM games WHERE persistent = 0 AND last_access < ? RETURNING game_id', (now - self.idle_timeout,)
+        ).fetchall()
+        return [game_id for game_id, in rows]
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM games').fetchone()[0]
@@ -6,12 +6,16 @@ Installation of all required packages to Connect4
 setup(
     name='Connect4',
     version='1.0.0',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests']),
     install_requires=[
         'Flask',                # General Flask dependency
         'flask-swagger-ui',     # General Swagger UI for Flask
+        'flask-sock',           # WebSocket endpoint of the server
+        'httpx',                # Async HTTP client of the asyncio players
         'requests',             # Requests library for HTTP requests
+        'websocket-client',     # WebSocket player
         'numpy',                # Numpy for numerical operations
+        'waitress',             # Production WSGI server (Connect4Server.serve)
         'sense-hat'             # For the Raspi - Part
     ],
     python_requires='>=3.10, <4',
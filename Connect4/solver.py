@@ -0,0 +1,296 @@
+import sqlite3
+
+from bitboard import BitBoard
+from transposition import TranspositionTable, LOWER_BOUND, UPPER_BOUND
+
+
+WIDTH: int = BitBoard.COLS
+HEIGHT: int = BitBoard.ROWS
+CELLS: int = WIDTH * HEIGHT
+STRIDE: int = BitBoard.COL_BITS                     # bits per column, incl. the sentinel bit
+BOTTOM_MASK: int = sum(1 << (col * STRIDE) for col in range(WIDTH))
+BOARD_MASK: int = BOTTOM_MASK * BitBoard.FULL_COLUMN
+COLUMN_MASKS: list[int] = [BitBoard.FULL_COLUMN << (col * STRIDE) for col in range(WIDTH)]
+
+# Bounds of any score: nobody can win before placing their 4th piece
+MIN_SCORE: int = -(CELLS // 2) + 3
+MAX_SCORE: int = (CELLS + 1) // 2 - 3
+
+
+def winning_positions(position: int, mask: int) -> int:
+    """
+    Get all empty cells that would complete four in a row for a player.
+
+    Parameters:
+        position (int): Bitmask of the player's pieces.
+        mask (int): Bitmask of all occupied cells.
+
+    Returns:
+        int: Bitmask of the empty cells (reachable or not) that win for the player.
+    """
+    # vertical
+    r = (position << 1) & (position << 2) & (position << 3)
+
+    # horizontal and both diagonals
+    for shift in (STRIDE, STRIDE - 1, STRIDE + 1):
+        p = (position << shift) & (position << 2 * shift)
+        r |= p & (position << 3 * shift)
+        r |= p & (position >> shift)
+        p = (position >> shift) & (position >> 2 * shift)
+        r |= p & (position << shift)
+        r |= p & (position >> 3 * shift)
+
+    return r & (BOARD_MASK ^ mask)
+
+
+def _to_signed(key: int) -> int:
+    """
+    Map a 64-bit key onto SQLite's signed 64-bit integers.
+    """
+    return key - (1 << 63)
+
+
+class Solver:
+    """
+    Perfect-play solver for the 7x8 Connect 4 board.
+
+    Works on the bitboard layout of `BitBoard` and uses negamax with alpha-beta
+    pruning, null-window searches (the score is found by a binary search over
+    zero-width windows), pruning of moves that lose immediately, move ordering by
+    the number of threats created and a transposition table. Solved positions are
+    stored in an SQLite file so the work survives restarts.
+
+    Scores are given from the view of the player to move:
+        - positive: the player wins; (CELLS + 1 - moves) // 2 when winning with the next piece,
+          one less for every pair of moves later
+        - 0: draw with perfect play
+        - negative: the player loses, the same way mirrored
+
+    Attributes:
+        table (TranspositionTable): Transposition table for the bounds found during the search.
+        cache_path (str | None): Path of the on-disk position -> score cache, None for no cache.
+        nodes (int): Number of nodes visited by the last solve.
+    """
+
+    def __init__(self, cache_path: str | None = 'solver_cache.sqlite', table_mb: float = 256) -> None:
+        """
+        Initialize the solver.
+
+        Parameters:
+            cache_path (str | None): Path of the SQLite position cache, None to disable it.
+            table_mb (float): Memory cap of the transposition table in megabytes.
+        """
+        self.table: TranspositionTable = TranspositionTable(table_mb)
+        self.cache_path: str | None = cache_path
+        self.nodes: int = 0
+        center = (WIDTH - 1) / 2
+        self._column_order: list[int] = sorted(range(WIDTH), key=lambda col: abs(col - center))
+
+        self._db = None
+        if cache_path is not None:
+            self._db = sqlite3.connect(cache_path)
+            self._db.execute('CREATE TABLE IF NOT EXISTS positions (key INTEGER PRIMARY KEY, score INTEGER NOT NULL)')
+            self._db.commit()
+
+    def __enter__(self) -> 'Solver':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the on-disk cache.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def solve(self, bb: BitBoard) -> int:
+        """
+        Compute the exact score of a position.
+
+        Parameters:
+            bb (BitBoard): The position (no player may have won yet).
+
+        Returns:
+            int: The score from the view of the player to move.
+        """
+        key = bb.key()
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        current = bb.o_mask if bb.moves % 2 else bb.x_mask
+        score = self._solve(current, bb.mask, bb.moves)
+        self._cache_put(key, score)
+        return score
+
+    def analyze(self, bb: BitBoard) -> list[int | None]:
+        """
+        Compute the score of every move in a position.
+
+        Parameters:
+            bb (BitBoard): The position (no player may have won yet).
+
+        Returns:
+            list[int | None]: Score of each column from the view of the player to move,
+                None for full columns.
+        """
+        scores = []
+        for col in range(WIDTH):
+            if not bb.can_play(col):
+                scores.append(None)
+                continue
+            mover_is_x = bb.moves % 2 == 0
+            bb.play(col)
+            if BitBoard.has_four(bb.x_mask if mover_is_x else bb.o_mask):
+                scores.append((CELLS + 2 - bb.moves) // 2)
+            elif bb.moves == CELLS:
+                scores.append(0)
+            else:
+                scores.append(-self.solve(bb))
+            bb.undo(col)
+        return scores
+
+    def best_move(self, bb: BitBoard) -> int:
+        """
+        Find a move with the best score (the most central one on ties).
+
+        Parameters:
+            bb (BitBoard): The position (no player may have won yet).
+
+        Returns:
+            int: The best column.
+        """
+        scores = self.analyze(bb)
+        return max((col for col in self._column_order if scores[col] is not None), key=lambda col: scores[col])
+
+    def grade_move(self, bb: BitBoard, col: int) -> int:
+        """
+        Grade a move against perfect play.
+
+        Parameters:
+            bb (BitBoard): The position the move was played in.
+            col (int): The column that was played.
+
+        Returns:
+            int: How much worse the move is than the best move (0 for a perfect move).
+
+        Raises:
+            ValueError: If the column does not exist or is full.
+        """
+        if not 0 <= col < WIDTH or not bb.can_play(col):
+            raise ValueError(f"Column {col} can't be played")
+        scores = self.analyze(bb)
+        return max(score for score in scores if score is not None) - scores[col]
+
+    def _solve(self, current: int, mask: int, moves: int) -> int:
+        """
+        Find the exact score with a sequence of null-window searches.
+        """
+        self.nodes = 0
+        if winning_positions(current, mask) & self._possible(mask):
+            return (CELLS + 1 - moves) // 2
+
+        low = max(-((CELLS - moves) // 2), MIN_SCORE)
+        high = min((CELLS + 1 - moves) // 2, MAX_SCORE)
+        while low < high:
+            med = low + (high - low) // 2
+            if med <= 0 and int(low / 2) < med:
+                med = int(low / 2)
+            elif med >= 0 and int(high / 2) > med:
+                med = int(high / 2)
+            score = self._negamax(current, mask, moves, med, med + 1)
+            if score <= med:
+                high = score
+            else:
+                low = score
+        return low
+
+    def _negamax(self, current: int, mask: int, moves: int, alpha: int, beta: int) -> int:
+        """
+        Negamax with alpha-beta pruning; the player to move must not be able to win immediately.
+        """
+        self.nodes += 1
+        possible = self._possible(mask)
+        opponent_win = winning_positions(current ^ mask, mask)
+        forced = possible & opponent_win
+        if forced:
+            if forced & (forced - 1):
+                return -((CELLS - moves) // 2)     # two threats at once can't both be blocked
+            possible = forced
+        possible &= ~(opponent_win >> 1)          # never play below an opponent's winning cell
+        if not possible:
+            return -((CELLS - moves) // 2)
+        if moves >= CELLS - 2:
+            return 0
+
+        low = -((CELLS - 2 - moves) // 2)
+        if alpha < low:
+            alpha = low
+            if alpha >= beta:
+                return alpha
+        high = (CELLS - 1 - moves) // 2
+        if beta > high:
+            beta = high
+            if alpha >= beta:
+                return beta
+
+        key = current + mask
+        entry = self.table.probe(key)
+        if entry is not None:
+            if entry.flag == LOWER_BOUND:
+                if alpha < entry.value:
+                    alpha = entry.value
+                    if alpha >= beta:
+                        return alpha
+            elif beta > entry.value:
+                beta = entry.value
+                if alpha >= beta:
+                    return beta
+
+        # try the moves creating the most threats first, the center first on ties
+        candidates = []
+        for col in self._column_order:
+            move = possible & COLUMN_MASKS[col]
+            if move:
+                candidates.append((winning_positions(current | move, mask).bit_count(), move))
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        depth = CELLS - moves
+        for _, move in candidates:
+            score = -self._negamax(current ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                self.table.store(key, depth, LOWER_BOUND, score)
+                return score
+            if score > alpha:
+                alpha = score
+
+        self.table.store(key, depth, UPPER_BOUND, alpha)
+        return alpha
+
+    @staticmethod
+    def _possible(mask: int) -> int:
+        """
+        Get the cells where a piece can be dropped.
+        """
+        return (mask + BOTTOM_MASK) & BOARD_MASK
+
+    def _cache_get(self, key: int) -> int | None:
+        """
+        Look up a solved position in the on-disk cache.
+        """
+        if self._db is None:
+            return None
+        row = self._db.execute('SELECT score FROM positions WHERE key = ?', (_to_signed(key),)).fetchone()
+        return None if row is None else row[0]
+
+    def _cache_put(self, key: int, score: int) -> None:
+        """
+        Store a solved position in the on-disk cache.
+        """
+        if self._db is None:
+            return
+        self._db.execute('INSERT OR REPLACE INTO positions (key, score) VALUES (?, ?)', (_to_signed(key), score))
+        self._db.commit()
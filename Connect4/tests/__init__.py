@@ -0,0 +1,3 @@
+"""
+Tests of the Connect4 game, server and bot engines (run `python -m pytest` in this folder).
+"""
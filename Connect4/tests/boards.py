@@ -0,0 +1,53 @@
+import random
+
+import numpy as np
+
+from bitboard import BitBoard
+
+
+def random_game(rng: random.Random, moves: int, avoid_wins: bool = False) -> BitBoard | None:
+    """
+    Play random moves from the empty board.
+
+    Parameters:
+        rng (random.Random): Source of the moves.
+        moves (int): Number of pieces to drop.
+        avoid_wins (bool): Never play a move that completes four in a row.
+
+    Returns:
+        BitBoard | None: The position, or None if no legal (non-winning) move was left on the way.
+    """
+    bb = BitBoard()
+    for _ in range(moves):
+        columns = [col for col in range(BitBoard.COLS) if bb.can_play(col)]
+        rng.shuffle(columns)
+        for col in columns:
+            mover_is_x = bb.moves % 2 == 0
+            bb.play(col)
+            if not avoid_wins or not BitBoard.has_four(bb.x_mask if mover_is_x else bb.o_mask):
+                break
+            bb.undo(col)
+        else:
+            return None
+    return bb
+
+
+def brute_force_winner(board: np.ndarray) -> str | None:
+    """
+    Walk from every cell in every direction, 'X' first.
+
+    Parameters:
+        board (np.ndarray): A string board containing 'X', 'O' or ''.
+
+    Returns:
+        str | None: The icon with four in a row, or None.
+    """
+    rows, cols = board.shape
+    for icon in ('X', 'O'):
+        for row in range(rows):
+            for col in range(cols):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    cells = [(row + i * d_row, col + i * d_col) for i in range(4)]
+                    if all(0 <= r < rows and 0 <= c < cols and board[r, c] == icon for r, c in cells):
+                        return icon
+    return None
@@ -0,0 +1,38 @@
+import random
+import threading
+
+import numpy as np
+import pytest
+
+from bitboard import BitBoard
+from tests.boards import random_game
+
+
+@pytest.fixture
+def rng() -> random.Random:
+    return random.Random(1234)
+
+
+@pytest.fixture
+def random_boards(rng: random.Random) -> list[np.ndarray]:
+    """
+    300 string boards after a random number of random moves (wins included).
+    """
+    return [random_game(rng, rng.randint(0, BitBoard.ROWS * BitBoard.COLS)).to_array() for _ in range(300)]
+
+
+@pytest.fixture
+def live_server():
+    """
+    A `Connect4Server` on a free local port in a background thread; yields its URL.
+    """
+    from werkzeug.serving import make_server
+
+    from server import Connect4Server
+
+    http_server = make_server('127.0.0.1', 0, Connect4Server().app, threaded=True)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{http_server.server_port}'
+    http_server.shutdown()
+    thread.join()
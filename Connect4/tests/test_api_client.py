@@ -0,0 +1,58 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from api_client import GameClient
+
+
+@pytest.fixture
+def flaky_server():
+    """
+    A server answering the first two requests of every method with 503; yields (URL, requests seen per method).
+    """
+    seen = {'GET': 0, 'POST': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def answer(self):
+            seen[self.command] += 1
+            self.send_response(503 if seen[self.command] <= 2 else 200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        do_GET = do_POST = answer
+
+        def log_message(self, *args):
+            pass
+
+    http_server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{http_server.server_port}', seen
+    http_server.shutdown()
+    thread.join()
+
+
+def test_reads_are_retried_moves_are_not(flaky_server):
+    url, seen = flaky_server
+    with GameClient(url, 'game', backoff=0) as client:
+        assert client.get('status').status_code == 200
+        assert seen['GET'] == 3
+        # a move is sent once, a retry could place a second piece
+        assert client.post('make_move', json={'player_id': 'p1', 'column': 0}).status_code == 503
+        assert seen['POST'] == 1
+
+
+def test_unchanged_state_costs_a_304(live_server):
+    game_id = requests.post(f'{live_server}/connect4/games').json()['game_id']
+    with GameClient(live_server, game_id) as client:
+        statuses = []
+        client.session.hooks['response'].append(lambda response, *args, **kwargs: statuses.append(response.status_code))
+        for player_id in ('p1', 'p2'):
+            client.post('register', json={'player_id': player_id})
+        state = client.get_state()
+        assert client.get_state() is state
+        client.post('make_move', json={'player_id': 'p1', 'column': 0})
+        assert client.get_state()['status']['turn'] == 1
+        assert statuses == [200, 200, 200, 304, 200, 200]
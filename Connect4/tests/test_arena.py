@@ -0,0 +1,43 @@
+"""
+Tests of the arena and its agents.
+"""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from arena import AGENTS, BatchAgent, EvaluatorAgent, RandomAgent, parse_agent, run_arena
+from bitboard import BitBoard
+
+
+def test_agents_are_registered():
+    assert {'random', 'negamax', 'batch', 'evaluator', 'smp', 'strategy'} <= set(AGENTS)
+
+
+def test_parse_strategy_agent():
+    agent = parse_agent('strategy:name=player_async.random_strategy')()
+    board = np.full((BitBoard.ROWS, BitBoard.COLS), '', dtype=str)
+    assert 0 <= agent(board, 'X') < 8
+
+
+def test_batch_agent_beats_random():
+    report = run_arena(partial(BatchAgent, depth=2, heuristic=1), RandomAgent, games=4, processes=2)
+    assert report.games == 4
+    assert report.wins >= 3
+
+
+def test_pool_agents_play_serially():
+    report = run_arena(partial(EvaluatorAgent, depth=1, processes=1), RandomAgent, games=2)
+    assert report.games == 2
+    with pytest.raises(ValueError):
+        run_arena(partial(EvaluatorAgent, depth=1, processes=1), RandomAgent, games=2, processes=2)
+
+
+def test_parse_agent_flags():
+    assert parse_agent('batch:depth=2,heuristic=true').keywords == {'depth': 2, 'heuristic': True}
+    assert parse_agent('batch:heuristic=False').keywords == {'heuristic': False}
+
+
+def test_at_least_one_game():
+    with pytest.raises(ValueError):
+        run_arena(RandomAgent, RandomAgent, games=0, processes=1)
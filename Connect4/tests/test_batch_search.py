@@ -0,0 +1,27 @@
+import pytest
+
+from batch_search import BatchSearch
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from move_class_v2 import MoveEvaluator
+from tests.boards import random_game
+
+
+@pytest.mark.parametrize('heuristic', [None, HeuristicEvaluator()])
+def test_scores_match_move_evaluator(rng, heuristic):
+    positions = []
+    while len(positions) < 6:
+        bb = random_game(rng, rng.randint(2, 40), avoid_wins=True)
+        if bb is not None:
+            positions.append(bb)
+    with MoveEvaluator(3, BitBoard.COLS, None, processes=1, heuristic=heuristic) as evaluator:
+        for bb in positions:
+            board, icon = bb.to_array(), bb.current_icon()
+            other = 'O' if icon == 'X' else 'X'
+            evaluator.evaluate_moves(board.copy(), icon, other)
+            expected = {move['column']: move['score'] for move in evaluator.stats.root_moves}
+            # also without merging transpositions, and split into small batches
+            for merge, batch_size in ((True, 1 << 16), (False, 1 << 16), (True, 64)):
+                search = BatchSearch(3, heuristic=heuristic, merge_transpositions=merge, batch_size=batch_size)
+                search.evaluate_moves(board.copy(), icon, other)
+                assert search.scores == expected
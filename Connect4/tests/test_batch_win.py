@@ -0,0 +1,21 @@
+import numpy as np
+
+from batch_win import bitboard_arrays, detect_wins, detect_wins_bitboards, stack_boards, winner_icons
+from bitboard import BitBoard
+from board_codec import ICON_CODES
+from lines import find_winner
+
+
+def test_detect_wins_matches_find_winner(random_boards):
+    expected = [ICON_CODES[find_winner(board)] if find_winner(board) else 0 for board in random_boards]
+    codes = stack_boards(random_boards)
+    assert detect_wins(codes).tolist() == expected
+    assert winner_icons(codes).tolist() == [find_winner(board) or '' for board in random_boards]
+    x_masks, o_masks = bitboard_arrays([BitBoard.from_array(board) for board in random_boards])
+    assert detect_wins_bitboards(x_masks, o_masks).tolist() == expected
+
+
+def test_single_board():
+    board = np.full((BitBoard.ROWS, BitBoard.COLS), '', dtype=str)
+    board[-1, 2:6] = 'O'
+    assert detect_wins(stack_boards([board])[0]).tolist() == [ICON_CODES['O']]
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from bitboard import BitBoard
+
+
+def test_array_round_trip(random_boards):
+    for board in random_boards:
+        bb = BitBoard.from_array(board)
+        assert np.array_equal(bb.to_array(), board)
+        assert bb.moves == np.count_nonzero(board != '')
+        assert bb.heights == [int(np.count_nonzero(board[:, col] != '')) for col in range(BitBoard.COLS)]
+
+
+def test_play_undo_restores_position(rng):
+    bb = BitBoard()
+    history = []
+    for _ in range(30):
+        col = rng.choice([col for col in range(BitBoard.COLS) if bb.can_play(col)])
+        history.append((bb.copy(), bb.key()))
+        bb.play(col)
+        assert bb.key() != history[-1][1]
+        bb.undo(col)
+        assert bb == history[-1][0] and bb.key() == history[-1][1]
+        bb.play(col)
+
+
+def test_from_array_rejects_floating_piece():
+    board = np.full((BitBoard.ROWS, BitBoard.COLS), '', dtype=str)
+    board[0, 3] = 'X'
+    with pytest.raises(ValueError):
+        BitBoard.from_array(board)
@@ -0,0 +1,62 @@
+import asyncio
+
+from coordinator_async import Coordinator_Async, play_games
+
+
+class ScriptedPlayer:
+    """
+    Stand-in for `Player_Async` that answers status requests from a script and records its calls.
+    """
+
+    def __init__(self, statuses: list[dict]) -> None:
+        self.id = 'me'
+        self.icon = None
+        self.calls = []
+        self._statuses = iter(statuses)
+
+    async def register_in_game(self) -> str:
+        self.calls.append('register')
+        return 'O'
+
+    async def get_game_status(self) -> dict:
+        self.calls.append('status')
+        return next(self._statuses)
+
+    async def wait_for_turn(self) -> dict:
+        self.calls.append('wait')
+        return next(self._statuses)
+
+    async def visualize(self) -> None:
+        pass
+
+    async def make_move(self) -> int:
+        self.calls.append('move')
+        return 0
+
+    async def celebrate_win(self) -> None:
+        self.calls.append('celebrate')
+
+
+def test_waits_for_its_turn_and_detects_a_draw():
+    player = ScriptedPlayer([
+        {'active_id': 'other', 'turn': 54, 'winner': None},
+        {'active_id': 'me', 'turn': 55, 'winner': None},
+        {'active_id': 'other', 'turn': Coordinator_Async.CELLS, 'winner': None},
+    ])
+    assert asyncio.run(Coordinator_Async(player).play()) == 'draw'
+    assert player.icon == 'O'
+    assert player.calls == ['register', 'status', 'wait', 'move', 'status']
+
+
+def test_reports_the_winner():
+    player = ScriptedPlayer([{'active_id': 'other', 'turn': 20, 'winner': 'X'}])
+    player.icon = 'O'
+    coordinator = Coordinator_Async(player)
+    assert asyncio.run(coordinator.play()) == 'X' and coordinator.result == 'X'
+    assert player.calls == ['status', 'celebrate']
+
+
+def test_play_games_on_a_server(live_server):
+    results = asyncio.run(play_games([live_server], n_games=3))
+    assert len(results) == 3
+    assert set(results) <= {'X', 'O', 'draw'}
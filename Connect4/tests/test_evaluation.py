@@ -0,0 +1,21 @@
+from bitboard import BitBoard
+from evaluation import O_ROWS_MASK, X_ROWS_MASK, HeuristicEvaluator
+
+
+def _row(row, cols):
+    return sum(1 << (col * BitBoard.COL_BITS + row) for col in cols)
+
+
+def test_row_parity_masks():
+    # on the 7-row board 'X' gets the 2nd, 4th and 6th row from the bottom
+    assert X_ROWS_MASK == sum(_row(row, range(BitBoard.COLS)) for row in (1, 3, 5))
+    assert O_ROWS_MASK == sum(_row(row, range(BitBoard.COLS)) for row in (0, 2, 4, 6))
+
+
+def test_parity_bonus_follows_the_masks():
+    plain, weighted = HeuristicEvaluator(parity=0), HeuristicEvaluator(parity=8)
+    for row, x_bonus in ((1, 8), (0, 0)):
+        # three in a row, the fourth cell of the row is the only threat
+        pieces = _row(row, (0, 1, 2))
+        assert weighted.evaluate(pieces, 0, True) - plain.evaluate(pieces, 0, True) == x_bonus
+        assert weighted.evaluate(pieces, 0, False) - plain.evaluate(pieces, 0, False) == 8 - x_bonus
@@ -0,0 +1,49 @@
+import threading
+
+from bitboard import BitBoard
+from game import Connect4
+from tests.boards import brute_force_winner
+
+
+def test_winner_after_every_move(rng):
+    for _ in range(30):
+        game = Connect4()
+        game.register_player('p1')
+        game.register_player('p2')
+        while game.winner is None and game.turn_counter < game.board.size:
+            player_id = 'p1' if game.turn_counter % 2 == 0 else 'p2'
+            column = rng.choice([col for col in range(game.board.shape[1]) if game.board[0, col] == ''])
+            assert game.check_move(column, player_id, game.turn_counter)
+            # only the lines through the new piece are checked, the result must match a full scan
+            assert game.winner == brute_force_winner(game.board)
+
+
+def test_detect_win_at_every_piece(random_boards):
+    for board in random_boards:
+        game = Connect4()
+        game.board = board
+        game.bitboard = BitBoard.from_array(board)
+        winners = {game.detect_win_at(row, col) for row, col in zip(*(board != '').nonzero())} - {None}
+        # random boards can hold lines of both players, the full scan reports 'X' first
+        assert (brute_force_winner(board) is None) == (not winners)
+
+
+def test_concurrent_moves_place_one_piece():
+    game = Connect4()
+    game.register_player('p1')
+    game.register_player('p2')
+    barrier = threading.Barrier(8)
+    results = []
+
+    def move(column):
+        barrier.wait()
+        results.append(game.check_move(column, 'p1', 0))
+
+    threads = [threading.Thread(target=move, args=(column,)) for column in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # the same turn was sent eight times at once, only one move may be applied
+    assert results.count(True) == 1
+    assert (game.board != '').sum() == 1 and game.turn_counter == 1
@@ -0,0 +1,33 @@
+from bitboard import BitBoard
+from game import Connect4
+from lines import LINES, LINES_THROUGH, find_winner, winner_at
+from tests.boards import brute_force_winner
+
+
+def test_line_index():
+    assert len(LINES) == 107
+    assert max(len(LINES_THROUGH[row][col]) for row in range(BitBoard.ROWS) for col in range(BitBoard.COLS)) == 16
+
+
+def test_find_winner_matches_brute_force(random_boards):
+    for board in random_boards:
+        assert find_winner(board) == brute_force_winner(board)
+        assert BitBoard.from_array(board).winner() == brute_force_winner(board)
+
+
+def test_win_through_cell_matches_find_winner(random_boards):
+    for board in random_boards:
+        game = Connect4()
+        game.board = board
+        game.bitboard = BitBoard.from_array(board)
+        found = set()
+        for row in range(BitBoard.ROWS):
+            for col in range(BitBoard.COLS):
+                icon = winner_at(board, row, col)
+                assert game.detect_win_at(row, col) == icon
+                if icon is not None:
+                    found.add(icon)
+        winner = find_winner(board)
+        assert (winner is None) == (not found)
+        if winner is not None:
+            assert winner in found
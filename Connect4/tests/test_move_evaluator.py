@@ -0,0 +1,47 @@
+from bitboard import BitBoard
+from evaluation import HeuristicEvaluator
+from move_class_v2 import MoveEvaluator
+from transposition import SharedTranspositionTable, TranspositionTable
+from tests.boards import random_game
+
+
+def _scores(evaluator, board, icon):
+    evaluator.evaluate_moves(board, icon, 'O' if icon == 'X' else 'X')
+    return {move['column']: move['score'] for move in evaluator.stats.root_moves}
+
+
+def test_table_does_not_change_heuristic_scores(rng):
+    boards = [bb for bb in (random_game(rng, rng.randint(4, 20), avoid_wins=True) for _ in range(3)) if bb]
+    shared = SharedTranspositionTable(4)
+    try:
+        with MoveEvaluator(3, BitBoard.COLS, None, processes=1, heuristic=HeuristicEvaluator()) as plain, \
+                MoveEvaluator(3, BitBoard.COLS, None, TranspositionTable(4), processes=1,
+                              heuristic=HeuristicEvaluator()) as cached, \
+                MoveEvaluator(3, BitBoard.COLS, None, shared, processes=2,
+                              heuristic=HeuristicEvaluator()) as cached_shared:
+            for bb in boards:
+                board, icon = bb.to_array(), bb.current_icon()
+                expected = _scores(plain, board, icon)
+                # the first call fills the table, the second one is answered from it
+                for evaluator in (cached, cached_shared):
+                    assert _scores(evaluator, board, icon) == expected
+                    assert _scores(evaluator, board, icon) == expected
+                    assert evaluator.stats.tt_cutoffs > 0
+    finally:
+        shared.close()
+
+
+def test_pool_follows_changed_settings(rng):
+    bb = random_game(rng, 10, avoid_wins=True)
+    board, icon = bb.to_array(), bb.current_icon()
+    with MoveEvaluator(1, BitBoard.COLS, None, processes=1) as shallow:
+        shallow_scores = _scores(shallow, board, icon)
+    with MoveEvaluator(2, BitBoard.COLS, None, processes=1, heuristic=HeuristicEvaluator()) as deep:
+        deep_scores = _scores(deep, board, icon)
+    with MoveEvaluator(2, BitBoard.COLS, None, processes=1) as evaluator:
+        _scores(evaluator, board, icon)
+        evaluator.target_depth = 1
+        assert _scores(evaluator, board, icon) == shallow_scores
+        evaluator.target_depth = 2
+        evaluator.heuristic = HeuristicEvaluator()
+        assert _scores(evaluator, board, icon) == deep_scores
@@ -0,0 +1,23 @@
+from opening_book import OpeningBook, collect_positions, generate_book
+
+
+def test_heuristic_book(tmp_path):
+    path = str(tmp_path / 'book.bin')
+    count = generate_book(path, plies=2, depth=3, table_mb=1)
+    positions = collect_positions(2)
+    assert count == len(positions)
+    with OpeningBook(path) as book:
+        assert book.heuristic and (book.plies, book.depth) == (2, 3)
+        moves = [book.lookup(bb) for bb in positions]
+        assert None not in moves and len(set(moves)) > 1
+        assert all(book.lookup_score(bb) is not None for bb in positions)
+
+
+def test_book_without_heuristic(tmp_path):
+    path = str(tmp_path / 'book.bin')
+    # no win is reachable within 3 plies, so every position is stored with a score of 0
+    positions = collect_positions(2)
+    assert generate_book(path, plies=2, depth=3, table_mb=1, heuristic=False) == len(positions)
+    with OpeningBook(path) as book:
+        assert len(book) == len(positions) and not book.heuristic
+        assert all(book.lookup_score(bb) == 0 for bb in positions)
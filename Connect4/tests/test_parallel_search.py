@@ -0,0 +1,19 @@
+from evaluation import HeuristicEvaluator
+from parallel_search import LazySMPSearch
+from search import NegamaxSearch
+from tests.boards import random_game
+
+
+def test_agrees_with_fixed_depth_search(rng):
+    heuristic = HeuristicEvaluator()
+    with LazySMPSearch(processes=2, table_mb=4, heuristic=heuristic) as smp:
+        for _ in range(8):
+            bb = random_game(rng, rng.randint(4, 24), avoid_wins=True)
+            if bb is None:
+                continue
+            # every worker stops at max_depth, so no table entry is deeper than the fixed-depth search
+            result = smp.search(bb, move_time_ms=60_000, max_depth=5)
+            expected = NegamaxSearch(5, heuristic=heuristic).search(bb)
+            assert result.score == expected.score
+            assert bb.can_play(result.move)
+            assert len(smp.worker_stats) == 2
@@ -0,0 +1,45 @@
+import time
+
+from bitboard import BitBoard
+from search import NegamaxSearch
+from tests.boards import random_game
+
+
+def test_search_restores_position(rng):
+    bb = random_game(rng, 10, avoid_wins=True)
+    before = bb.copy()
+    NegamaxSearch(4).search(bb)
+    assert bb == before and bb.heights == before.heights and bb.moves == before.moves
+
+
+def test_finds_immediate_win():
+    bb = BitBoard()
+    for col in (0, 1, 0, 1, 0, 1):
+        bb.play(col)
+    result = NegamaxSearch(3).search(bb)
+    assert result.move == 0
+    assert result.score == NegamaxSearch.WIN_SCORE - 1
+
+
+def test_iterative_deepening_matches_fixed_depth(rng):
+    for _ in range(10):
+        bb = random_game(rng, rng.randint(4, 24), avoid_wins=True)
+        if bb is None:
+            continue
+        fixed = NegamaxSearch(5).search(bb)
+        deepened = NegamaxSearch(5).iterative_deepening(bb, move_time_ms=60_000, max_depth=5)
+        assert deepened.score == fixed.score
+        assert deepened.depth == 5 or abs(deepened.score) > NegamaxSearch.WIN_SCORE - NegamaxSearch.MAX_PLIES
+
+
+def test_iterative_deepening_keeps_the_deadline():
+    bb = BitBoard()
+    start = time.perf_counter()
+    result = NegamaxSearch(20).iterative_deepening(bb, move_time_ms=50)
+    elapsed = time.perf_counter() - start
+    # the first iteration always completes, deeper ones are cut off at the deadline
+    assert bb.can_play(result.move)
+    assert 1 <= result.depth < NegamaxSearch.MAX_PLIES
+    assert [entry['depth'] for entry in result.stats.iterations] == list(range(1, result.depth + 1))
+    assert elapsed < 1
+    assert bb == BitBoard()
@@ -0,0 +1,44 @@
+import json
+
+from bitboard import BitBoard
+from search import NegamaxSearch
+from search_stats import SearchStats
+from transposition import TranspositionTable
+
+
+def _stats(engine: str, nodes: int, elapsed: float, depth: int) -> SearchStats:
+    stats = SearchStats(engine)
+    stats.nodes, stats.tt_probes, stats.tt_hits = nodes, 2 * nodes, nodes
+    stats.elapsed, stats.depth = elapsed, depth
+    stats.root_moves = [{'column': depth, 'score': 0, 'nodes': nodes, 'time_ms': 1000 * elapsed}]
+    return stats
+
+
+def test_combine():
+    main, helper = _stats('negamax', 100, 0.5, 6), _stats('negamax', 300, 1.0, 7)
+    combined = SearchStats.combine([main, helper], engine='smp')
+    assert combined.engine == 'smp'
+    assert (combined.nodes, combined.tt_probes, combined.tt_hits) == (400, 800, 400)
+    # the workers ran at the same time: the longest one counts, the rest comes from the main search
+    assert combined.elapsed == 1.0 and combined.depth == 6
+    assert combined.root_moves == main.root_moves and combined.root_moves is not main.root_moves
+    assert combined.nodes_per_sec == 400 and combined.tt_hit_rate == 0.5
+    assert SearchStats.combine([]).nodes == 0
+
+
+def test_to_json_appends_lines(tmp_path):
+    path = str(tmp_path / 'stats.jsonl')
+    search = NegamaxSearch(4, table=TranspositionTable(1))
+    bb = BitBoard()
+    texts = []
+    for col in (3, 4):
+        result = search.search(bb)
+        texts.append(result.stats.to_json(path))
+        bb.play(col)
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines == texts
+    data = json.loads(lines[0])
+    assert data['engine'] == 'negamax' and data['depth'] == 4 and data['nodes'] > 0
+    assert {'nodes_per_sec', 'tt_hit_rate', 'root_moves', 'iterations'} <= set(data)
+    assert len(data['root_moves']) == BitBoard.COLS
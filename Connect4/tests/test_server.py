@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from server import Connect4Server
+
+
+@pytest.fixture
+def client():
+    server = Connect4Server()
+    return server.app.test_client()
+
+
+@pytest.fixture
+def started_game(client):
+    """
+    A new game with two registered players: (game ID, ID of 'X', ID of 'O').
+    """
+    game_id = client.post('/connect4/games').get_json()['game_id']
+    for player_id in ('p1', 'p2'):
+        assert client.post(f'/connect4/{game_id}/register', json={'player_id': player_id}).status_code == 200
+    return game_id, 'p1', 'p2'
+
+
+def test_move_and_status(client, started_game):
+    game_id, x_id, o_id = started_game
+    status = client.get(f'/connect4/{game_id}/status').get_json()
+    assert status['active_player'] == 'X' and status['turn'] == 0
+    response = client.post(f'/connect4/{game_id}/make_move', json={'player_id': x_id, 'column': 3, 'turn': 0})
+    assert response.status_code == 200
+    board = client.get(f'/connect4/{game_id}/board').get_json()['board']
+    assert board[6 * 8 + 3] == 'X'
+
+
+def test_games_are_independent(client, started_game):
+    game_id, x_id, o_id = started_game
+    other_id = client.post('/connect4/games').get_json()['game_id']
+    assert other_id != game_id
+    assert client.post(f'/connect4/{game_id}/make_move', json={'player_id': x_id, 'column': 1}).status_code == 200
+    # the same player IDs register afresh in the other game, which is still at its start
+    assert client.post(f'/connect4/{other_id}/register', json={'player_id': o_id}).get_json()['player_icon'] == 'X'
+    assert client.get(f'/connect4/{other_id}/board').get_json()['board'] == [''] * 56
+    assert client.delete(f'/connect4/{other_id}').status_code == 200
+    assert client.get(f'/connect4/{other_id}/status').status_code == 404
+    assert client.get(f'/connect4/{game_id}/status').get_json()['turn'] == 1
+
+
+def test_unknown_game(client):
+    for path in ('status', 'state', 'board', 'wait?player_id=p1&timeout=0'):
+        assert client.get(f'/connect4/no-such-game/{path}').status_code == 404
+    assert client.post('/connect4/no-such-game/make_move', json={'player_id': 'p1', 'column': 0}).status_code == 404
+    assert client.delete('/connect4/no-such-game').status_code == 404
+
+
+def test_wait_returns_when_it_is_the_players_turn(client, started_game):
+    game_id, x_id, o_id = started_game
+    response = client.get(f'/connect4/{game_id}/wait?player_id={x_id}&timeout=5')
+    assert response.status_code == 200
+    assert response.get_json()['active_player'] == 'X'
+    response = client.get(f'/connect4/{game_id}/wait?player_id={o_id}&timeout=0.1')
+    assert response.status_code == 200
+    assert response.get_json()['active_player'] == 'X'
+
+
+def test_wait_wakes_up_on_the_opponents_move(client, started_game):
+    game_id, x_id, o_id = started_game
+
+    def move_later():
+        time.sleep(0.2)
+        client.post(f'/connect4/{game_id}/make_move', json={'player_id': x_id, 'column': 4})
+
+    thread = threading.Thread(target=move_later)
+    thread.start()
+    start = time.monotonic()
+    response = client.get(f'/connect4/{game_id}/wait?player_id={o_id}&timeout=10')
+    thread.join()
+    assert response.get_json()['active_player'] == 'O'
+    assert time.monotonic() - start < 5
+
+
+def test_wait_timeout_validation(client, started_game):
+    game_id, x_id, o_id = started_game
+    for timeout in ('nan', 'inf', '-inf', 'abc'):
+        response = client.get(f'/connect4/{game_id}/wait?player_id={o_id}&timeout={timeout}')
+        assert response.status_code == 400
+    # negative timeouts don't wait at all
+    response = client.get(f'/connect4/{game_id}/wait?player_id={o_id}&timeout=-5')
+    assert response.status_code == 200
+    assert client.get(f'/connect4/{game_id}/wait?timeout=1').status_code == 400
+
+
+def test_state_etag(client, started_game):
+    game_id, x_id, o_id = started_game
+    response = client.get(f'/connect4/{game_id}/state')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert client.get(f'/connect4/{game_id}/state', headers={'If-None-Match': etag}).status_code == 304
+
+    client.post(f'/connect4/{game_id}/make_move', json={'player_id': x_id, 'column': 0})
+    response = client.get(f'/connect4/{game_id}/state', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['last_move'] == {'row': 6, 'column': 0, 'icon': 'X'}
+
+
+def test_state_matches_status_and_board(client, started_game):
+    game_id, x_id, o_id = started_game
+    client.post(f'/connect4/{game_id}/make_move', json={'player_id': x_id, 'column': 5})
+    state = client.get(f'/connect4/{game_id}/state').get_json()
+    assert state['status'] == client.get(f'/connect4/{game_id}/status').get_json()
+    assert state['board'] == client.get(f'/connect4/{game_id}/board').get_json()['board']
+
+
+def test_stale_turn_is_rejected(client, started_game):
+    game_id, x_id, o_id = started_game
+    assert client.post(f'/connect4/{game_id}/make_move',
+                       json={'player_id': x_id, 'column': 3, 'turn': 0}).status_code == 200
+    # a retry of the same move, and a move for a turn that has passed
+    assert client.post(f'/connect4/{game_id}/make_move',
+                       json={'player_id': x_id, 'column': 3, 'turn': 0}).status_code == 409
+    assert client.post(f'/connect4/{game_id}/make_move',
+                       json={'player_id': o_id, 'column': 2, 'turn': 0}).status_code == 409
+    assert client.get(f'/connect4/{game_id}/status').get_json()['turn'] == 1
+
+
+def test_invalid_moves(client, started_game):
+    game_id, x_id, o_id = started_game
+    for body in ({'player_id': o_id, 'column': 3}, {'player_id': x_id, 'column': 8},
+                 {'player_id': x_id, 'column': 'a'}, {'player_id': x_id, 'column': 3, 'turn': 'x'},
+                 {'player_id': x_id, 'column': True}, {'player_id': x_id, 'column': False},
+                 {'player_id': x_id, 'column': 3, 'turn': False}):
+        assert client.post(f'/connect4/{game_id}/make_move', json=body).status_code == 400
+
+
+def test_waitress_refuses_websocket_endpoint():
+    server = Connect4Server(websocket=True)
+    with pytest.raises(RuntimeError):
+        server.serve(port=0)
+
+
+def test_server_without_websocket_endpoint():
+    server = Connect4Server(websocket=False)
+    assert not server.websocket
+    assert not any(rule.rule.endswith('/ws') for rule in server.app.url_map.iter_rules())
+    # only the DELETE route of a game named 'ws' is left
+    assert server.app.test_client().get('/connect4/ws').status_code == 405
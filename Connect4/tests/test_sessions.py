@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import sessions
+from server import Connect4Server
+from sessions import GameNotFound, SessionRegistry, SQLiteSessionRegistry
+
+
+@pytest.fixture
+def store(tmp_path) -> SQLiteSessionRegistry:
+    return SQLiteSessionRegistry(str(tmp_path / 'games.sqlite'), poll_interval=0.01)
+
+
+@pytest.mark.parametrize('registry', ['memory', 'sqlite'])
+def test_open_saves_changes(registry, tmp_path):
+    sessions = SessionRegistry() if registry == 'memory' else SQLiteSessionRegistry(str(tmp_path / 'games.sqlite'))
+    game_id = sessions.create().game_id
+    with sessions.open(game_id) as session:
+        session.game.register_player('p1')
+    with sessions.open(game_id, write=False) as session:
+        assert session.game.p1 == 'p1'
+    with pytest.raises(GameNotFound):
+        with sessions.open('no-such-game', write=False):
+            pass
+
+
+def test_reads_take_no_write_lock(store):
+    game_id = store.create().game_id
+    writer = sqlite3.connect(store.path, isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE')
+    try:
+        start = time.monotonic()
+        with store.open(game_id, write=False) as session:
+            assert session.game.version == 0
+        assert time.monotonic() - start < 1
+    finally:
+        writer.execute('ROLLBACK')
+        writer.close()
+
+
+def test_reads_touch_at_most_every_interval(store):
+    game_id = store.create().game_id
+    stored = store._load(game_id).last_access
+    for _ in range(5):
+        with store.open(game_id, write=False):
+            pass
+    assert store._load(game_id).last_access == stored
+
+    store.TOUCH_INTERVAL = 0
+    with store.open(game_id, write=False):
+        pass
+    assert store._load(game_id).last_access > stored
+
+
+def test_read_only_session_must_not_change(store):
+    game_id = store.create().game_id
+    with pytest.raises(RuntimeError):
+        with store.open(game_id, write=False) as session:
+            session.game.register_player('p1')
+    assert store._load(game_id).game.p1 is None
+
+
+def test_read_only_wait_sees_other_writers(store):
+    game_id = store.create().game_id
+
+    def register_later():
+        time.sleep(0.1)
+        with store.open(game_id) as session:
+            session.game.register_player('p1')
+
+    thread = threading.Thread(target=register_later)
+    thread.start()
+    with store.open(game_id, write=False) as session:
+        assert session.wait_for_change(0, timeout=5)
+        assert session.game.p1 == 'p1'
+    thread.join()
+
+
+def test_error_while_waiting_is_not_hidden(store, monkeypatch):
+    game_id = store.create().game_id
+
+    def interrupted(seconds):
+        raise OSError('interrupted')
+
+    # the lock is released while polling, so there is no transaction to roll back
+    monkeypatch.setattr(sessions.time, 'sleep', interrupted)
+    with pytest.raises(OSError):
+        with store.open(game_id) as session:
+            session.wait_for_change(0, timeout=5)
+    monkeypatch.undo()
+    with store.open(game_id) as session:
+        assert session.game.version == 0
+
+
+def test_server_on_sqlite_store(tmp_path):
+    client = Connect4Server(store_path=str(tmp_path / 'games.sqlite'), websocket=False).app.test_client()
+    game_id = client.post('/connect4/games').get_json()['game_id']
+    for player_id in ('p1', 'p2'):
+        client.post(f'/connect4/{game_id}/register', json={'player_id': player_id})
+    assert client.post(f'/connect4/{game_id}/make_move', json={'player_id': 'p1', 'column': 2}).status_code == 200
+    state = client.get(f'/connect4/{game_id}/state').get_json()
+    assert state['status']['turn'] == 1 and state['last_move']['column'] == 2
+    response = client.get(f'/connect4/{game_id}/wait?player_id=p2&timeout=1')
+    assert response.get_json()['active_player'] == 'O'
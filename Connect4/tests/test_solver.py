@@ -0,0 +1,85 @@
+import pytest
+
+from bitboard import BitBoard
+from solver import CELLS, MAX_SCORE, MIN_SCORE, Solver
+from tests.boards import random_game
+
+
+def minimax(bb: BitBoard) -> int:
+    """
+    Plain minimax without any pruning, scored like `Solver`.
+    """
+    best = None
+    for col in range(BitBoard.COLS):
+        if not bb.can_play(col):
+            continue
+        mover_is_x = bb.moves % 2 == 0
+        bb.play(col)
+        if BitBoard.has_four(bb.x_mask if mover_is_x else bb.o_mask):
+            score = (CELLS + 2 - bb.moves) // 2
+        elif bb.moves == CELLS:
+            score = 0
+        else:
+            score = -minimax(bb)
+        bb.undo(col)
+        best = score if best is None else max(best, score)
+    return best
+
+
+@pytest.fixture
+def late_positions(rng) -> list[BitBoard]:
+    """
+    Positions without a winner and 8 empty cells left.
+    """
+    positions = []
+    while len(positions) < 12:
+        bb = random_game(rng, CELLS - 8, avoid_wins=True)
+        if bb is not None:
+            positions.append(bb)
+    return positions
+
+
+def test_solve_matches_minimax(late_positions):
+    with Solver(cache_path=None, table_mb=1) as solver:
+        for bb in late_positions:
+            assert solver.solve(bb) == minimax(bb)
+
+
+def test_analyze_and_best_move(late_positions):
+    with Solver(cache_path=None, table_mb=1) as solver:
+        for bb in late_positions:
+            scores = solver.analyze(bb)
+            assert max(score for score in scores if score is not None) == minimax(bb)
+            best = solver.best_move(bb)
+            assert solver.grade_move(bb, best) == 0
+
+
+def test_cache_survives_restart(tmp_path, late_positions):
+    path = str(tmp_path / 'cache.sqlite')
+    with Solver(cache_path=path, table_mb=1) as solver:
+        scores = [solver.solve(bb) for bb in late_positions]
+    with Solver(cache_path=path, table_mb=1) as solver:
+        assert [solver._cache_get(bb.key()) for bb in late_positions] == scores
+
+
+def test_grade_move_rejects_unplayable_columns():
+    bb = BitBoard()
+    for _ in range(BitBoard.ROWS):
+        bb.play(0)
+    with Solver(cache_path=None, table_mb=1) as solver:
+        for col in (0, -1, BitBoard.COLS):
+            with pytest.raises(ValueError):
+                solver.grade_move(bb, col)
+
+
+def test_score_bounds():
+    assert (MIN_SCORE, MAX_SCORE) == (-25, 25)
+    with Solver(cache_path=None, table_mb=1) as solver:
+        bb = BitBoard()
+        for col in (0, 1, 0, 1, 0, 1):
+            bb.play(col)
+        # 'X' wins with its 4th piece, the fastest possible win
+        assert solver.solve(bb) == MAX_SCORE
+        # as does 'O' after a move elsewhere
+        bb.play(2)
+        assert solver.solve(bb) == MAX_SCORE
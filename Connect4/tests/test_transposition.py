@@ -0,0 +1,58 @@
+import pickle
+
+from search import NegamaxSearch
+from transposition import EXACT, ZOBRIST_KEYS, SharedTranspositionTable, TranspositionTable, zobrist_hash
+from tests.boards import random_game
+
+
+def test_table_does_not_change_results(rng):
+    table = TranspositionTable(4)
+    for _ in range(15):
+        bb = random_game(rng, rng.randint(4, 30), avoid_wins=True)
+        if bb is None:
+            continue
+        plain = NegamaxSearch(5).search(bb)
+        cached = NegamaxSearch(5, table=table).search(bb)
+        assert cached.score == plain.score
+        assert bb.can_play(cached.move)
+
+
+def test_zobrist_hash_is_incremental(random_boards):
+    for board in random_boards:
+        key = 0
+        for row, col in zip(*(board != '').nonzero()):
+            key ^= ZOBRIST_KEYS[str(board[row, col])][row][col]
+        assert zobrist_hash(board) == key
+
+
+def test_depth_preferred_replacement():
+    table = TranspositionTable(1)
+    key, other = 5, 5 + table.size      # same slot
+    table.store(key, 6, EXACT, 10)
+    table.store(other, 2, EXACT, 20)
+    assert table.probe(key).value == 10 and table.probe(other) is None
+    table.store(other, 8, EXACT, 30)
+    assert table.probe(other).value == 30
+    assert (table.hits, table.misses) == (2, 1)
+
+    always = TranspositionTable(1, policy='always')
+    always.store(key, 6, EXACT, 10)
+    always.store(other, 2, EXACT, 20)
+    assert always.probe(other).value == 20
+
+
+def test_shared_table_round_trip():
+    table = SharedTranspositionTable(1)
+    try:
+        table.store(12345, 6, 1, -987654, 3)
+        entry = table.probe(12345)
+        assert (entry.depth, entry.flag, entry.value, entry.move) == (6, 1, -987654, 3)
+        assert table.probe(54321) is None
+
+        # a worker's copy attaches to the same shared memory
+        copy = pickle.loads(pickle.dumps(table))
+        copy.store(54321, 2, EXACT, 42)
+        assert table.probe(54321).value == 42
+        copy.close()
+    finally:
+        table.close()
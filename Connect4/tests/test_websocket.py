@@ -0,0 +1,56 @@
+import builtins
+
+import pytest
+import requests
+
+pytest.importorskip('flask_sock')
+pytest.importorskip('websocket')
+
+from player_websocket import Player_WebSocket
+
+
+@pytest.fixture
+def players(live_server):
+    """
+    Two WebSocket players registered in a new game: ('X', 'O').
+    """
+    game_id = requests.post(f'{live_server}/connect4/games').json()['game_id']
+    x, o = Player_WebSocket(live_server, game_id), Player_WebSocket(live_server, game_id)
+    x.icon, o.icon = x.register_in_game(), o.register_in_game()
+    yield x, o
+    x.close()
+    o.close()
+
+
+def test_state_on_connect(players):
+    x, o = players
+    assert (x.icon, o.icon) == ('X', 'O')
+    # registrations are pushed like moves
+    status = x.wait_for_turn(timeout=5)
+    assert status['active_player'] == 'X' and status['turn'] == 0
+    assert (x.board == '').all()
+
+
+def test_move_result_carries_the_delta(players):
+    x, o = players
+    reply = x._request({'type': 'move', 'player_id': str(x.id), 'column': 8}, 'move_result')
+    assert reply == {'type': 'move_result', 'success': False}
+    reply = x._request({'type': 'move', 'player_id': str(x.id), 'column': 2}, 'move_result')
+    assert reply['success'] and reply['move'] == {'row': 6, 'column': 2, 'icon': 'X'}
+    assert reply['status']['active_player'] == 'O' and reply['version'] > 0
+
+
+def test_mirrors_are_up_to_date_after_a_move(players, monkeypatch):
+    x, o = players
+    x.wait_for_turn(timeout=5)
+    for turn in range(10):
+        mover, waiting = (x, o) if turn % 2 == 0 else (o, x)
+        monkeypatch.setattr(builtins, 'input', lambda: str(turn % 4))
+        mover.make_move()
+        # the mover's copy shows the move as soon as make_move returns
+        assert mover.get_game_status()['active_id'] == str(waiting.id)
+        assert mover.board[6 - turn // 4, turn % 4] == mover.icon
+        # the opponent gets it pushed
+        status = waiting.wait_for_turn(timeout=5)
+        assert status['active_id'] == str(waiting.id)
+        assert (waiting.board == mover.board).all() and waiting.version == mover.version
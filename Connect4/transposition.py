@@ -0,0 +1,291 @@
+import random
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+
+# Bound types of a stored score
+EXACT: int = 0
+LOWER_BOUND: int = 1
+UPPER_BOUND: int = 2
+
+# One random 64-bit key per (icon, row, column) and one for the searching player,
+# generated from a fixed seed so hashes are identical in every process.
+_rng = random.Random(0xC0FFEE)
+ZOBRIST_KEYS: dict[str, list[list[int]]] = {
+    icon: [[_rng.getrandbits(64) for _ in range(8)] for _ in range(7)]
+    for icon in ('X', 'O')
+}
+ZOBRIST_PLAYER_O: int = _rng.getrandbits(64)
+
+
+def zobrist_hash(board: np.ndarray) -> int:
+    """
+    Compute the Zobrist hash of a string board.
+
+    The hash can be updated incrementally by XOR-ing `ZOBRIST_KEYS[icon][row][col]`
+    whenever a piece is placed or removed.
+
+    Parameters:
+        board (np.ndarray): A 7x8 array containing 'X', 'O' or ''.
+
+    Returns:
+        int: The 64-bit hash of the board.
+    """
+    h = 0
+    for row, col in zip(*np.nonzero(board != '')):
+        h ^= ZOBRIST_KEYS[str(board[row, col])][row][col]
+    return h
+
+
+class TTEntry(NamedTuple):
+    """
+    Entry of the transposition table.
+
+    Attributes:
+        key (int): Full key of the position (to detect index collisions).
+        depth (int): Remaining search depth the value was computed with.
+        flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+        value (int): The stored score.
+        move (int | None): Best move found in this position, if any.
+    """
+    key: int
+    depth: int
+    flag: int
+    value: int
+    move: int | None
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table for the bot searches.
+
+    Positions are stored in a preallocated slot list indexed by `key % size`,
+    so memory stays bounded no matter how long the search runs.
+
+    Attributes:
+        size (int): Number of slots.
+        policy (str): Replacement policy when a slot is taken:
+            - 'depth': keep the entry searched to the greater depth (depth-preferred)
+            - 'always': always overwrite the slot
+        hits (int): Number of successful probes.
+        misses (int): Number of failed probes.
+    """
+    ENTRY_BYTES: int = 160       # approximate memory used by one stored entry
+    POLICIES: tuple[str, ...] = ('depth', 'always')
+
+    def __init__(self, max_mb: float = 64, policy: str = 'depth') -> None:
+        """
+        Initialize an empty transposition table.
+
+        Parameters:
+            max_mb (float): Memory cap of the table in megabytes.
+            policy (str): Replacement policy ('depth' or 'always').
+
+        Raises:
+            ValueError: If the policy is unknown or the memory cap too small.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.size: int = int(max_mb * 2**20) // self.ENTRY_BYTES
+        if self.size < 1:
+            raise ValueError(f"Memory cap too small: {max_mb} MB")
+        self.policy: str = policy
+        self.hits: int = 0
+        self.misses: int = 0
+        self._slots: list[TTEntry | None] | None = None   # allocated on first store
+
+    def probe(self, key: int) -> TTEntry | None:
+        """
+        Look up a position.
+
+        Parameters:
+            key (int): Key of the position.
+
+        Returns:
+            TTEntry: The stored entry, or None if the position is not in the table.
+        """
+        if self._slots is not None:
+            entry = self._slots[key % self.size]
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: int, move: int | None = None) -> None:
+        """
+        Store a position, respecting the replacement policy.
+
+        Parameters:
+            key (int): Key of the position.
+            depth (int): Remaining search depth the value was computed with.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            value (int): The score to store.
+            move (int | None): Best move found in this position.
+        """
+        if self._slots is None:
+            self._slots = [None] * self.size
+        index = key % self.size
+        old = self._slots[index]
+        if (self.policy == 'always' or old is None or old.key == key or depth >= old.depth):
+            self._slots[index] = TTEntry(key, depth, flag, value, move)
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the statistics.
+        """
+        self._slots = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of probes that found their position (0.0 if nothing was probed yet).
+        """
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Get the usage statistics of the table.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'hits' (int): Number of successful probes.
+                - 'misses' (int): Number of failed probes.
+                - 'hit_rate' (float): hits / (hits + misses).
+                - 'size' (int): Number of slots.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'size': self.size,
+        }
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table stored in shared memory, usable by several processes at once.
+
+    Each slot holds two uint64 words: the packed entry (`data`) and `key ^ data`.
+    A probe only accepts a slot if both words match the key, so entries torn by
+    two processes writing the same slot concurrently are ignored instead of
+    returning wrong values (lockless hashing). Pickling the table only transfers
+    the name of the memory block; the receiving process attaches to it zero-copy.
+
+    Values are stored as 40-bit signed integers, depths up to 255.
+
+    Attributes:
+        name (str): Name of the shared memory block.
+        (see TranspositionTable for the remaining attributes; hits/misses are per process)
+    """
+    ENTRY_BYTES: int = 16
+    VALUE_BITS: int = 40
+
+    def __init__(self, max_mb: float = 64, policy: str = 'depth', name: str | None = None) -> None:
+        """
+        Create a new shared table or attach to an existing one.
+
+        Parameters:
+            max_mb (float): Memory cap of the table in megabytes.
+            policy (str): Replacement policy ('depth' or 'always').
+            name (str | None): Name of an existing table to attach to; None creates a new one.
+        """
+        super().__init__(max_mb, policy)
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.size * self.ENTRY_BYTES)
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self.name: str = self._shm.name
+        self._max_mb = max_mb
+        self._words = np.ndarray((self.size, 2), dtype=np.uint64, buffer=self._shm.buf)
+        if self._owner:
+            self._words[:] = 0
+
+    def __getstate__(self) -> dict:
+        return {'max_mb': self._max_mb, 'policy': self.policy, 'name': self.name}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['max_mb'], state['policy'], state['name'])
+
+    def _pack(self, depth: int, flag: int, value: int, move: int | None) -> int:
+        """
+        Pack an entry into one 64-bit word (never 0, which marks an empty slot).
+        """
+        packed_move = 0 if move is None else move + 1
+        return ((value & ((1 << self.VALUE_BITS) - 1))
+                | depth << self.VALUE_BITS
+                | flag << (self.VALUE_BITS + 8)
+                | packed_move << (self.VALUE_BITS + 10)
+                | 1 << 63)
+
+    def _unpack(self, key: int, data: int) -> TTEntry:
+        """
+        Unpack a word created by `_pack`.
+        """
+        value = data & ((1 << self.VALUE_BITS) - 1)
+        if value >> (self.VALUE_BITS - 1):
+            value -= 1 << self.VALUE_BITS
+        depth = (data >> self.VALUE_BITS) & 0xFF
+        flag = (data >> (self.VALUE_BITS + 8)) & 0x3
+        packed_move = (data >> (self.VALUE_BITS + 10)) & 0xF
+        return TTEntry(key, depth, flag, value, None if packed_move == 0 else packed_move - 1)
+
+    def probe(self, key: int) -> TTEntry | None:
+        """
+        Look up a position.
+
+        Parameters:
+            key (int): 64-bit key of the position.
+
+        Returns:
+            TTEntry: The stored entry, or None if the position is not in the table.
+        """
+        data, check = self._words[key % self.size].tolist()
+        if data and check ^ data == key:
+            self.hits += 1
+            return self._unpack(key, data)
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: int, move: int | None = None) -> None:
+        """
+        Store a position, respecting the replacement policy.
+
+        Parameters:
+            key (int): 64-bit key of the position.
+            depth (int): Remaining search depth the value was computed with.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            value (int): The score to store.
+            move (int | None): Best move found in this position.
+        """
+        index = key % self.size
+        if self.policy == 'depth':
+            old_data, old_check = self._words[index].tolist()
+            if old_data and old_check ^ old_data != key and depth < (old_data >> self.VALUE_BITS) & 0xFF:
+                return
+        data = self._pack(depth, flag, value, move)
+        self._words[index] = (data, key ^ data)
+
+    def clear(self) -> None:
+        """
+        Remove all entries (for every attached process) and reset the statistics.
+        """
+        self._words[:] = 0
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory; the creating process also frees it.
+        """
+        self._words = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
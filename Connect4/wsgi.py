@@ -0,0 +1,14 @@
+import os
+
+from server import Connect4Server
+
+
+# WSGI entry point for production servers running several worker processes, e.g.
+#
+#   gunicorn --workers 4 --threads 8 --bind 0.0.0.0:5000 wsgi:app
+#
+# gunicorn's threaded workers also serve the WebSocket endpoint (every open
+# WebSocket holds one thread). waitress can't, use `Connect4Server.serve` for it.
+# All workers share the games through the SQLite store at $CONNECT4_STORE.
+server = Connect4Server(store_path=os.environ.get('CONNECT4_STORE', 'connect4_games.sqlite'))
+app = server.app